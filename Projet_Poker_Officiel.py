@@ -1,9 +1,15 @@
 import random
 
+from moteur_poker.cartes import identifiant
+from moteur_poker.evaluateur import evaluer, categorie, PAIRE, QUINTE
+
 class Carte:
+    COULEURS = ['♠', '♥', '♦', '♣']
+
     def __init__(self, valeur, couleur):
         self.valeur = valeur
         self.couleur = couleur
+        self.id = identifiant(valeur - 2, Carte.COULEURS.index(couleur))
 
     def __repr__(self):
         valeurs = {11: "J", 12: "Q", 13: "K", 14: "A"}
@@ -12,9 +18,8 @@ class Carte:
 
 class JeuDeCartes:
     def __init__(self):
-        couleurs = ['♠', '♥', '♦', '♣']
         valeurs = list(range(2, 15))
-        self.cartes = [Carte(valeur, couleur) for valeur in valeurs for couleur in couleurs]
+        self.cartes = [Carte(valeur, couleur) for valeur in valeurs for couleur in Carte.COULEURS]
         random.shuffle(self.cartes)
 
     def distribuer(self):
@@ -28,50 +33,8 @@ class Main:
         self.cartes.append(carte)
 
     def evaluer(self, cartes_communes):
-        cartes = self.cartes + cartes_communes
-        valeurs = sorted([carte.valeur for carte in cartes], reverse=True)
-        compte = {valeur: valeurs.count(valeur) for valeur in valeurs}
-
-        # Évaluation des combinaisons
-        if self.quinte_flush(cartes):
-            return 900 + max(valeurs)
-        if 4 in compte.values():
-            return 800 + max(k for k, v in compte.items() if v == 4)
-        if 3 in compte.values() and 2 in compte.values():
-            return 700 + max(k for k, v in compte.items() if v == 3)
-        if self.couleur(cartes):
-            return 600 + max(valeurs)
-        if self.quinte(cartes):
-            return 500 + max(valeurs)
-        if 3 in compte.values():
-            return 400 + max(k for k, v in compte.items() if v == 3)
-        if list(compte.values()).count(2) == 2:
-            return 300 + max(k for k, v in compte.items() if v == 2)
-        if 2 in compte.values():
-            return 200 + max(k for k, v in compte.items() if v == 2)
-        return 100 + max(valeurs)
-
-    def quinte(self, cartes):
-        valeurs = sorted(set(carte.valeur for carte in cartes))
-        for i in range(len(valeurs) - 4):
-            if valeurs[i:i+5] == list(range(valeurs[i], valeurs[i] + 5)):
-                return True
-        return False
-
-    def couleur(self, cartes):
-        couleurs = [carte.couleur for carte in cartes]
-        return any(couleurs.count(couleur) >= 5 for couleur in set(couleurs))
-
-    def quinte_flush(self, cartes):
-        couleurs = {couleur: [] for couleur in ['♠', '♥', '♦', '♣']}
-        for carte in cartes:
-            couleurs[carte.couleur].append(carte.valeur)
-        for valeurs in couleurs.values():
-            valeurs = sorted(set(valeurs))
-            for i in range(len(valeurs) - 4):
-                if valeurs[i:i+5] == list(range(valeurs[i], valeurs[i] + 5)):
-                    return True
-        return False
+        """Retourne la force (entier comparable) de la meilleure combinaison."""
+        return evaluer([carte.id for carte in self.cartes + cartes_communes])
 
 class Joueur:
     def __init__(self, nom):
@@ -147,10 +110,10 @@ class TableDePoker:
 
     def ia_jouer(self, joueur, mise_minimale):
         print("\nL'IA réfléchit...")
-        main_valeur = joueur.main.evaluer(self.cartes_communes)
-        if main_valeur > 500:
+        main_valeur = categorie(joueur.main.evaluer(self.cartes_communes))
+        if main_valeur >= QUINTE:
             action = "relancer" if mise_minimale < 20 else "suivre"
-        elif main_valeur > 200:
+        elif main_valeur >= PAIRE:
             action = "suivre"
         else:
             action = "se coucher" if mise_minimale > 10 else "suivre"
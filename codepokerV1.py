@@ -1,11 +1,17 @@
 import random
-from collections import Counter
+
+from moteur_poker.cartes import identifiant
+from moteur_poker.evaluateur import evaluer, nom_categorie
+
+COULEURS = ['Coeur', 'Carreau', 'Trèfle', 'Pique']
+VALEURS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Valet', 'Dame', 'Roi', 'As']
 
 # Classe représentant une carte
 class Carte:
     def __init__(self, couleur, valeur):
         self.couleur = couleur
         self.valeur = valeur
+        self.id = identifiant(VALEURS.index(valeur), COULEURS.index(couleur))
 
     def __str__(self):
         return f"{self.valeur} de {self.couleur}"
@@ -13,9 +19,7 @@ class Carte:
 # Classe représentant le jeu de cartes
 class JeuDeCartes:
     def __init__(self):
-        couleurs = ['Coeur', 'Carreau', 'Trèfle', 'Pique']
-        valeurs = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Valet', 'Dame', 'Roi', 'As']
-        self.cartes = [Carte(couleur, valeur) for couleur in couleurs for valeur in valeurs]
+        self.cartes = [Carte(couleur, valeur) for couleur in COULEURS for valeur in VALEURS]
         self.melanger()
 
     def melanger(self):
@@ -36,46 +40,9 @@ class Main:
         return ', '.join(str(carte) for carte in self.cartes)
 
     def evaluer(self, cartes_communes):
-        toutes_les_cartes = self.cartes + cartes_communes
-        valeurs = [c.valeur for c in toutes_les_cartes]
-        couleurs = [c.couleur for c in toutes_les_cartes]
-
-        # Comptage des valeurs
-        compteur_valeurs = Counter(valeurs)
-        frequence = sorted(compteur_valeurs.items(), key=lambda item: (item[1], item[0]), reverse=True)
-        valeurs_triees = sorted([self.valeur_numerique(v) for v in valeurs], reverse=True)
-
-        is_couleur = len(set(couleurs)) == 1
-        is_quinte = len(valeurs_triees) == 5 and (valeurs_triees[0] - valeurs_triees[-1] == 4)
-
-        if is_couleur and is_quinte:
-            if valeurs_triees[0] == 13:
-                return "Quinte Flush Royale", valeurs_triees
-            return "Quinte Flush", valeurs_triees
-        if frequence[0][1] == 4:
-            return "Carré", valeurs_triees
-        if frequence[0][1] == 3 and frequence[1][1] == 2:
-            return "Full", valeurs_triees
-        if is_couleur:
-            return "Couleur", valeurs_triees
-        if is_quinte:
-            return "Quinte", valeurs_triees
-        if frequence[0][1] == 3:
-            return "Brelan", valeurs_triees
-        if frequence[0][1] == 2 and frequence[1][1] == 2:
-            return "Double Paire", valeurs_triees
-        if frequence[0][1] == 2:
-            return "Paire", valeurs_triees
-        return "Carte Haute", valeurs_triees
-
-    @staticmethod
-    def valeur_numerique(valeur):
-        valeurs_numeriques = {
-            '2': 2, '3': 3, '4': 4, '5': 5, '6': 6,
-            '7': 7, '8': 8, '9': 9, '10': 10,
-            'Valet': 11, 'Dame': 12, 'Roi': 13, 'As': 14
-        }
-        return valeurs_numeriques[valeur]
+        """Retourne le nom de la meilleure combinaison et sa force (entier comparable)."""
+        force = evaluer([c.id for c in self.cartes + cartes_communes])
+        return nom_categorie(force), force
 
 # Classe représentant un joueur
 class Joueur:
@@ -0,0 +1,5 @@
+"""Moteur de poker Texas Hold'em sans interface graphique."""
+
+from moteur_poker.evaluateur import evaluer, categorie
+from moteur_poker.equite import equite, equite_exacte, ResultatEquite
+from moteur_poker.jeu import Carte, Joueur, Croupier, Partie
@@ -0,0 +1,346 @@
+"""Abstraction des cartes : groupes de mains par histogrammes d'équité et k-moyennes.
+
+Pour une rue donnée, toutes les situations (main, communes) sont numérotées à
+isomorphisme de couleurs près par IndexeurMains : 169 mains de départ,
+1 286 792 au flop, 13 960 050 au turn et 123 156 254 à la river. Chacune est
+décrite par un vecteur calculé en lots NumPy (voir caracteristiques()) :
+
+- avant la river, l'histogramme de son équité finale contre une main aléatoire
+  sur des tirages des cartes à venir, sous forme cumulée : la distance
+  euclidienne entre histogrammes cumulés approche la distance du cantonnier
+  (EMD), qui distingue un tirage d'une main faite de même équité moyenne ;
+- à la river, son équité seule.
+
+Les vecteurs sont calculés par morceaux dans plusieurs processus et écrits dans
+un fichier projeté en mémoire ; les k-moyennes sont ajustées sur un
+échantillon, puis chaque situation reçoit le groupe du centre le plus proche.
+Les groupes sont numérotés par force croissante et écrits dans un fichier par
+rue, indexé par l'indice canonique.
+
+    construire_abstraction('abstraction', nb_groupes=(8, 64, 64, 64), nb_processus=8)
+    abstraction = AbstractionHistogrammes('abstraction')  # Utilisable par EntraineurCFR
+
+Format d'un fichier de groupes (entiers petit-boutistes) :
+    en-tête    : b'PKGR', version (uint8), rue (uint8), octets par groupe (uint8), 1 octet nul,
+                 nombre de groupes (uint32), nombre de situations (uint64), taille des paramètres (uint32)
+    paramètres : JSON (réglages de la construction), complété par des octets nuls jusqu'à un multiple de 8
+    groupes    : un entier non signé de 1 ou 2 octets par situation, dans l'ordre des indices
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+
+from moteur_poker.aleatoire import graine_aleatoire, graine_fille, graines_filles
+from moteur_poker.isomorphisme import IndexeurMains
+from moteur_poker.lot import evaluer_lot
+from moteur_poker.parallele import MoteurParallele
+
+MAGIE = b'PKGR'
+VERSION = 1
+TAILLES_RUES = ((2,), (2, 3), (2, 4), (2, 5))  # Groupes de cartes de chaque rue pour IndexeurMains
+NB_CLASSES = 10  # Classes d'équité des histogrammes
+# (tirages des cartes à venir, adversaires tirés par donne) de chaque rue
+TIRAGES = ((1000, 8), (64, 8), (46, 8), (1, 64))
+TAILLE_MORCEAU = 1 << 15  # Situations par tâche de calcul
+TAILLE_BLOC = 2048  # Situations évaluées à la fois dans un morceau
+_EN_TETE = struct.Struct('<4sBBBxIQI')
+
+_indexeurs = {}
+
+
+def indexeur(rue):
+    """IndexeurMains de la rue (construit une fois par processus)."""
+    if rue not in _indexeurs:
+        _indexeurs[rue] = IndexeurMains(TAILLES_RUES[rue])
+    return _indexeurs[rue]
+
+
+def chemin_rue(dossier, rue):
+    return os.path.join(dossier, f'rue{rue}.groupes')
+
+
+def _positions_distinctes(nb_positions, k, forme, generateur):
+    """k positions distinctes parmi nb_positions pour chaque case d'un tableau de forme donnée."""
+    choisies = np.empty(forme + (k,), dtype=np.intp)
+    for j in range(k):
+        position = generateur.integers(0, nb_positions - j, size=forme)
+        # Décale la position au-delà des positions déjà prises, dans l'ordre croissant
+        for prise in np.moveaxis(np.sort(choisies[..., :j], axis=-1), -1, 0):
+            position += position >= prise
+        choisies[..., j] = position
+    return choisies
+
+
+def caracteristiques(mains, communes, nb_classes=NB_CLASSES, tirages=64, adversaires=8, generateur=None):
+    """Vecteurs décrivant chaque situation, en un lot : tableau float32 (N, d).
+
+    mains est un tableau (N, 2) d'identifiants et communes un tableau (N, c).
+    Avant la river (c < 5), d = nb_classes - 1 : proportion des tirages des
+    cartes à venir où l'équité dépasse chaque seuil k / nb_classes. À la river,
+    d = 1 : l'équité. L'équité d'une donne est estimée contre adversaires mains
+    tirées au hasard (celles qui touchent une carte déjà prise sont écartées).
+    """
+    generateur = generateur if generateur is not None else np.random.default_rng()
+    mains = np.asarray(mains, dtype=np.intp)
+    nb = len(mains)
+    communes = np.asarray(communes, dtype=np.intp).reshape(nb, -1)
+    manque = 5 - communes.shape[1]
+    if not manque:
+        tirages = 1
+    lignes = np.arange(nb)
+    prises = np.zeros((nb, 52), dtype=bool)
+    prises[lignes[:, None], mains] = True
+    prises[lignes[:, None], communes] = True
+    restantes = np.nonzero(~prises)[1].reshape(nb, -1)
+    futures = restantes[lignes[:, None, None], _positions_distinctes(restantes.shape[1], manque, (nb, tirages),
+                                                                     generateur)]
+    tableaux = np.concatenate([np.broadcast_to(communes[:, None, :], (nb, tirages, communes.shape[1])), futures],
+                              axis=2)
+    joueur = evaluer_lot(np.concatenate([np.broadcast_to(mains[:, None, :], (nb, tirages, 2)), tableaux],
+                                        axis=2).reshape(-1, 7))
+
+    adverses = generateur.integers(0, 52, size=(nb, tirages, adversaires, 2))
+    premiere, seconde = adverses[..., 0], adverses[..., 1]
+    valides = (premiere != seconde) & ~prises[lignes[:, None, None], premiere] & ~prises[lignes[:, None, None], seconde]
+    for j in range(manque):
+        valides &= (premiere != futures[:, :, None, j]) & (seconde != futures[:, :, None, j])
+    valides = valides.reshape(-1)
+    donnes = np.repeat(np.arange(nb * tirages), adversaires)[valides]
+    forces = evaluer_lot(np.hstack([adverses.reshape(-1, 2)[valides], tableaux.reshape(-1, 5)[donnes]]))
+    points = (joueur[donnes] > forces) + 0.5 * (joueur[donnes] == forces)
+    comptes = np.bincount(donnes, minlength=nb * tirages)
+    equites = np.bincount(donnes, points, minlength=nb * tirages) / np.maximum(comptes, 1)
+    equites[comptes == 0] = 0.5
+    equites = equites.reshape(nb, tirages)
+    if not manque:
+        return equites.astype(np.float32)
+    classes = np.minimum((equites * nb_classes).astype(np.intp), nb_classes - 1)
+    histogrammes = np.bincount((lignes[:, None] * nb_classes + classes).reshape(-1),
+                               minlength=nb * nb_classes).reshape(nb, nb_classes)
+    return (1 - np.cumsum(histogrammes, axis=1)[:, :-1] / tirages).astype(np.float32)
+
+
+def dimension(rue, nb_classes=NB_CLASSES):
+    """Taille des vecteurs de caracteristiques() à la rue donnée."""
+    return 1 if rue == 3 else nb_classes - 1
+
+
+def _morceau(tache):
+    """Travail d'un processus : calcule les vecteurs des situations debut à fin - 1 et les écrit dans le fichier."""
+    chemin, rue, debut, fin, nb_classes, tirages, adversaires, graine = tache
+    generateur = np.random.default_rng(graine)
+    indexeur_rue = indexeur(rue)
+    vecteurs = np.memmap(chemin, dtype=np.float32, mode='r+', shape=(indexeur_rue.taille, dimension(rue, nb_classes)))
+    for bloc in range(debut, fin, TAILLE_BLOC):
+        situations = [indexeur_rue.representant(i) for i in range(bloc, min(bloc + TAILLE_BLOC, fin))]
+        mains = [situation[0] for situation in situations]
+        communes = [situation[1] if rue else () for situation in situations]
+        vecteurs[bloc:bloc + len(situations)] = caracteristiques(mains, communes, nb_classes, tirages, adversaires,
+                                                                 generateur)
+    vecteurs.flush()
+    return fin - debut
+
+
+def _plus_proches(points, centres):
+    """Indice du centre le plus proche de chaque point (distance euclidienne)."""
+    distances = (centres * centres).sum(axis=1) - 2 * points @ centres.T
+    return distances.argmin(axis=1)
+
+
+def k_moyennes(points, k, iterations=30, generateur=None):
+    """Centres (k, d) des k-moyennes des points, initialisés par k-means++, triés par somme croissante.
+
+    Pour les vecteurs de caracteristiques(), l'ordre des centres est celui de l'équité.
+    """
+    generateur = generateur if generateur is not None else np.random.default_rng()
+    points = np.asarray(points, dtype=np.float64)
+    if len(points) < k:
+        raise ValueError(f"{k} groupes demandés pour {len(points)} points.")
+    centres = np.empty((k, points.shape[1]))
+    centres[0] = points[generateur.integers(len(points))]
+    distances = ((points - centres[0]) ** 2).sum(axis=1)
+    for i in range(1, k):
+        total = distances.sum()
+        choisi = generateur.choice(len(points), p=distances / total) if total > 0 else generateur.integers(len(points))
+        centres[i] = points[choisi]
+        np.minimum(distances, ((points - centres[i]) ** 2).sum(axis=1), out=distances)
+    for _ in range(iterations):
+        groupes = _plus_proches(points, centres)
+        comptes = np.bincount(groupes, minlength=k)
+        sommes = np.zeros_like(centres)
+        np.add.at(sommes, groupes, points)
+        nouveaux = np.where(comptes[:, None] > 0, sommes / np.maximum(comptes, 1)[:, None], centres)
+        if np.allclose(nouveaux, centres):
+            break
+        centres = nouveaux
+    return centres[np.argsort(centres.sum(axis=1), kind='stable')]
+
+
+def ecrire_groupes(chemin, rue, groupes, nb_groupes, parametres=None):
+    """Écrit le fichier des groupes (un par indice canonique) d'une rue."""
+    octets = 1 if nb_groupes <= 256 else 2
+    texte = json.dumps(parametres or {}).encode()
+    texte += bytes(-(_EN_TETE.size + len(texte)) % 8)
+    temporaire = chemin + '.tmp'
+    with open(temporaire, 'wb') as fichier:
+        fichier.write(_EN_TETE.pack(MAGIE, VERSION, rue, octets, nb_groupes, len(groupes), len(texte)))
+        fichier.write(texte)
+        np.ascontiguousarray(groupes, dtype='<u1' if octets == 1 else '<u2').tofile(fichier)
+    os.replace(temporaire, chemin)
+    return chemin
+
+
+def construire_rue(chemin, rue, nb_groupes, nb_classes=NB_CLASSES, tirages=None, adversaires=None,
+                   nb_processus=None, graine=None, echantillon=200_000, iterations=30, progression=None):
+    """Calcule les groupes de toutes les situations de la rue et les écrit dans chemin ; retourne des statistiques.
+
+    tirages et adversaires valent par défaut ceux de TIRAGES. Les k-moyennes
+    sont ajustées sur echantillon situations tirées au hasard. progression(fait,
+    total) est appelée au fil du calcul des vecteurs. Le résultat ne dépend que
+    de graine, pas du nombre de processus.
+    """
+    if graine is None:
+        graine = graine_aleatoire()
+    tirages = tirages or TIRAGES[rue][0]
+    adversaires = adversaires or TIRAGES[rue][1]
+    taille = indexeur(rue).taille
+    d = dimension(rue, nb_classes)
+    debut = time.perf_counter()
+
+    chemin_vecteurs = chemin + '.vecteurs'
+    np.memmap(chemin_vecteurs, dtype=np.float32, mode='w+', shape=(taille, d)).flush()
+    try:
+        bornes = list(range(0, taille, TAILLE_MORCEAU)) + [taille]
+        taches = [(chemin_vecteurs, rue, a, b, nb_classes, tirages, adversaires, graine_morceau)
+                  for a, b, graine_morceau in zip(bornes, bornes[1:], graines_filles(graine, len(bornes) - 1))]
+        fait = 0
+        with MoteurParallele(nb_processus) as moteur:
+            # Par vagues, pour signaler la progression
+            vague = 4 * moteur.nb_processus
+            for i in range(0, len(taches), vague):
+                fait += sum(moteur.executer(_morceau, taches[i:i + vague]))
+                if progression is not None:
+                    progression(fait, taille)
+        duree_vecteurs = time.perf_counter() - debut
+
+        vecteurs = np.memmap(chemin_vecteurs, dtype=np.float32, mode='r', shape=(taille, d))
+        generateur = np.random.default_rng(graine_fille(graine, 'k-moyennes'))
+        indices = np.sort(generateur.choice(taille, min(echantillon, taille), replace=False))
+        centres = k_moyennes(vecteurs[indices], nb_groupes, iterations, generateur).astype(np.float32)
+        groupes = np.empty(taille, dtype=np.uint16)
+        for a in range(0, taille, 1 << 20):
+            groupes[a:a + (1 << 20)] = _plus_proches(vecteurs[a:a + (1 << 20)], centres)
+        del vecteurs
+    finally:
+        os.remove(chemin_vecteurs)
+
+    parametres = {'nb_groupes': nb_groupes, 'nb_classes': nb_classes, 'tirages': tirages,
+                  'adversaires': adversaires, 'graine': graine, 'centres': centres.tolist()}
+    ecrire_groupes(chemin, rue, groupes, nb_groupes, parametres)
+    return {'situations': taille, 'duree_vecteurs': duree_vecteurs, 'duree': time.perf_counter() - debut,
+            'tailles_groupes': np.bincount(groupes, minlength=nb_groupes).tolist()}
+
+
+def construire_abstraction(dossier, nb_groupes=(8, 64, 64, 64), rues=(0, 1, 2, 3), graine=None, **options):
+    """Construit les fichiers de groupes des rues demandées dans dossier (voir construire_rue)."""
+    os.makedirs(dossier, exist_ok=True)
+    if graine is None:
+        graine = graine_aleatoire()
+    return {rue: construire_rue(chemin_rue(dossier, rue), rue, nb_groupes[rue], graine=graine_fille(graine, rue),
+                                **options)
+            for rue in rues}
+
+
+class TableGroupes:
+    """Fichier de groupes d'une rue ouvert en lecture : table[indice] est le groupe de la situation."""
+
+    def __init__(self, chemin):
+        with open(chemin, 'rb') as fichier:
+            self._mmap = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        magie, version, self.rue, self._octets, self.nb_groupes, self.taille, taille_parametres = \
+            _EN_TETE.unpack_from(self._mmap)
+        if magie != MAGIE or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"{chemin} n'est pas un fichier de groupes valide.")
+        self.parametres = json.loads(self._mmap[_EN_TETE.size:_EN_TETE.size + taille_parametres].rstrip(b'\0'))
+        self._debut = _EN_TETE.size + taille_parametres
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def __len__(self):
+        return self.taille
+
+    def __getitem__(self, indice):
+        if not 0 <= indice < self.taille:
+            raise IndexError(indice)
+        if self._octets == 1:
+            return self._mmap[self._debut + indice]
+        position = self._debut + 2 * indice
+        return int.from_bytes(self._mmap[position:position + 2], 'little')
+
+    def fermer(self):
+        self._mmap.close()
+
+
+class AbstractionHistogrammes:
+    """Abstraction des cartes lue dans les fichiers de construire_abstraction(), pour EntraineurCFR.
+
+    Le groupe d'une main est lu directement à l'indice canonique de sa
+    situation : aucun tirage n'est fait pendant l'entraînement ou le jeu.
+    """
+
+    def __init__(self, dossier):
+        self.dossier = dossier
+        self.tables = [TableGroupes(chemin_rue(dossier, rue)) for rue in range(len(TAILLES_RUES))]
+        self.nb_groupes = tuple(table.nb_groupes for table in self.tables)
+
+    def parametres(self):
+        return {'type': 'histogrammes', 'dossier': self.dossier, 'nb_groupes': list(self.nb_groupes)}
+
+    def preparer(self):
+        """Rien à construire : les tables sont projetées en mémoire et partagées par les processus."""
+
+    def reinitialiser(self, graine):
+        """Rien à réinitialiser : l'abstraction ne tire rien au hasard."""
+
+    def groupe(self, rue, main, communes):
+        """Groupe d'une main à la rue donnée (0 avant le flop, 3 à la river)."""
+        groupes = (main, communes) if rue else (main,)
+        return self.tables[rue][indexeur(rue).indexer(*groupes)]
+
+    def groupes_donne(self, mains, tableau):
+        """Groupes de chaque main à chaque rue, les cinq cartes communes étant connues d'avance."""
+        return [[self.groupe(rue, main, tableau[:nb]) for rue, nb in enumerate((0, 3, 4, 5))] for main in mains]
+
+    def fermer(self):
+        for table in self.tables:
+            table.fermer()
+
+
+if __name__ == '__main__':
+    parseur = argparse.ArgumentParser(description="Construction des groupes de mains par histogrammes d'équité.")
+    parseur.add_argument('dossier')
+    parseur.add_argument('--groupes', type=int, nargs=4, default=(8, 64, 64, 64), help="Groupes par rue")
+    parseur.add_argument('--rues', type=int, nargs='+', default=(0, 1, 2, 3))
+    parseur.add_argument('--processus', type=int, default=None)
+    parseur.add_argument('--graine', type=int, default=None)
+    arguments = parseur.parse_args()
+
+    def afficher(fait, total):
+        print(f"{fait}/{total}", end='\r')
+
+    statistiques = construire_abstraction(arguments.dossier, arguments.groupes, arguments.rues, arguments.graine,
+                                          nb_processus=arguments.processus, progression=afficher)
+    for rue, resultat in statistiques.items():
+        print(f"Rue {rue} : {resultat['situations']} situations en {resultat['duree']:.0f} s, "
+              f"groupes de {min(resultat['tailles_groupes'])} à {max(resultat['tailles_groupes'])} situations")
@@ -0,0 +1,120 @@
+"""Générateurs aléatoires explicites et reproductibles.
+
+Toute source de hasard du moteur (croupier, IA, simulations, calculs d'équité)
+reçoit un générateur en paramètre au lieu d'utiliser l'état global du module
+random : une donne est rejouée à l'identique à partir de sa graine.
+
+Des flux indépendants (un par table, par processus...) sont dérivés d'une
+graine principale et d'un chemin : flux(graine, 'table', 3) donne toujours le
+même générateur, sans corrélation avec flux(graine, 'table', 4).
+
+Deux générateurs sont disponibles :
+- 'mt' : random.Random (Mersenne Twister), le générateur par défaut ;
+- 'pcg64' : GenerateurPCG64, qui tire ses nombres par blocs d'un générateur
+  NumPy PCG64 et expose aussi ce générateur pour les calculs vectorisés.
+"""
+
+import hashlib
+import os
+import random
+from itertools import chain
+
+GENERATEURS = ('mt', 'pcg64')
+TAILLE_BLOC = 8192  # Nombres tirés à la fois par GenerateurPCG64 (au plus)
+
+
+def graine_aleatoire():
+    """Retourne une graine de 64 bits tirée du système."""
+    return int.from_bytes(os.urandom(8), 'little')
+
+
+def graine_fille(graine, *chemin):
+    """Dérive une graine de 64 bits d'une graine principale et d'un chemin (entiers ou textes)."""
+    texte = ':'.join(str(partie) for partie in (graine,) + chemin)
+    return int.from_bytes(hashlib.blake2b(texte.encode(), digest_size=8).digest(), 'little')
+
+
+def graines_filles(graine, nombre):
+    """Dérive nombre graines indépendantes d'une graine principale (tirée au hasard si None)."""
+    if graine is None:
+        graine = graine_aleatoire()
+    return [graine_fille(graine, i) for i in range(nombre)]
+
+
+def creer_rng(graine=None, generateur='mt'):
+    """Crée un générateur initialisé par graine (tirée au hasard si None)."""
+    if generateur == 'mt':
+        return random.Random(graine)
+    if generateur == 'pcg64':
+        return GenerateurPCG64(graine)
+    raise ValueError(f"Générateur inconnu : {generateur!r} (attendu : {', '.join(GENERATEURS)}).")
+
+
+def flux(graine, *chemin, generateur='mt'):
+    """Crée le générateur du flux identifié par chemin, dérivé de la graine principale."""
+    if graine is None:
+        graine = graine_aleatoire()
+    return creer_rng(graine_fille(graine, *chemin), generateur)
+
+
+class GenerateurPCG64:
+    """Générateur NumPy PCG64 avec l'interface de random.Random utilisée par le moteur.
+
+    Les flottants sont tirés par blocs, de 64 puis de taille doublée jusqu'à
+    TAILLE_BLOC : random() coûte alors autant qu'avec random.Random, et
+    réinitialiser le générateur à chaque donne reste bon marché. L'attribut generateur donne accès au
+    numpy.random.Generator sous-jacent pour tirer des tableaux entiers.
+    """
+
+    def __init__(self, graine=None):
+        self.seed(graine)
+
+    def seed(self, graine=None):
+        """Réinitialise le générateur, comme random.Random.seed."""
+        import numpy as np  # Dépendance facultative : seulement pour ce générateur
+
+        self.generateur = np.random.Generator(np.random.PCG64(graine))
+        self.random = chain.from_iterable(self._blocs()).__next__
+
+    def _blocs(self):
+        taille = 64
+        while True:
+            yield self.generateur.random(taille).tolist()
+            taille = min(2 * taille, TAILLE_BLOC)
+
+    def randrange(self, debut, fin=None):
+        if fin is None:
+            debut, fin = 0, debut
+        if fin <= debut:
+            raise ValueError("Intervalle vide pour randrange.")
+        return debut + int(self.random() * (fin - debut))
+
+    def randint(self, a, b):
+        return self.randrange(a, b + 1)
+
+    def choice(self, sequence):
+        if not sequence:
+            raise IndexError("Impossible de choisir dans une séquence vide.")
+        return sequence[int(self.random() * len(sequence))]
+
+    def shuffle(self, liste):
+        """Mélange liste sur place (Fisher-Yates)."""
+        alea = self.random
+        for i in range(len(liste) - 1, 0, -1):
+            j = int(alea() * (i + 1))
+            liste[i], liste[j] = liste[j], liste[i]
+
+    def sample(self, population, k):
+        """Tire k éléments distincts de population (Fisher-Yates partiel sur une copie)."""
+        n = len(population)
+        if not 0 <= k <= n:
+            raise ValueError("Échantillon plus grand que la population.")
+        copie = list(population)
+        alea = self.random
+        for i in range(k):
+            j = i + int(alea() * (n - i))
+            copie[i], copie[j] = copie[j], copie[i]
+        return copie[:k]
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
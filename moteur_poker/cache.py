@@ -0,0 +1,102 @@
+"""Cache borné à éviction LRU pour les forces de mains et les équités."""
+
+import os
+import pickle
+from collections import OrderedDict
+
+_ABSENT = object()
+
+
+class CacheLRU:
+    """Dictionnaire de taille bornée qui évince l'entrée utilisée le moins récemment.
+
+    Les compteurs de succès, d'échecs et d'évictions permettent de suivre le
+    taux de succès et d'ajuster taille_max au budget mémoire.
+
+    Le cache n'a pas de verrou : il ne doit servir qu'à un fil d'exécution à
+    la fois (celui où décide l'IA, par exemple) ; par défaut, chaque StrategieEquite a le sien.
+    """
+
+    def __init__(self, taille_max=100_000):
+        if taille_max < 1:
+            raise ValueError("La taille maximale du cache doit être positive.")
+        self.taille_max = taille_max
+        self._donnees = OrderedDict()
+        self.succes = 0
+        self.echecs = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._donnees)
+
+    def __contains__(self, cle):
+        return cle in self._donnees
+
+    def obtenir(self, cle, defaut=None):
+        """Retourne la valeur associée à cle (et la marque comme récente), ou defaut."""
+        valeur = self._donnees.get(cle, _ABSENT)
+        if valeur is _ABSENT:
+            self.echecs += 1
+            return defaut
+        self._donnees.move_to_end(cle)
+        self.succes += 1
+        return valeur
+
+    def ajouter(self, cle, valeur):
+        """Enregistre une valeur, en évinçant l'entrée la plus ancienne si le cache est plein."""
+        self._donnees[cle] = valeur
+        self._donnees.move_to_end(cle)
+        if len(self._donnees) > self.taille_max:
+            self._donnees.popitem(last=False)
+            self.evictions += 1
+
+    def calculer(self, cle, fonction, *args, **kwargs):
+        """Retourne la valeur en cache pour cle, ou la calcule avec fonction et la mémorise."""
+        valeur = self.obtenir(cle, _ABSENT)
+        if valeur is _ABSENT:
+            valeur = fonction(*args, **kwargs)
+            self.ajouter(cle, valeur)
+        return valeur
+
+    def memoiser(self, fonction, cle):
+        """Retourne une version de fonction dont les résultats sont mis en cache sous cle(*args)."""
+        def fonction_memoisee(*args):
+            return self.calculer(cle(*args), fonction, *args)
+        return fonction_memoisee
+
+    @property
+    def taux_succes(self):
+        total = self.succes + self.echecs
+        return self.succes / total if total else 0.0
+
+    def statistiques(self):
+        """Retourne les métriques du cache sous forme de dictionnaire."""
+        return {
+            'taille': len(self._donnees),
+            'taille_max': self.taille_max,
+            'succes': self.succes,
+            'echecs': self.echecs,
+            'evictions': self.evictions,
+            'taux_succes': self.taux_succes,
+        }
+
+    def vider(self):
+        self._donnees.clear()
+
+    def sauvegarder(self, chemin):
+        """Écrit les entrées du cache dans un fichier, de la plus ancienne à la plus récente."""
+        temporaire = chemin + '.tmp'
+        with open(temporaire, 'wb') as fichier:
+            pickle.dump(list(self._donnees.items()), fichier, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporaire, chemin)
+
+    @classmethod
+    def charger(cls, chemin, taille_max=100_000):
+        """Recrée un cache à partir d'un fichier écrit par sauvegarder (vide si absent)."""
+        cache = cls(taille_max)
+        if os.path.exists(chemin):
+            with open(chemin, 'rb') as fichier:
+                for cle, valeur in pickle.load(fichier):
+                    cache.ajouter(cle, valeur)
+            cache.evictions = 0
+        return cache
@@ -0,0 +1,60 @@
+"""Représentation entière des cartes.
+
+Une carte est un entier de 0 à 51 : ``rang * 4 + couleur``. Les deux bits de
+poids faible donnent la couleur (0 à 3), les bits suivants le rang (0 pour le 2,
+12 pour l'As). Un ensemble de cartes peut aussi être noté par un masque de 52 bits.
+"""
+
+RANGS = '23456789TJQKA'
+COULEURS = 'shdc'  # Pique, Cœur, Carreau, Trèfle
+NB_CARTES = 52
+
+# Paquet complet, dans l'ordre des identifiants
+PAQUET = tuple(range(NB_CARTES))
+
+# Tables précalculées pour éviter tout calcul dans les boucles critiques
+BIT_CARTE = tuple(1 << c for c in PAQUET)
+BIT_RANG = tuple(1 << (c >> 2) for c in PAQUET)
+
+
+def identifiant(rang, couleur):
+    """Retourne l'identifiant d'une carte à partir de ses indices de rang et de couleur."""
+    return rang * 4 + couleur
+
+
+def rang_de(carte):
+    """Retourne l'indice de rang (0-12) d'un identifiant."""
+    return carte >> 2
+
+
+def couleur_de(carte):
+    """Retourne l'indice de couleur (0-3) d'un identifiant."""
+    return carte & 3
+
+
+def depuis_texte(texte):
+    """Convertit une notation courte ('As', 'Td', '2c') en identifiant."""
+    return identifiant(RANGS.index(texte[0].upper()), COULEURS.index(texte[1].lower()))
+
+
+def vers_texte(carte):
+    """Retourne la notation courte d'un identifiant."""
+    return RANGS[carte >> 2] + COULEURS[carte & 3]
+
+
+def ids(cartes):
+    """Convertit une liste de cartes (identifiants ou objets Carte) en identifiants."""
+    return [c if isinstance(c, int) else c.id for c in cartes]
+
+
+def masque(cartes):
+    """Retourne le masque de 52 bits d'un ensemble d'identifiants."""
+    m = 0
+    for c in cartes:
+        m |= BIT_CARTE[c]
+    return m
+
+
+def cartes_du_masque(m):
+    """Retourne la liste triée des identifiants présents dans un masque."""
+    return [c for c in PAQUET if m >> c & 1]
@@ -0,0 +1,456 @@
+"""Entraînement d'une stratégie tête-à-tête par minimisation du regret contrefactuel (MCCFR).
+
+Le jeu abstrait reprend les enchères de TourDeMise entre deux joueurs, en
+limite fixe : blindes petite_blinde et grosse_blinde, relances de
+grosse_blinde avant le flop et au flop, du double au turn et à la river, au
+plus relances_max relances par rue. Le bouton (place 0) paie la petite blinde
+et parle en premier avant le flop, en second ensuite. Avec les réglages par
+défaut, un tapis de 100 jetons n'est jamais atteint.
+
+Les mains sont regroupées par rue (abstraction des cartes). Un ensemble
+d'information est désigné par le groupe de la main du joueur qui parle et par
+l'historique des enchères : '5:rc/cr' est le groupe 5 au flop, après une
+relance suivie avant le flop, puis parole et relance au flop. Les actions sont
+notées f (se coucher), c (suivre ou parler) et r (relancer).
+
+Chaque itération tire une donne complète et parcourt l'arbre des enchères par
+échantillonnage externe, une fois pour chaque joueur. Avec plusieurs
+processus, chacun joue un lot d'itérations à partir des mêmes regrets et
+renvoie ses écarts, additionnés ensuite (mises à jour différées).
+
+    entraineur = EntraineurCFR()
+    entraineur.entrainer(200_000, nb_processus=8, chemin_sauvegarde='cfr.reprise')
+    entraineur.exporter('strategie.table')  # Voir moteur_poker.table_strategie
+    strategie = StrategieCFR('strategie.table')  # strategie(partie, joueur, a_suivre)
+"""
+
+import argparse
+import gc
+import marshal
+import multiprocessing
+import os
+import sys
+import time
+from array import array
+
+import numpy as np
+
+from moteur_poker import preflop
+from moteur_poker.aleatoire import creer_rng, graine_aleatoire, graine_fille, graines_filles
+from moteur_poker.cartes import PAQUET, ids
+from moteur_poker.equite import cartes_restantes
+from moteur_poker.evaluateur import evaluer
+from moteur_poker.jeu import SE_COUCHER, SUIVRE, RELANCER
+from moteur_poker.lot import evaluer_lot, _table_sept_cartes
+from moteur_poker.table_strategie import TableStrategie, ecrire_table
+
+VERSION = 1
+ACTIONS = (SE_COUCHER, SUIVRE, RELANCER)
+LETTRES = 'fcr'
+NB_ACTIONS = len(ACTIONS)
+TAILLES_COMMUNES = (0, 3, 4, 5)  # Cartes communes visibles à chaque rue
+_LETTRE = dict(zip(ACTIONS, LETTRES))
+_ZEROS = array('d', [0.0] * 2 * NB_ACTIONS)
+# Actions permises selon (mise à suivre, relance encore possible)
+_LEGALES = {(False, False): (1,), (False, True): (1, 2), (True, False): (0, 1), (True, True): (0, 1, 2)}
+
+
+class AbstractionEquite:
+    """Groupes de mains d'après leur équité contre une main aléatoire.
+
+    Avant le flop, les 169 mains canoniques sont classées par équité et
+    réparties en nb_groupes[0] groupes d'autant de combinaisons. Après le
+    flop, l'équité est estimée sur tirages donnes (en un lot NumPy) et
+    découpée en nb_groupes[rue] intervalles égaux.
+    """
+
+    def __init__(self, nb_groupes=(8, 8, 8, 8), tirages=128, graine=None):
+        self.nb_groupes = tuple(nb_groupes)
+        self.tirages = tirages
+        self.generateur = np.random.default_rng(graine)
+        self._groupes_preflop = None
+
+    def parametres(self):
+        return {'type': 'equite', 'nb_groupes': list(self.nb_groupes), 'tirages': self.tirages}
+
+    def preparer(self):
+        """Construit les tables de l'abstraction, avant la création des processus de calcul."""
+        self.groupes_preflop()
+
+    def reinitialiser(self, graine):
+        """Réinitialise le générateur des tirages (un flux par processus de calcul)."""
+        self.generateur = np.random.default_rng(graine)
+
+    def equites(self, situations, tirages=None):
+        """Équité de chaque (main, communes) contre une main aléatoire, estimée en un seul lot vectorisé."""
+        tirages = tirages or self.tirages
+        blocs_joueur, blocs_adverse = [], []
+        for main, communes in situations:
+            restants = np.array(cartes_restantes(list(main) + list(communes)), dtype=np.int8)
+            manque = 5 - len(communes)
+            choisies = self.generateur.random((tirages, len(restants))).argpartition(manque + 2, axis=1)
+            tirees = restants[choisies[:, :manque + 2]]
+            tableau = np.hstack([np.broadcast_to(np.array(communes, dtype=np.int8), (tirages, len(communes))),
+                                 tirees[:, :manque]])
+            blocs_joueur.append(np.hstack([np.broadcast_to(np.array(main, dtype=np.int8), (tirages, 2)), tableau]))
+            blocs_adverse.append(np.hstack([tirees[:, manque:], tableau]))
+        joueur = evaluer_lot(np.vstack(blocs_joueur)).reshape(len(situations), tirages)
+        adverse = evaluer_lot(np.vstack(blocs_adverse)).reshape(len(situations), tirages)
+        return ((joueur > adverse) + 0.5 * (joueur == adverse)).mean(axis=1).tolist()
+
+    def groupes_preflop(self):
+        """Groupe de chacune des 169 mains canoniques, estimé une fois avec une graine fixe."""
+        if self._groupes_preflop is None:
+            generateur, self.generateur = self.generateur, np.random.default_rng(0)
+            equites = self.equites([(preflop.combinaisons_main(indice)[0], ()) for indice in range(preflop.NB_MAINS)],
+                                   tirages=1000)
+            self.generateur = generateur
+            groupes = [0] * preflop.NB_MAINS
+            cumul = 0
+            for indice in sorted(range(preflop.NB_MAINS), key=equites.__getitem__):
+                groupes[indice] = cumul * self.nb_groupes[0] // 1326
+                cumul += len(preflop.combinaisons_main(indice))
+            self._groupes_preflop = groupes
+        return self._groupes_preflop
+
+    def _groupe(self, rue, equite):
+        return min(int(equite * self.nb_groupes[rue]), self.nb_groupes[rue] - 1)
+
+    def groupe(self, rue, main, communes):
+        """Groupe d'une main à la rue donnée (0 avant le flop, 3 à la river)."""
+        if rue == 0:
+            return self.groupes_preflop()[preflop.indice_main(*main)]
+        return self._groupe(rue, self.equites([(main, communes)])[0])
+
+    def groupes_donne(self, mains, tableau):
+        """Groupes de chaque main à chaque rue, les cinq cartes communes étant connues d'avance."""
+        equites = self.equites([(main, tableau[:nb]) for main in mains for nb in TAILLES_COMMUNES[1:]])
+        groupes_preflop = self.groupes_preflop()
+        return [[groupes_preflop[preflop.indice_main(*main)]] + [self._groupe(rue, equites[3 * j + rue - 1])
+                                                                 for rue in (1, 2, 3)]
+                for j, main in enumerate(mains)]
+
+
+def abstraction_depuis_parametres(parametres):
+    """Recrée l'abstraction décrite par son dictionnaire parametres()."""
+    if parametres['type'] == 'equite':
+        return AbstractionEquite(parametres['nb_groupes'], parametres['tirages'])
+    if parametres['type'] == 'histogrammes':
+        from moteur_poker.abstraction import AbstractionHistogrammes
+        return AbstractionHistogrammes(parametres['dossier'])
+    raise ValueError(f"Abstraction inconnue : {parametres['type']!r}.")
+
+
+_entraineur = None  # Entraîneur hérité par les processus de calcul (fork)
+
+
+def _lot_iterations(tache):
+    """Travail d'un processus : joue un lot d'itérations et retourne les écarts des nœuds touchés."""
+    nb_iterations, graine = tache
+    entraineur = _entraineur
+    entraineur._originaux = {}
+    entraineur.abstraction.reinitialiser(graine_fille(graine, 'abstraction'))
+    rng = creer_rng(graine)
+    for _ in range(nb_iterations):
+        entraineur.iterer(rng)
+    ecarts = {}
+    for cle, original in entraineur._originaux.items():
+        noeud = entraineur.noeuds[cle]
+        if original is not None:
+            base = array('d')
+            base.frombytes(original)
+            for i in range(2 * NB_ACTIONS):
+                noeud[i] -= base[i]
+        ecarts[cle] = noeud.tobytes()
+    return ecarts
+
+
+def _ecrire(chemin, contenu):
+    temporaire = chemin + '.tmp'
+    with open(temporaire, 'wb') as fichier:
+        marshal.dump(contenu, fichier)
+    os.replace(temporaire, chemin)
+
+
+class EntraineurCFR:
+    """Regrets et stratégies cumulés de chaque ensemble d'information du jeu abstrait.
+
+    noeuds associe à chaque clé un array('d') : les regrets des actions f, c,
+    r puis la somme de leurs probabilités (stratégie moyenne).
+    """
+
+    def __init__(self, abstraction=None, petite_blinde=1, grosse_blinde=2, relances_max=3):
+        self.abstraction = abstraction or AbstractionEquite()
+        self.petite_blinde = petite_blinde
+        self.grosse_blinde = grosse_blinde
+        self.relances_max = relances_max
+        self.noeuds = {}
+        self.iterations = 0
+        self.duree = 0.0
+        self._originaux = None  # Dans un processus de calcul : état initial des nœuds touchés
+
+    def parametres(self):
+        return {'petite_blinde': self.petite_blinde, 'grosse_blinde': self.grosse_blinde,
+                'relances_max': self.relances_max, 'abstraction': self.abstraction.parametres()}
+
+    def _noeud(self, cle):
+        noeud = self.noeuds.get(cle)
+        originaux = self._originaux
+        if noeud is None:
+            noeud = self.noeuds[cle] = array('d', _ZEROS)
+            if originaux is not None:
+                originaux[cle] = None
+        elif originaux is not None and cle not in originaux:
+            originaux[cle] = noeud.tobytes()
+        return noeud
+
+    def iterer(self, rng):
+        """Une itération : tire une donne, puis parcourt l'arbre des enchères pour chaque joueur."""
+        cartes = rng.sample(PAQUET, 9)
+        mains = [cartes[0:2], cartes[2:4]]
+        tableau = cartes[4:]
+        groupes = self.abstraction.groupes_donne(mains, tableau)
+        force0, force1 = evaluer(mains[0] + tableau), evaluer(mains[1] + tableau)
+        gagnant = (force0 > force1) - (force0 < force1)  # 1 : bouton, -1 : grosse blinde, 0 : partage
+        for cible in (0, 1):
+            self._parcourir(cible, groupes, gagnant, rng.random, '', 0, (self.petite_blinde, self.grosse_blinde),
+                            0, 0, 2)
+        self.iterations += 1
+
+    def _parcourir(self, cible, groupes, gagnant, alea, histoire, rue, mises, acteur, relances, restants):
+        """Valeur de l'état pour cible ; met à jour regrets (cible) et stratégie moyenne (adversaire)."""
+        legales = _LEGALES[mises[acteur] < mises[1 - acteur], relances < self.relances_max]
+        if len(legales) == 1:
+            return self._jouer(legales[0], cible, groupes, gagnant, alea, histoire, rue, mises, acteur, relances,
+                               restants)
+        noeud = self._noeud(f"{groupes[acteur][rue]}:{histoire}")
+        positifs = [noeud[a] if noeud[a] > 0.0 else 0.0 for a in legales]
+        total = sum(positifs)
+        strategie = [p / total for p in positifs] if total > 0.0 else [1.0 / len(legales)] * len(legales)
+
+        if acteur == cible:
+            valeurs = [self._jouer(a, cible, groupes, gagnant, alea, histoire, rue, mises, acteur, relances, restants)
+                       for a in legales]
+            valeur = sum(p * v for p, v in zip(strategie, valeurs))
+            for a, v in zip(legales, valeurs):
+                noeud[a] += v - valeur
+            return valeur
+
+        tirage = alea()
+        choisie = legales[-1]
+        for a, p in zip(legales, strategie):
+            noeud[NB_ACTIONS + a] += p
+        for a, p in zip(legales, strategie):
+            tirage -= p
+            if tirage < 0.0:
+                choisie = a
+                break
+        return self._jouer(choisie, cible, groupes, gagnant, alea, histoire, rue, mises, acteur, relances, restants)
+
+    def _jouer(self, action, cible, groupes, gagnant, alea, histoire, rue, mises, acteur, relances, restants):
+        autre = 1 - acteur
+        if action == 0:  # Le pot revient à l'autre joueur
+            return -mises[cible] if cible == acteur else mises[acteur]
+        nouvelles = list(mises)
+        if action == 2:
+            nouvelles[acteur] = mises[autre] + (self.grosse_blinde if rue < 2 else 2 * self.grosse_blinde)
+            return self._parcourir(cible, groupes, gagnant, alea, histoire + 'r', rue, nouvelles, autre,
+                                   relances + 1, 1)
+        nouvelles[acteur] = mises[autre]
+        if restants > 1:
+            return self._parcourir(cible, groupes, gagnant, alea, histoire + 'c', rue, nouvelles, autre, relances,
+                                   restants - 1)
+        if rue == 3:  # Abattage : mises égales
+            return nouvelles[0] * (gagnant if cible == 0 else -gagnant)
+        return self._parcourir(cible, groupes, gagnant, alea, histoire + 'c/', rue + 1, nouvelles, 1, 0, 2)
+
+    def _fusionner(self, ecarts):
+        ecart = array('d')
+        for cle, octets in ecarts.items():
+            del ecart[:]
+            ecart.frombytes(octets)
+            noeud = self._noeud(cle)
+            for i in range(2 * NB_ACTIONS):
+                noeud[i] += ecart[i]
+
+    def entrainer(self, nb_iterations, nb_processus=1, taille_lot=1000, graine=None, chemin_sauvegarde=None,
+                  intervalle_sauvegarde=300.0, progression=None):
+        """Joue nb_iterations itérations de plus et retourne statistiques().
+
+        Les itérations sont jouées par lots de taille_lot par processus. Si
+        chemin_sauvegarde est donné, un point de reprise y est écrit toutes les
+        intervalle_sauvegarde secondes et à la fin. progression(fait, total) est
+        appelée après chaque lot.
+        """
+        global _entraineur
+        if graine is None:
+            graine = graine_aleatoire()
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            nb_processus = 1  # Les processus doivent hériter de l'entraîneur
+        rng = creer_rng(graine_fille(graine, self.iterations))
+        self.abstraction.reinitialiser(graine_fille(graine, self.iterations, 'abstraction'))
+        derniere_sauvegarde = time.perf_counter()
+        fait = 0
+        while fait < nb_iterations:
+            debut = time.perf_counter()
+            if nb_processus == 1:
+                nombre = min(taille_lot, nb_iterations - fait)
+                for _ in range(nombre):
+                    self.iterer(rng)
+            else:
+                nombre = min(taille_lot * nb_processus, nb_iterations - fait)
+                taille, reste = divmod(nombre, nb_processus)
+                taches = list(zip([taille + (i < reste) for i in range(nb_processus)],
+                                  graines_filles(graine_fille(graine, self.iterations), nb_processus)))
+                _table_sept_cartes()  # Tables construites avant le fork, partagées par les processus
+                self.abstraction.preparer()
+                _entraineur = self
+                gc.freeze()
+                try:
+                    with multiprocessing.get_context('fork').Pool(nb_processus) as pool:
+                        resultats = pool.map(_lot_iterations, taches, chunksize=1)
+                finally:
+                    gc.unfreeze()
+                    _entraineur = None
+                for ecarts in resultats:
+                    self._fusionner(ecarts)
+                self.iterations += nombre
+            self.duree += time.perf_counter() - debut
+            fait += nombre
+            if progression is not None:
+                progression(fait, nb_iterations)
+            if chemin_sauvegarde and time.perf_counter() - derniere_sauvegarde >= intervalle_sauvegarde:
+                self.sauvegarder(chemin_sauvegarde)
+                derniere_sauvegarde = time.perf_counter()
+        if chemin_sauvegarde:
+            self.sauvegarder(chemin_sauvegarde)
+        return self.statistiques()
+
+    def octets_par_ensemble(self):
+        """Mémoire moyenne occupée par un ensemble d'information (clé, valeurs et place dans le dictionnaire)."""
+        if not self.noeuds:
+            return 0.0
+        total = sys.getsizeof(self.noeuds) + sum(sys.getsizeof(cle) + sys.getsizeof(noeud)
+                                                  for cle, noeud in self.noeuds.items())
+        return total / len(self.noeuds)
+
+    def statistiques(self):
+        """Retourne les métriques d'entraînement sous forme de dictionnaire."""
+        return {
+            'iterations': self.iterations,
+            'duree': self.duree,
+            'iterations_par_seconde': self.iterations / self.duree if self.duree else 0.0,
+            'ensembles': len(self.noeuds),
+            'octets_par_ensemble': self.octets_par_ensemble(),
+        }
+
+    def strategie_moyenne(self, cle):
+        """Probabilités moyennes des actions f, c, r dans l'ensemble cle, ou None s'il n'a pas été joué."""
+        noeud = self.noeuds.get(cle)
+        total = sum(noeud[NB_ACTIONS:]) if noeud is not None else 0.0
+        if not total:
+            return None
+        return [somme / total for somme in noeud[NB_ACTIONS:]]
+
+    def sauvegarder(self, chemin):
+        """Écrit un point de reprise (regrets et stratégies cumulés), de façon atomique."""
+        valeurs = array('d')
+        for noeud in self.noeuds.values():
+            valeurs.extend(noeud)
+        _ecrire(chemin, (VERSION, self.parametres(), self.iterations, self.duree, list(self.noeuds),
+                         valeurs.tobytes()))
+
+    @classmethod
+    def charger(cls, chemin):
+        """Reprend un entraînement à partir d'un point de reprise écrit par sauvegarder."""
+        with open(chemin, 'rb') as fichier:
+            version, parametres, iterations, duree, cles, octets = marshal.load(fichier)
+        if version != VERSION:
+            raise ValueError(f"{chemin} n'est pas un point de reprise CFR valide.")
+        entraineur = cls(abstraction_depuis_parametres(parametres['abstraction']), parametres['petite_blinde'],
+                         parametres['grosse_blinde'], parametres['relances_max'])
+        valeurs = array('d')
+        valeurs.frombytes(octets)
+        taille = 2 * NB_ACTIONS
+        entraineur.noeuds = {cle: valeurs[i * taille:(i + 1) * taille] for i, cle in enumerate(cles)}
+        entraineur.iterations = iterations
+        entraineur.duree = duree
+        return entraineur
+
+    def exporter(self, chemin):
+        """Écrit la stratégie moyenne dans une table projetable en mémoire (voir moteur_poker.table_strategie)."""
+        entrees = {}
+        for cle in self.noeuds:
+            probabilites = self.strategie_moyenne(cle)
+            if probabilites is not None:
+                entrees[cle] = probabilites
+        return ecrire_table(chemin, entrees, NB_ACTIONS, self.parametres())
+
+
+class StrategieCFR:
+    """Joue une stratégie exportée par EntraineurCFR : strategie(partie, joueur, a_suivre).
+
+    L'historique des enchères est lu dans partie.actions. Un ensemble
+    d'information absent de la table (jamais rencontré à l'entraînement,
+    partie à plus de deux joueurs) donne un suivi.
+    """
+
+    def __init__(self, chemin, rng=None):
+        self.table = TableStrategie(chemin)
+        self.parametres = self.table.parametres
+        self.abstraction = abstraction_depuis_parametres(self.parametres['abstraction'])
+        self.rng = rng or creer_rng()
+
+    def __call__(self, partie, joueur, a_suivre):
+        return self.decider(partie, joueur, a_suivre)
+
+    def fermer(self):
+        self.table.fermer()
+
+    def cle(self, partie, joueur):
+        """Clé de l'ensemble d'information de joueur dans l'état courant de partie."""
+        communes = ids(partie.cartes_communes)
+        rue = TAILLES_COMMUNES.index(len(communes))
+        rues = [''] * (rue + 1)
+        for nb_communes, action in partie.actions:
+            rues[TAILLES_COMMUNES.index(nb_communes)] += _LETTRE[action]
+        return f"{self.abstraction.groupe(rue, ids(joueur.cartes), communes)}:{'/'.join(rues)}"
+
+    def decider(self, partie, joueur, a_suivre):
+        if len(partie.joueurs) != 2:
+            return SUIVRE, 0
+        probabilites = self.table.get(self.cle(partie, joueur))
+        if probabilites is None:
+            return SUIVRE, 0
+        tirage = self.rng.random() * sum(probabilites)
+        for action, poids in zip(ACTIONS, probabilites):
+            tirage -= poids
+            if tirage < 0:
+                break
+        if action != RELANCER:
+            return action, 0
+        grosse_blinde = self.parametres['grosse_blinde']
+        return RELANCER, grosse_blinde if len(partie.cartes_communes) < 4 else 2 * grosse_blinde
+
+
+if __name__ == '__main__':
+    parseur = argparse.ArgumentParser(description="Entraînement CFR d'une stratégie tête-à-tête.")
+    parseur.add_argument('iterations', type=int)
+    parseur.add_argument('--processus', type=int, default=os.cpu_count() or 1)
+    parseur.add_argument('--lot', type=int, default=1000, help="Itérations par processus et par lot")
+    parseur.add_argument('--graine', type=int, default=None)
+    parseur.add_argument('--reprise', default='cfr.reprise', help="Point de reprise, repris s'il existe")
+    parseur.add_argument('--sortie', default='strategie.table')
+    arguments = parseur.parse_args()
+
+    if os.path.exists(arguments.reprise):
+        entraineur = EntraineurCFR.charger(arguments.reprise)
+    else:
+        entraineur = EntraineurCFR()
+    statistiques = entraineur.entrainer(
+        arguments.iterations, arguments.processus, arguments.lot, arguments.graine, arguments.reprise,
+        progression=lambda fait, total: print(f"{fait}/{total}", end='\r'))
+    entraineur.exporter(arguments.sortie)
+    print(f"{statistiques['iterations']} itérations, {statistiques['iterations_par_seconde']:.0f}/s, "
+          f"{statistiques['ensembles']} ensembles d'information, {statistiques['octets_par_ensemble']:.0f} octets chacun")
+    print(f"Stratégie écrite dans {arguments.sortie}")
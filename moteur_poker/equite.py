@@ -0,0 +1,386 @@
+"""Calcul de l'équité d'une main : simulation de Monte-Carlo ou énumération exacte."""
+
+import math
+import time
+from itertools import combinations
+
+from moteur_poker import preflop
+from moteur_poker.aleatoire import creer_rng
+from moteur_poker.cartes import PAQUET, BIT_CARTE, ids, masque
+from moteur_poker.evaluateur import CLE_RANG, BIT_COULEUR, etat, force
+from moteur_poker.isomorphisme import cle_canonique
+
+Z_95 = 1.96  # Quantile de la loi normale pour un intervalle de confiance à 95 %
+LOT_INITIAL = 32  # Premier lot d'un calcul borné dans le temps, qui mesure le débit
+ESSAIS_FOURCHETTE = 20  # Tirages d'une main adverse avant d'abandonner la donne
+DONNES_SANS_TIRAGE = 1000  # Donnes toutes abandonnées au-delà desquelles les fourchettes sont jugées incompatibles
+
+
+class ResultatEquite:
+    """Résultat d'un calcul d'équité : comptes, équité et débit."""
+
+    def __init__(self, victoires=0, egalites=0, defaites=0, parts=0.0, parts_carres=0.0, duree=0.0,
+                 valeur_tabulee=None):
+        self.victoires = victoires
+        self.egalites = egalites
+        self.defaites = defaites
+        self.parts = parts  # Somme des parts de pot gagnées
+        self.parts_carres = parts_carres
+        self.duree = duree
+        self.valeur_tabulee = valeur_tabulee  # Équité lue dans une table précalculée
+
+    @property
+    def tirages(self):
+        return self.victoires + self.egalites + self.defaites
+
+    @property
+    def equite(self):
+        """Part moyenne du pot gagnée (les égalités comptent pour une fraction)."""
+        if self.valeur_tabulee is not None:
+            return self.valeur_tabulee
+        return self.parts / self.tirages if self.tirages else 0.0
+
+    @property
+    def demi_largeur(self):
+        """Demi-largeur de l'intervalle de confiance à 95 % sur l'équité."""
+        n = self.tirages
+        if self.valeur_tabulee is not None:
+            return 0.0
+        if n < 2:
+            return 1.0
+        variance = max(self.parts_carres / n - self.equite ** 2, 0.0)
+        return Z_95 * math.sqrt(variance / n)
+
+    @property
+    def tirages_par_seconde(self):
+        return self.tirages / self.duree if self.duree else 0.0
+
+    def fusionner(self, autre):
+        """Ajoute les comptes d'un autre résultat à celui-ci."""
+        self.victoires += autre.victoires
+        self.egalites += autre.egalites
+        self.defaites += autre.defaites
+        self.parts += autre.parts
+        self.parts_carres += autre.parts_carres
+        self.duree = max(self.duree, autre.duree)
+        return self
+
+    def copie(self):
+        return ResultatEquite(valeur_tabulee=self.valeur_tabulee).fusionner(self)
+
+    def __repr__(self):
+        return (f"Équité {self.equite:.4f} ± {self.demi_largeur:.4f} "
+                f"({self.tirages} tirages, {self.tirages_par_seconde:.0f}/s)")
+
+
+def cartes_restantes(connues, paquet=None):
+    """Retourne les identifiants du paquet qui ne figurent pas parmi les cartes connues."""
+    connues = set(connues)
+    return [c for c in (PAQUET if paquet is None else ids(paquet)) if c not in connues]
+
+
+def simuler_lot(joueur, communes, nb_adversaires, restants, nb_tirages, rng, resultat):
+    """Joue nb_tirages donnes aléatoires et ajoute leurs issues au résultat."""
+    manque = 5 - len(communes)
+    a_tirer = manque + 2 * nb_adversaires
+    cle_communes, masques_communes = etat(communes)
+    cle_joueur, masques_joueur = etat(joueur)
+    cle_joueur += cle_communes
+    masques_joueur |= masques_communes
+    tirer = rng.sample
+    victoires = egalites = defaites = 0
+    parts = parts_carres = 0.0
+
+    for _ in range(nb_tirages):
+        tirage = tirer(restants, a_tirer)
+        cle = masques = 0
+        for c in tirage[:manque]:
+            cle += CLE_RANG[c]
+            masques |= BIT_COULEUR[c]
+        force_joueur = force(cle_joueur + cle, masques_joueur | masques)
+        cle += cle_communes
+        masques |= masques_communes
+
+        meilleure = 0
+        nb_ex_aequo = 0
+        for i in range(manque, a_tirer, 2):
+            a, b = tirage[i], tirage[i + 1]
+            f = force(cle + CLE_RANG[a] + CLE_RANG[b], masques | BIT_COULEUR[a] | BIT_COULEUR[b])
+            if f > meilleure:
+                meilleure = f
+                nb_ex_aequo = 0
+            if f == meilleure:
+                nb_ex_aequo += 1
+
+        if force_joueur > meilleure:
+            victoires += 1
+            parts += 1.0
+            parts_carres += 1.0
+        elif force_joueur == meilleure:
+            egalites += 1
+            part = 1.0 / (nb_ex_aequo + 1)
+            parts += part
+            parts_carres += part * part
+        else:
+            defaites += 1
+
+    resultat.victoires += victoires
+    resultat.egalites += egalites
+    resultat.defaites += defaites
+    resultat.parts += parts
+    resultat.parts_carres += parts_carres
+    return resultat
+
+
+def equite(cartes_joueur, cartes_communes=(), nb_adversaires=1, paquet=None, largeur_cible=0.01,
+           tirages_max=1_000_000, lot=2000, rng=None, table_preflop=True, cache=None):
+    """Estime l'équité d'une main contre nb_adversaires mains aléatoires.
+
+    Avant le flop, la table préflop générée (voir moteur_poker.preflop) est
+    consultée en premier. Sinon les donnes sont tirées parmi les cartes du paquet
+    (par défaut les 52 cartes) privées des cartes connues, et le calcul s'arrête
+    dès que l'intervalle de confiance à 95 % est plus étroit que largeur_cible,
+    ou après tirages_max donnes.
+
+    Si un cache (voir moteur_poker.cache) est fourni, les résultats y sont
+    mémorisés sous la clé canonique de la situation, commune à toutes les
+    situations identiques à une permutation des couleurs près. Une entrée n'est
+    reprise que si elle est au moins aussi précise que demandé ; sinon elle est
+    recalculée. L'appelant reçoit une copie de l'entrée.
+    """
+    joueur = ids(cartes_joueur)
+    communes = ids(cartes_communes)
+    if table_preflop and not communes and len(joueur) == 2 and paquet is None:
+        table = preflop.table_par_defaut()
+        valeur = table.equite_contre_aleatoire(joueur, nb_adversaires) if table else None
+        if valeur is not None:
+            return ResultatEquite(valeur_tabulee=valeur)
+
+    if cache is not None and paquet is None:
+        cle = (cle_canonique(joueur, communes), nb_adversaires)
+        connu = cache.obtenir(cle)
+        if connu is None or (2 * connu.demi_largeur >= largeur_cible and connu.tirages < tirages_max):
+            connu = equite(joueur, communes, nb_adversaires, largeur_cible=largeur_cible, tirages_max=tirages_max,
+                           lot=lot, rng=rng, table_preflop=table_preflop)
+            cache.ajouter(cle, connu)
+        return connu.copie()
+
+    rng = rng or creer_rng()
+    restants = cartes_restantes(joueur + communes, paquet)
+    resultat = ResultatEquite()
+
+    debut = time.perf_counter()
+    while resultat.tirages < tirages_max:
+        simuler_lot(joueur, communes, nb_adversaires, restants,
+                    min(lot, tirages_max - resultat.tirages), rng, resultat)
+        if 2 * resultat.demi_largeur < largeur_cible:
+            break
+    resultat.duree = time.perf_counter() - debut
+    return resultat
+
+
+def simuler_lot_fourchettes(joueur, communes, fourchettes, restants, nb_tirages, rng, resultat):
+    """Comme simuler_lot, chaque adversaire recevant une main tirée dans sa fourchette.
+
+    fourchettes contient, par adversaire, les états (clé, masques, bits des
+    cartes) de ses mains possibles. Une donne où un adversaire ne trouve pas de
+    main compatible avec les cartes déjà tirées est abandonnée.
+    """
+    manque = 5 - len(communes)
+    cle_communes, masques_communes = etat(communes)
+    cle_joueur, masques_joueur = etat(joueur)
+    cle_joueur += cle_communes
+    masques_joueur |= masques_communes
+    pris_initial = masque(joueur) | masque(communes)
+    alea = rng.random
+    nb_restants = len(restants)
+
+    for _ in range(nb_tirages):
+        pris = pris_initial
+        mains = []
+        for fourchette in fourchettes:
+            for _essai in range(ESSAIS_FOURCHETTE):
+                main = fourchette[int(alea() * len(fourchette))]
+                if not main[2] & pris:
+                    break
+            else:
+                break
+            pris |= main[2]
+            mains.append(main)
+        if len(mains) < len(fourchettes):
+            continue
+
+        cle = masques = 0
+        a_tirer = manque
+        while a_tirer:
+            c = restants[int(alea() * nb_restants)]
+            if BIT_CARTE[c] & pris:
+                continue
+            pris |= BIT_CARTE[c]
+            cle += CLE_RANG[c]
+            masques |= BIT_COULEUR[c]
+            a_tirer -= 1
+        force_joueur = force(cle_joueur + cle, masques_joueur | masques)
+        cle += cle_communes
+        masques |= masques_communes
+
+        meilleure = 0
+        nb_ex_aequo = 0
+        for cle_main, masques_main, _ in mains:
+            f = force(cle + cle_main, masques | masques_main)
+            if f > meilleure:
+                meilleure, nb_ex_aequo = f, 0
+            if f == meilleure:
+                nb_ex_aequo += 1
+        _compter(resultat, force_joueur, meilleure, nb_ex_aequo)
+    return resultat
+
+
+def equite_fourchettes(cartes_joueur, cartes_communes, fourchettes, echeance=None, largeur_cible=0.01,
+                       tirages_max=1_000_000, rng=None, arret=None, cache=None, cle_fourchettes=None):
+    """Estime l'équité d'une main contre des adversaires dont les mains possibles sont connues.
+
+    fourchettes contient, par adversaire, la liste des mains (paires de cartes)
+    qu'il peut tenir ; les mains incompatibles avec les cartes connues sont
+    écartées. Le calcul s'affine par lots jusqu'à l'instant echeance (horloge
+    time.perf_counter), jusqu'à la précision largeur_cible, ou dès que
+    arret(resultat) est vrai. La taille des lots suit le débit mesuré, de sorte
+    que l'échéance n'est dépassée que d'une fraction du temps restant.
+
+    Lève ValueError si aucune des DONNES_SANS_TIRAGE premières donnes n'a pu
+    être distribuée (fourchettes incompatibles entre elles).
+
+    Avec un cache (voir moteur_poker.cache), les tirages sont mémorisés sous la
+    clé canonique de la situation et cle_fourchettes, qui doit identifier les
+    fourchettes ; celles-ci doivent être inchangées par permutation des
+    couleurs, comme celles de moteur_poker.strategies.fourchette. Une entrée
+    qui satisfait déjà largeur_cible, tirages_max ou arret est retournée
+    telle quelle ; sinon le calcul reprend ses tirages et l'entrée est
+    remplacée par le résultat affiné. L'appelant reçoit une copie.
+    """
+    if cache is not None and cle_fourchettes is None:
+        raise ValueError("Un cache demande cle_fourchettes pour identifier les fourchettes.")
+    joueur = ids(cartes_joueur)
+    communes = ids(cartes_communes)
+    connues = masque(joueur) | masque(communes)
+    etats = []
+    for fourchette in fourchettes:
+        mains = [(CLE_RANG[a] + CLE_RANG[b], BIT_COULEUR[a] | BIT_COULEUR[b], BIT_CARTE[a] | BIT_CARTE[b])
+                 for a, b in (ids(main) for main in fourchette)]
+        mains = [main for main in mains if not main[2] & connues]
+        if not mains:
+            raise ValueError("Fourchette vide : aucune main compatible avec les cartes connues.")
+        etats.append(mains)
+
+    resultat = ResultatEquite()
+    if cache is not None:
+        cle = (cle_canonique(joueur, communes), cle_fourchettes)
+        connu = cache.obtenir(cle)
+        if connu is not None:
+            if (2 * connu.demi_largeur < largeur_cible or connu.tirages >= tirages_max
+                    or (arret is not None and arret(connu))):
+                return connu.copie()
+            resultat = connu.copie()
+
+    rng = rng or creer_rng()
+    restants = cartes_restantes(joueur + communes)
+    deja_tires = resultat.tirages
+    lot = LOT_INITIAL
+    donnes = 0  # Donnes tentées, abandonnées comprises
+
+    debut = time.perf_counter()
+    while resultat.tirages < tirages_max:
+        nb_donnes = min(lot, tirages_max - resultat.tirages)
+        simuler_lot_fourchettes(joueur, communes, etats, restants, nb_donnes, rng, resultat)
+        donnes += nb_donnes
+        if not resultat.tirages and donnes >= DONNES_SANS_TIRAGE:
+            raise ValueError("Fourchettes incompatibles : aucune donne ne peut être distribuée.")
+        if 2 * resultat.demi_largeur < largeur_cible or (arret is not None and arret(resultat)):
+            break
+        if echeance is not None:
+            maintenant = time.perf_counter()
+            if maintenant >= echeance:
+                break
+            if resultat.tirages > deja_tires:
+                par_tirage = (maintenant - debut) / (resultat.tirages - deja_tires)
+                lot = max(LOT_INITIAL, int((echeance - maintenant) / par_tirage / 4))
+    resultat.duree = time.perf_counter() - debut
+    if cache is not None:
+        cache.ajouter(cle, resultat)
+        return resultat.copie()
+    return resultat
+
+
+def equite_exacte(cartes_joueur, cartes_communes=(), cartes_adversaires=(), nb_inconnus=0, paquet=None):
+    """Calcule exactement l'équité d'une main en énumérant toutes les donnes possibles.
+
+    cartes_adversaires contient les mains connues des adversaires ; nb_inconnus
+    (0 ou 1) ajoute un adversaire dont toutes les mains possibles sont énumérées.
+    """
+    if nb_inconnus not in (0, 1):
+        raise ValueError("L'énumération exacte accepte au plus un adversaire inconnu.")
+    joueur = ids(cartes_joueur)
+    communes = ids(cartes_communes)
+    adversaires = [ids(main) for main in cartes_adversaires]
+    restants = cartes_restantes(joueur + communes + [c for main in adversaires for c in main], paquet)
+    manque = 5 - len(communes)
+
+    cle_communes, masques_communes = etat(communes)
+    cle_joueur, masques_joueur = etat(joueur)
+    etats_adversaires = [etat(main) for main in adversaires]
+    # Mains possibles de l'adversaire inconnu, précalculées une fois pour toutes
+    paires = [(CLE_RANG[a] + CLE_RANG[b], BIT_COULEUR[a] | BIT_COULEUR[b], BIT_CARTE[a] | BIT_CARTE[b])
+              for a, b in combinations(restants, 2)] if nb_inconnus else []
+    resultat = ResultatEquite()
+
+    debut = time.perf_counter()
+    for ajout in combinations(restants, manque):
+        cle = cle_communes
+        masques = masques_communes
+        pris = 0
+        for c in ajout:
+            cle += CLE_RANG[c]
+            masques |= BIT_COULEUR[c]
+            pris |= BIT_CARTE[c]
+        force_joueur = force(cle + cle_joueur, masques | masques_joueur)
+
+        meilleure = 0
+        nb_ex_aequo = 0
+        for cle_adv, masques_adv in etats_adversaires:
+            f = force(cle + cle_adv, masques | masques_adv)
+            if f > meilleure:
+                meilleure, nb_ex_aequo = f, 0
+            if f == meilleure:
+                nb_ex_aequo += 1
+
+        if not nb_inconnus:
+            _compter(resultat, force_joueur, meilleure, nb_ex_aequo)
+            continue
+        for cle_paire, masques_paire, bits in paires:
+            if bits & pris:
+                continue
+            f = force(cle + cle_paire, masques | masques_paire)
+            if f > meilleure:
+                _compter(resultat, force_joueur, f, 1)
+            elif f == meilleure:
+                _compter(resultat, force_joueur, f, nb_ex_aequo + 1)
+            else:
+                _compter(resultat, force_joueur, meilleure, nb_ex_aequo)
+
+    resultat.duree = time.perf_counter() - debut
+    return resultat
+
+
+def _compter(resultat, force_joueur, meilleure, nb_ex_aequo):
+    """Ajoute au résultat l'issue d'une donne contre la meilleure main adverse."""
+    if force_joueur > meilleure:
+        resultat.victoires += 1
+        resultat.parts += 1.0
+        resultat.parts_carres += 1.0
+    elif force_joueur == meilleure:
+        resultat.egalites += 1
+        part = 1.0 / (nb_ex_aequo + 1)
+        resultat.parts += part
+        resultat.parts_carres += part * part
+    else:
+        resultat.defaites += 1
@@ -0,0 +1,233 @@
+"""Évaluateur de mains par tables précalculées.
+
+Une carte est un entier ``rang * 4 + couleur`` (voir moteur_poker.cartes).
+La force d'une main est un entier : plus il est grand, meilleure est la main.
+Les 4 bits de poids fort donnent la catégorie (1 = carte haute ... 10 = quinte
+flush royale), les 20 bits suivants les rangs départageants.
+"""
+
+import marshal
+import os
+from array import array
+from itertools import combinations_with_replacement
+
+# Catégories de mains
+CARTE_HAUTE = 1
+PAIRE = 2
+DEUX_PAIRES = 3
+BRELAN = 4
+QUINTE = 5
+COULEUR = 6
+FULL = 7
+CARRE = 8
+QUINTE_FLUSH = 9
+QUINTE_FLUSH_ROYALE = 10
+
+NOMS_CATEGORIES = {
+    CARTE_HAUTE: "Carte Haute",
+    PAIRE: "Paire",
+    DEUX_PAIRES: "Double Paire",
+    BRELAN: "Brelan",
+    QUINTE: "Quinte",
+    COULEUR: "Couleur",
+    FULL: "Full",
+    CARRE: "Carré",
+    QUINTE_FLUSH: "Quinte Flush",
+    QUINTE_FLUSH_ROYALE: "Quinte Flush Royale",
+}
+
+NB_RANGS = 13
+NB_CARTES_MAX = 7
+_DECALAGE_CATEGORIE = 20
+_AS_BAS = 0b1000000001111  # A-2-3-4-5
+
+
+def _force(cat, rangs):
+    """Assemble une catégorie et jusqu'à cinq rangs départageants en un entier."""
+    force = cat
+    for i in range(5):
+        force = (force << 4) | (rangs[i] if i < len(rangs) else 0)
+    return force
+
+
+def _meilleure_quinte(masque):
+    """Retourne le rang de la plus haute carte de la meilleure quinte, ou -1."""
+    for haut in range(NB_RANGS - 1, 3, -1):
+        motif = 0b11111 << (haut - 4)
+        if masque & motif == motif:
+            return haut
+    if masque & _AS_BAS == _AS_BAS:
+        return 3
+    return -1
+
+
+def _force_rangs(main, quintes):
+    """Force d'une main sans couleur décrite par ses rangs triés par ordre croissant."""
+    rangs = main[::-1]
+    comptes = {}
+    masque = 0
+    for r in rangs:
+        comptes[r] = comptes.get(r, 0) + 1
+        masque |= 1 << r
+    groupes = sorted(((c, r) for r, c in comptes.items()), reverse=True)
+
+    if not groupes:
+        return _force(CARTE_HAUTE, ())
+    nb, haut = groupes[0]
+    if nb == 4:
+        return _force(CARRE, [haut] + [r for r in rangs if r != haut][:1])
+    if nb == 3 and len(groupes) > 1 and groupes[1][0] >= 2:
+        return _force(FULL, (haut, groupes[1][1]))
+    if quintes[masque] >= 0:
+        return _force(QUINTE, (quintes[masque],))
+    if nb == 3:
+        return _force(BRELAN, [haut] + [r for r in rangs if r != haut][:2])
+    if nb == 2 and len(groupes) > 1 and groupes[1][0] == 2:
+        bas = groupes[1][1]
+        return _force(DEUX_PAIRES, [haut, bas] + [r for r in rangs if r != haut and r != bas][:1])
+    if nb == 2:
+        return _force(PAIRE, [haut] + [r for r in rangs if r != haut][:3])
+    return _force(CARTE_HAUTE, rangs[:5])
+
+
+def _force_couleur(masque, quintes):
+    """Force d'une main dont les cartes d'une même couleur forment le masque donné."""
+    quinte = quintes[masque]
+    if quinte == NB_RANGS - 1:
+        return _force(QUINTE_FLUSH_ROYALE, [quinte])
+    if quinte >= 0:
+        return _force(QUINTE_FLUSH, [quinte])
+    rangs = [r for r in range(NB_RANGS - 1, -1, -1) if masque >> r & 1]
+    return _force(COULEUR, rangs[:5])
+
+
+def _construire_tables():
+    """Construit la table des multi-ensembles de rangs et celle des couleurs."""
+    quintes = [_meilleure_quinte(masque) for masque in range(1 << NB_RANGS)]
+    puissances = [5 ** r for r in range(NB_RANGS)]
+    table_rangs = {}
+    for n in range(NB_CARTES_MAX + 1):
+        for main in combinations_with_replacement(range(NB_RANGS), n):
+            # Plus de quatre exemplaires d'un même rang : main impossible.
+            if any(main[i] == main[i + 4] for i in range(n - 4)):
+                continue
+            cle = 0
+            for r in main:
+                cle += puissances[r]
+            table_rangs[cle] = _force_rangs(main, quintes)
+
+    # Une couleur exclut carré et full sur 7 cartes : elle suffit à décider.
+    table_couleurs = [0] * (1 << NB_RANGS)
+    for masque in range(1 << NB_RANGS):
+        if bin(masque).count("1") >= 5:
+            table_couleurs[masque] = _force_couleur(masque, quintes)
+    return table_rangs, table_couleurs
+
+
+# Les tables sont conservées sur disque après leur première construction :
+# les relire prend quelques millisecondes au lieu d'une demi-seconde.
+CHEMIN_TABLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'evaluateur.bin')
+_VERSION_TABLES = 1
+
+
+def _charger_tables(chemin=CHEMIN_TABLES):
+    """Relit les tables depuis chemin, ou les construit et tente de les y écrire.
+
+    Les tables sont stockées sous forme de tableaux d'entiers bruts (module array),
+    bien plus rapides à relire que le dictionnaire lui-même.
+    """
+    try:
+        with open(chemin, 'rb') as fichier:
+            version, cles, forces, couleurs = marshal.load(fichier)
+        if version == _VERSION_TABLES:
+            cles, forces, couleurs = array('q', cles), array('i', forces), array('i', couleurs)
+            return dict(zip(cles, forces)), couleurs.tolist()
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    table_rangs, table_couleurs = _construire_tables()
+    try:
+        temporaire = f"{chemin}.{os.getpid()}.tmp"
+        with open(temporaire, 'wb') as fichier:
+            marshal.dump((_VERSION_TABLES, array('q', table_rangs).tobytes(),
+                          array('i', table_rangs.values()).tobytes(), array('i', table_couleurs).tobytes()),
+                         fichier)
+        os.replace(temporaire, chemin)
+    except OSError:
+        pass  # Répertoire en lecture seule : les tables seront reconstruites au prochain import
+    return table_rangs, table_couleurs
+
+
+_FORCE_RANGS, _FORCE_COULEUR = _charger_tables()
+
+# Contribution de chaque carte à la clé de rangs (base 5) et aux masques de couleur,
+# regroupés dans un seul entier à raison de 16 bits par couleur.
+CLE_RANG = tuple(5 ** (c >> 2) for c in range(52))
+BIT_COULEUR = tuple(1 << ((c >> 2) + 16 * (c & 3)) for c in range(52))
+_TREIZE_BITS = 0x1FFF
+
+
+def etat(cartes):
+    """Retourne la clé de rangs et les masques de couleur d'un ensemble de cartes."""
+    cle = 0
+    masques = 0
+    for c in cartes:
+        cle += CLE_RANG[c]
+        masques |= BIT_COULEUR[c]
+    return cle, masques
+
+
+def force(cle, masques):
+    """Retourne la force d'une main décrite par sa clé de rangs et ses masques de couleur."""
+    return (_FORCE_COULEUR[masques & _TREIZE_BITS] or _FORCE_COULEUR[masques >> 16 & _TREIZE_BITS]
+            or _FORCE_COULEUR[masques >> 32 & _TREIZE_BITS] or _FORCE_COULEUR[masques >> 48]
+            or _FORCE_RANGS[cle])
+
+
+def evaluer(cartes):
+    """Retourne la force d'un ensemble de 0 à 7 cartes (identifiants 0-51)."""
+    cle = 0
+    masques = 0
+    for c in cartes:
+        cle += CLE_RANG[c]
+        masques |= BIT_COULEUR[c]
+    return force(cle, masques)
+
+
+class EvaluationIncrementale:
+    """Évaluation d'une main complétée carte par carte (cartes privées, puis flop, turn, river).
+
+    Chaque carte ajoutée met à jour la clé de rangs et les masques de couleur en
+    temps constant ; la force se lit ensuite par une seule consultation de table.
+    """
+
+    __slots__ = ('cle', 'masques', 'nb_cartes')
+
+    def __init__(self, cartes=()):
+        self.cle, self.masques = etat(cartes)
+        self.nb_cartes = len(cartes)
+
+    def ajouter(self, carte):
+        """Ajoute une carte (identifiant 0-51) à la main."""
+        self.cle += CLE_RANG[carte]
+        self.masques |= BIT_COULEUR[carte]
+        self.nb_cartes += 1
+
+    def force(self):
+        """Retourne la force de la main courante, comme evaluer."""
+        return force(self.cle, self.masques)
+
+    def copie(self):
+        """Retourne une évaluation indépendante partant du même état."""
+        autre = EvaluationIncrementale.__new__(EvaluationIncrementale)
+        autre.cle, autre.masques, autre.nb_cartes = self.cle, self.masques, self.nb_cartes
+        return autre
+
+
+def categorie(force):
+    """Retourne la catégorie (1 à 10) d'une force renvoyée par evaluer."""
+    return force >> _DECALAGE_CATEGORIE
+
+
+def nom_categorie(force):
+    """Retourne le nom de la combinaison correspondant à une force."""
+    return NOMS_CATEGORIES[categorie(force)]
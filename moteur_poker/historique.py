@@ -0,0 +1,208 @@
+"""Historique des donnes : événements émis par Partie et formats d'enregistrement.
+
+Une Partie dont l'attribut enregistreur n'est pas None lui transmet chaque
+événement par enregistreur.enregistrer(type, *valeurs). Les joueurs sont
+désignés par leur place (indice dans partie.joueurs), les cartes par leur
+identifiant 0-51.
+
+    type            valeurs
+    NOUVELLE_MAIN   (graine,)          graine de la donne, None si non fixée
+    CARTE_JOUEUR    (place, carte)
+    BRULEE          (carte,)
+    COMMUNE         (carte,)
+    MISE            (place, montant)   blindes, suivis et relances ; 0 pour une parole
+    COUCHE          (place,)
+    GAIN            (place, montant)   part du pot remportée à l'abattage
+    FIN_MAIN        ()
+
+Deux formats, lus en flux par lire() :
+- binaire, compact et en ajout seul : un octet de type puis des entiers
+  variables (7 bits par octet) ; une donne tête-à-tête tient en une
+  cinquantaine d'octets ;
+- JSON, un événement par ligne, pour l'inspection et les outils externes.
+"""
+
+import json
+from collections import namedtuple
+
+NOUVELLE_MAIN = 1
+CARTE_JOUEUR = 2
+BRULEE = 3
+COMMUNE = 4
+MISE = 5
+COUCHE = 6
+GAIN = 7
+FIN_MAIN = 8
+
+CHAMPS = {
+    NOUVELLE_MAIN: ('graine',),
+    CARTE_JOUEUR: ('place', 'carte'),
+    BRULEE: ('carte',),
+    COMMUNE: ('carte',),
+    MISE: ('place', 'montant'),
+    COUCHE: ('place',),
+    GAIN: ('place', 'montant'),
+    FIN_MAIN: (),
+}
+NOMS_EVENEMENTS = {
+    NOUVELLE_MAIN: 'nouvelle_main', CARTE_JOUEUR: 'carte_joueur', BRULEE: 'brulee', COMMUNE: 'commune',
+    MISE: 'mise', COUCHE: 'couche', GAIN: 'gain', FIN_MAIN: 'fin_main',
+}
+_TYPES = {nom: type_evenement for type_evenement, nom in NOMS_EVENEMENTS.items()}
+
+ENTETE = b'PKHH\x01'  # Signature et version du format binaire
+TAILLE_TAMPON = 1 << 16
+
+Evenement = namedtuple('Evenement', 'type valeurs')
+
+
+def _ecrire_varint(tampon, valeur):
+    while valeur >= 0x80:
+        tampon.append(valeur & 0x7F | 0x80)
+        valeur >>= 7
+    tampon.append(valeur)
+
+
+def _lire_varint(donnees, position):
+    """Retourne (valeur, position suivante) ; IndexError si l'entier est coupé."""
+    valeur = decalage = 0
+    while True:
+        octet = donnees[position]
+        position += 1
+        valeur |= (octet & 0x7F) << decalage
+        if octet < 0x80:
+            return valeur, position
+        decalage += 7
+
+
+class EnregistreurBinaire:
+    """Écrit les événements en binaire à la fin d'un fichier, par blocs de TAILLE_TAMPON octets.
+
+    S'utilise comme gestionnaire de contexte ; fermer() vide le tampon.
+    """
+
+    def __init__(self, chemin, taille_tampon=TAILLE_TAMPON):
+        self.fichier = open(chemin, 'ab')
+        self.taille_tampon = taille_tampon
+        self.tampon = bytearray()
+        if self.fichier.tell() == 0:
+            self.tampon += ENTETE
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def enregistrer(self, type_evenement, *valeurs):
+        tampon = self.tampon
+        tampon.append(type_evenement)
+        for valeur in valeurs:
+            if valeur is None:  # Graine absente : 0, sinon la graine est décalée de 1
+                tampon.append(0)
+            elif type_evenement == NOUVELLE_MAIN:
+                _ecrire_varint(tampon, valeur + 1)
+            elif valeur < 0x80:
+                tampon.append(valeur)
+            else:
+                _ecrire_varint(tampon, valeur)
+        if type_evenement == FIN_MAIN and len(tampon) >= self.taille_tampon:
+            self.vider()
+
+    def vider(self):
+        self.fichier.write(self.tampon)
+        self.fichier.flush()
+        self.tampon.clear()
+
+    def fermer(self):
+        if not self.fichier.closed:
+            self.vider()
+            self.fichier.close()
+
+
+class EnregistreurJSONL:
+    """Écrit un objet JSON par événement et par ligne, par exemple {"type": "mise", "place": 0, "montant": 2}."""
+
+    def __init__(self, chemin):
+        self.fichier = open(chemin, 'a', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def enregistrer(self, type_evenement, *valeurs):
+        evenement = {'type': NOMS_EVENEMENTS[type_evenement]}
+        evenement.update(zip(CHAMPS[type_evenement], valeurs))
+        self.fichier.write(json.dumps(evenement) + '\n')
+
+    def fermer(self):
+        self.fichier.close()
+
+
+def lire_binaire(fichier, taille_bloc=TAILLE_TAMPON):
+    """Lit en flux les événements d'un fichier binaire ouvert en 'rb'.
+
+    Un dernier événement incomplet (écriture interrompue) est ignoré.
+    """
+    if fichier.read(len(ENTETE)) != ENTETE:
+        raise ValueError("Ce fichier n'est pas un historique binaire.")
+    reste = b''
+    while True:
+        bloc = fichier.read(taille_bloc)
+        donnees = reste + bloc
+        position = 0
+        while position < len(donnees):
+            type_evenement = donnees[position]
+            champs = CHAMPS.get(type_evenement)
+            if champs is None:
+                raise ValueError(f"Type d'événement inconnu : {type_evenement}.")
+            suivante = position + 1
+            valeurs = []
+            try:
+                for _ in champs:
+                    valeur, suivante = _lire_varint(donnees, suivante)
+                    valeurs.append(valeur)
+            except IndexError:
+                break  # Événement coupé par la fin du bloc : relu avec le bloc suivant
+            if type_evenement == NOUVELLE_MAIN:
+                valeurs[0] = valeurs[0] - 1 if valeurs[0] else None
+            yield Evenement(type_evenement, tuple(valeurs))
+            position = suivante
+        reste = donnees[position:]
+        if not bloc:
+            return
+
+
+def lire_jsonl(fichier):
+    """Lit en flux les événements d'un fichier JSON lignes ouvert en lecture texte."""
+    for ligne in fichier:
+        if ligne.strip():
+            evenement = json.loads(ligne)
+            type_evenement = _TYPES[evenement['type']]
+            yield Evenement(type_evenement, tuple(evenement[champ] for champ in CHAMPS[type_evenement]))
+
+
+def lire(chemin):
+    """Lit en flux les événements d'un historique, binaire ou JSON selon son en-tête."""
+    with open(chemin, 'rb') as fichier:
+        binaire = fichier.read(len(ENTETE)) == ENTETE
+    if binaire:
+        with open(chemin, 'rb') as fichier:
+            yield from lire_binaire(fichier)
+    else:
+        with open(chemin, encoding='utf-8') as fichier:
+            yield from lire_jsonl(fichier)
+
+
+def mains(evenements):
+    """Regroupe un flux d'événements en listes, une par donne (de NOUVELLE_MAIN à FIN_MAIN)."""
+    main = []
+    for evenement in evenements:
+        if evenement.type == NOUVELLE_MAIN:
+            main = []
+        main.append(evenement)
+        if evenement.type == FIN_MAIN:
+            yield main
+            main = []
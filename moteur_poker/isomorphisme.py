@@ -0,0 +1,197 @@
+"""Canonicalisation des mains à permutation des couleurs près.
+
+Deux situations qui ne diffèrent que par un renommage des couleurs (As♠ K♠ sur
+Q♥ J♥ 2♦ et As♥ K♥ sur Q♠ J♠ 2♦) sont équivalentes. Une situation est décrite
+par ses groupes de cartes, un par rue : (main,), (main, flop), (main, flop, turn)...
+L'ordre des cartes à l'intérieur d'un groupe n'a pas d'importance.
+
+- canonicaliser() renvoie le représentant canonique d'une situation ;
+- cle_canonique() en fait un entier utilisable comme clé de cache ;
+- IndexeurMains numérote densément les classes d'équivalence (0 à taille - 1).
+"""
+
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import product
+from math import comb
+
+from moteur_poker.cartes import identifiant, rang_de, couleur_de
+
+NB_RANGS = 13
+NB_COULEURS = 4
+
+
+def _signatures(groupes):
+    """Pour chaque couleur, tuple des masques de rangs présents dans chaque groupe."""
+    signatures = [[0] * len(groupes) for _ in range(NB_COULEURS)]
+    for g, groupe in enumerate(groupes):
+        for c in groupe:
+            signatures[couleur_de(c)][g] |= 1 << rang_de(c)
+    return [tuple(s) for s in signatures]
+
+
+def canonicaliser(*groupes):
+    """Retourne le représentant canonique : un tuple trié d'identifiants par groupe.
+
+    Les couleurs sont renommées par ordre décroissant de leur signature (rangs
+    présents dans chaque groupe), ce qui rend le résultat indépendant des couleurs
+    d'origine ; des couleurs de même signature sont interchangeables.
+    """
+    signatures = _signatures(groupes)
+    ordre = sorted(range(NB_COULEURS), key=lambda couleur: signatures[couleur], reverse=True)
+    nouvelle = [0] * NB_COULEURS
+    for position, couleur in enumerate(ordre):
+        nouvelle[couleur] = position
+    return tuple(tuple(sorted(identifiant(rang_de(c), nouvelle[couleur_de(c)]) for c in groupe))
+                 for groupe in groupes)
+
+
+def cle_canonique(*groupes):
+    """Retourne un entier identifiant la classe d'équivalence d'une situation."""
+    cle = 0
+    for groupe in canonicaliser(*groupes):
+        for c in groupe:
+            cle = cle * 53 + c + 1
+        cle *= 53  # Séparateur de groupe
+    return cle
+
+
+def _colex(positions):
+    """Rang colexicographique d'une suite strictement croissante d'entiers."""
+    return sum(comb(p, i + 1) for i, p in enumerate(positions))
+
+
+def _colex_inverse(rang, k):
+    """Suite strictement croissante de k entiers ayant le rang colexicographique donné."""
+    positions = []
+    for i in range(k, 0, -1):
+        # Plus grand p tel que comb(p, i) <= rang, par recherche dichotomique
+        bas, haut = i - 1, i
+        while comb(haut, i) <= rang:
+            bas, haut = haut, 2 * haut
+        while haut - bas > 1:
+            milieu = (bas + haut) // 2
+            if comb(milieu, i) <= rang:
+                bas = milieu
+            else:
+                haut = milieu
+        positions.append(bas)
+        rang -= comb(bas, i)
+    return positions[::-1]
+
+
+class IndexeurMains:
+    """Numérotation dense des situations à isomorphisme de couleurs près.
+
+    tailles donne le nombre de cartes de chaque groupe, par exemple (2,) pour les
+    169 mains de départ ou (2, 3) pour les mains au flop.
+    """
+
+    def __init__(self, tailles):
+        self.tailles = tuple(tailles)
+        # Une forme est le nombre de cartes d'une couleur dans chaque groupe ;
+        # une configuration associe une forme à chacune des 4 couleurs, à l'ordre près.
+        configurations = set()
+        for repartition in product(*(self._compositions(t) for t in self.tailles)):
+            formes = tuple(sorted((tuple(r[couleur] for r in repartition) for couleur in range(NB_COULEURS)),
+                                  reverse=True))
+            configurations.add(formes)
+        self._configurations = sorted(configurations, reverse=True)
+        self._index_configuration = {formes: i for i, formes in enumerate(self._configurations)}
+
+        self._groupes = []  # Pour chaque configuration : [(forme, multiplicité, nb de variantes)]
+        self._debuts = []
+        total = 0
+        for formes in self._configurations:
+            groupes = []
+            for forme in sorted(set(formes), reverse=True):
+                groupes.append((forme, formes.count(forme), self._nb_variantes(forme)))
+            self._groupes.append(groupes)
+            self._debuts.append(total)
+            total += self._taille_configuration(groupes)
+        self.taille = total
+
+    @staticmethod
+    def _compositions(n):
+        """Toutes les façons de répartir n cartes entre les 4 couleurs."""
+        return [r for r in product(range(min(n, NB_RANGS) + 1), repeat=NB_COULEURS) if sum(r) == n]
+
+    @staticmethod
+    def _nb_variantes(forme):
+        """Nombre de choix de rangs pour une couleur de forme donnée."""
+        total, pris = 1, 0
+        for k in forme:
+            total *= comb(NB_RANGS - pris, k)
+            pris += k
+        return total
+
+    @staticmethod
+    def _taille_configuration(groupes):
+        total = 1
+        for _, m, n in groupes:
+            total *= comb(n + m - 1, m)  # Multi-ensembles de m variantes parmi n
+        return total
+
+    def _variante(self, masques):
+        """Indice, parmi les variantes de sa forme, des rangs d'une couleur (un masque par groupe)."""
+        indice, pris = 0, 0
+        for masque in masques:
+            libres = [r for r in range(NB_RANGS) if not pris >> r & 1]
+            positions = [i for i, r in enumerate(libres) if masque >> r & 1]
+            indice = indice * comb(len(libres), len(positions)) + _colex(positions)
+            pris |= masque
+        return indice
+
+    @staticmethod
+    @lru_cache(maxsize=1 << 18)
+    def _variante_inverse(forme, indice):
+        """Masques de rangs (un par groupe) de la variante d'indice donné."""
+        bases, pris = [], 0
+        for k in forme:
+            bases.append(comb(NB_RANGS - pris, k))
+            pris += k
+        rangs_colex = []
+        for base in reversed(bases):
+            indice, reste = divmod(indice, base)
+            rangs_colex.append(reste)
+        rangs_colex.reverse()
+        masques, pris = [], 0
+        for k, rang in zip(forme, rangs_colex):
+            libres = [r for r in range(NB_RANGS) if not pris >> r & 1]
+            masque = 0
+            for p in _colex_inverse(rang, k):
+                masque |= 1 << libres[p]
+            masques.append(masque)
+            pris |= masque
+        return tuple(masques)
+
+    def indexer(self, *groupes):
+        """Retourne l'indice (0 à taille - 1) de la situation décrite par les groupes de cartes."""
+        signatures = _signatures(groupes)
+        formes = [tuple(bin(m).count('1') for m in s) for s in signatures]
+        configuration = self._index_configuration[tuple(sorted(formes, reverse=True))]
+        indice = 0
+        for forme, m, n in self._groupes[configuration]:
+            variantes = sorted(self._variante(s) for s, f in zip(signatures, formes) if f == forme)
+            indice = indice * comb(n + m - 1, m) + _colex([v + i for i, v in enumerate(variantes)])
+        return self._debuts[configuration] + indice
+
+    def representant(self, indice):
+        """Retourne une situation (tuple de groupes d'identifiants) d'indice donné."""
+        configuration = bisect_right(self._debuts, indice) - 1
+        indice -= self._debuts[configuration]
+        groupes = self._groupes[configuration]
+        rangs_multi = []
+        for _, m, n in reversed(groupes):
+            indice, reste = divmod(indice, comb(n + m - 1, m))
+            rangs_multi.append(reste)
+        rangs_multi.reverse()
+
+        resultat = [[] for _ in self.tailles]
+        couleur = 0
+        for (forme, m, _), rang in zip(groupes, rangs_multi):
+            for i, v in enumerate(_colex_inverse(rang, m)):
+                for g, masque in enumerate(self._variante_inverse(forme, v - i)):
+                    resultat[g].extend(identifiant(r, couleur) for r in range(NB_RANGS) if masque >> r & 1)
+                couleur += 1
+        return tuple(tuple(sorted(groupe)) for groupe in resultat)
@@ -0,0 +1,442 @@
+"""Logique de jeu sans interface graphique : cartes, joueurs, croupier et partie.
+
+Les applications tkinter (projetpokerfinal.py, projet_poker_newversion5.py)
+importent ces classes ; les simulations peuvent les utiliser sans écran.
+"""
+
+from functools import total_ordering
+
+from moteur_poker.aleatoire import creer_rng
+from moteur_poker.cartes import PAQUET, identifiant, rang_de
+from moteur_poker.equite import equite, equite_exacte
+from moteur_poker.evaluateur import evaluer, EvaluationIncrementale
+from moteur_poker.historique import NOUVELLE_MAIN, CARTE_JOUEUR, BRULEE, COMMUNE, MISE, COUCHE, GAIN, FIN_MAIN
+from moteur_poker.paquet import Paquet
+
+# Actions d'un joueur lors d'un tour de mise
+SE_COUCHER = 'se coucher'
+SUIVRE = 'suivre'  # Suivre la mise, ou parole si rien n'est à suivre
+RELANCER = 'relancer'
+
+
+# Classe Carte
+@total_ordering
+class Carte:
+    """Carte à jouer. Chaque classe ne crée que 52 instances, partagées :
+    Carte('A', '♠') is Carte('A', '♠'), et distribuer une carte n'alloue rien.
+    Les cartes sont hachables et ordonnées par identifiant.
+    """
+
+    __slots__ = ('rang', 'couleur', 'id')
+
+    RANGS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+    COULEURS = ['♠', '♥', '♦', '♣']  # Pique, Cœur, Carreau, Trèfle
+    SYMBOLES = {'P': '♠', 'C': '♥', 'K': '♦', 'T': '♣'}
+
+    def __init_subclass__(cls, **kwargs):
+        # Une sous-classe peut changer les noms des rangs et des couleurs
+        super().__init_subclass__(**kwargs)
+        cls._indexer()
+
+    @classmethod
+    def _indexer(cls):
+        cls.IDS = {(rang, couleur): identifiant(i, j)
+                   for i, rang in enumerate(cls.RANGS) for j, couleur in enumerate(cls.COULEURS)}
+        cls._INSTANCES = [None] * len(PAQUET)
+        for (rang, couleur), id_carte in cls.IDS.items():
+            carte = object.__new__(cls)
+            carte.rang = rang
+            carte.couleur = couleur
+            carte.id = id_carte  # Identifiant entier 0-51 (voir moteur_poker.cartes)
+            cls._INSTANCES[id_carte] = carte
+
+    def __new__(cls, rang, couleur):
+        return cls._INSTANCES[cls.IDS[(rang, couleur)]]
+
+    def __reduce__(self):
+        return type(self), (self.rang, self.couleur)
+
+    def __hash__(self):
+        # Hachage par identifiant : l'ordre d'un ensemble de cartes ne dépend pas de l'exécution
+        return self.id
+
+    def __lt__(self, autre):
+        if not isinstance(autre, Carte):
+            return NotImplemented
+        return self.id < autre.id
+
+    def __repr__(self):
+        return f"{self.rang}{self.couleur}"
+
+    @classmethod
+    def depuis_id(cls, id_carte):
+        """Retourne la carte correspondant à un identifiant entier."""
+        return cls._INSTANCES[id_carte]
+
+    def valeur(self):
+        """Retourne une valeur numérique de la carte pour le classement."""
+        return rang_de(self.id)
+
+
+Carte._indexer()
+
+
+# Classe Joueur
+class Joueur:
+    def __init__(self, nom, ia=False):
+        self.nom = nom
+        self.cartes = []
+        self.ia = ia
+        self.tapis = 100  # Jetons initiaux
+        self.actif = True
+
+    def recevoir(self, cartes):
+        self.cartes.extend(cartes)
+
+    def reset_cartes(self):
+        self.cartes.clear()  # La liste est réutilisée d'une donne à l'autre
+
+    def miser(self, montant):
+        montant = min(montant, self.tapis)
+        self.tapis -= montant
+        return montant
+
+    def __repr__(self):
+        return f"{self.nom} (Jetons : {self.tapis})"
+
+
+# Classe Croupier
+class Croupier:
+    def __init__(self, classe_carte=Carte, rng=None, melange_paresseux=False):
+        self.classe_carte = classe_carte
+        self.rng = rng if rng is not None else creer_rng()  # Voir moteur_poker.aleatoire
+        self.melange_paresseux = melange_paresseux  # Ne mélanger que les cartes distribuées
+        self.sabot = Paquet()  # Identifiants des cartes, mélangés sur place
+        self.cartes = [classe_carte.depuis_id(id_carte) for id_carte in PAQUET]  # Indexées par identifiant
+
+    @property
+    def paquet(self):
+        """Cartes restant à distribuer (copie).
+
+        Elles sont dans l'ordre de distribution, sauf en mélange paresseux : cet
+        ordre n'y est alors fixé qu'au moment du tirage.
+        """
+        return [self.cartes[id_carte] for id_carte in self.sabot.restants()]
+
+    def rassembler(self):
+        self.sabot.rassembler()
+
+    def melanger(self):
+        self.sabot.melanger(self.rng, self.melange_paresseux)
+
+    def couper(self):
+        self.sabot.couper(self.rng.randint(0, len(self.sabot)))
+
+    def tirer(self):
+        return self.cartes[self.sabot.tirer()]
+
+    def bruler(self):
+        return self.tirer()
+
+    def distribuer(self, nombre, joueurs):
+        for _ in range(nombre):
+            for joueur in joueurs:
+                if self.sabot:
+                    joueur.cartes.append(self.tirer())
+
+
+# Classe Partie
+class Partie:
+    def __init__(self, joueurs, classe_carte=Carte, rng=None, melange_paresseux=False, strategie_ia=None):
+        self.joueurs = joueurs
+        self.rng = rng if rng is not None else creer_rng()  # Générateur des donnes, utilisé par le croupier
+        self.croupier = Croupier(classe_carte, self.rng, melange_paresseux)
+        self.cartes_communes = []
+        self.pot = 0
+        self.mise_actuelle = 0
+        self.tour_mise = 0  # Compteur pour savoir quel joueur doit agir
+        self.gagnant = None
+        self.cartes_deja_brulees = []
+        self.evaluations = {}  # Évaluation incrémentale de la main de chaque joueur
+        self.engagements = {}  # Jetons misés par chaque joueur depuis le début de la donne
+        self.actions = []  # (nombre de cartes communes, action) de chaque décision jouée (voir noter_action)
+        self.tour_en_cours = None  # TourDeMise de la rue en cours, s'il y en a un
+        self.bouton = 0  # Place du bouton de la donne en cours
+        self.enregistreur = None  # Reçoit les événements de la donne (voir moteur_poker.historique)
+        if strategie_ia is None:
+            from moteur_poker.strategies import StrategieEquite  # Import différé : strategies importe ce module
+            strategie_ia = StrategieEquite()
+        self.strategie_ia = strategie_ia
+
+    def nouvelle_partie(self, graine=None):
+        """Prépare une nouvelle donne ; avec une graine, la donne est reproductible à l'identique."""
+        if graine is not None:
+            self.rng.seed(graine)
+        if self.enregistreur is not None:
+            self.enregistreur.enregistrer(NOUVELLE_MAIN, graine)
+        self.pot = 0
+        self.mise_actuelle = 0
+        self.cartes_communes = []
+        self.cartes_deja_brulees.clear()
+        self.actions.clear()
+        self.tour_en_cours = None
+        self.gagnant = None
+        self.evaluations = {}
+        self.engagements = {joueur: 0 for joueur in self.joueurs}
+        self.croupier.rassembler()
+        self.croupier.melanger()
+        self.croupier.couper()
+
+        for joueur in self.joueurs:
+            joueur.reset_cartes()
+
+    def distribuer_cartes(self):
+        self.croupier.distribuer(2, self.joueurs)
+        self.evaluations = {joueur: EvaluationIncrementale([carte.id for carte in joueur.cartes])
+                            for joueur in self.joueurs}
+        if self.enregistreur is not None:
+            for place, joueur in enumerate(self.joueurs):
+                for carte in joueur.cartes:
+                    self.enregistreur.enregistrer(CARTE_JOUEUR, place, carte.id)
+
+    def reveler(self, carte):
+        """Ajoute une carte commune et la reporte dans l'évaluation de chaque joueur."""
+        self.cartes_communes.append(carte)
+        for evaluation in self.evaluations.values():
+            evaluation.ajouter(carte.id)
+        if self.enregistreur is not None:
+            self.enregistreur.enregistrer(COMMUNE, carte.id)
+
+    def bruler(self):
+        carte = self.croupier.bruler()
+        self.cartes_deja_brulees.append(carte)
+        if self.enregistreur is not None:
+            self.enregistreur.enregistrer(BRULEE, carte.id)
+
+    def flop(self):
+        self.bruler()
+        for _ in range(3):
+            self.reveler(self.croupier.tirer())
+
+    def turn_or_river(self):
+        self.bruler()
+        self.reveler(self.croupier.tirer())
+
+    def ajouter_au_pot(self, montant):
+        self.pot += montant
+
+    def miser(self, joueur, montant):
+        """Prélève au plus montant sur le tapis de joueur et l'ajoute au pot ; retourne la mise réelle."""
+        mise = joueur.miser(montant)
+        self.engagements[joueur] = self.engagements.get(joueur, 0) + mise
+        self.ajouter_au_pot(mise)
+        if self.enregistreur is not None:
+            self.enregistreur.enregistrer(MISE, self.joueurs.index(joueur), mise)
+        return mise
+
+    def coucher(self, joueur):
+        joueur.actif = False
+        if self.enregistreur is not None:
+            self.enregistreur.enregistrer(COUCHE, self.joueurs.index(joueur))
+
+    def noter_action(self, action):
+        """Ajoute action à l'historique des enchères, y compris pour les décisions prises hors de TourDeMise."""
+        self.actions.append((len(self.cartes_communes), action))
+
+    def joueurs_actifs(self):
+        return [joueur for joueur in self.joueurs if joueur.actif]
+
+    def abattage(self):
+        """Partage le pot entre les meilleures mains encore en jeu et retourne les gains de chacun.
+
+        Un joueur à tapis ne peut gagner, de chaque adversaire, que ce qu'il a lui-même
+        misé : le pot est découpé en pots secondaires par niveau d'engagement.
+        """
+        forces = self.evaluer_combinaisons()
+        gains = {joueur: 0 for joueur in forces}
+        engagements = self.engagements
+        precedent = 0
+        for niveau in sorted({m for m in engagements.values() if m > 0}):
+            contributeurs = [joueur for joueur in self.joueurs if engagements.get(joueur, 0) >= niveau]
+            montant = (niveau - precedent) * len(contributeurs)
+            precedent = niveau
+            candidats = [joueur for joueur in contributeurs if joueur in forces] or list(forces)
+            meilleure = max(forces[joueur] for joueur in candidats)
+            gagnants = [joueur for joueur in candidats if forces[joueur] == meilleure]
+            part, reste = divmod(montant, len(gagnants))
+            for i, joueur in enumerate(gagnants):
+                gains[joueur] += part + (i < reste)  # Jetons indivisibles aux premiers servis
+        # Jetons ajoutés au pot sans passer par miser : au meilleur des joueurs restants
+        reste = self.pot - sum(gains.values())
+        if reste > 0 and forces:
+            gains[max(forces, key=forces.get)] += reste
+        for joueur, gain in gains.items():
+            joueur.tapis += gain
+        if self.enregistreur is not None:
+            for place, joueur in enumerate(self.joueurs):
+                if gains.get(joueur):
+                    self.enregistreur.enregistrer(GAIN, place, gains[joueur])
+            self.enregistreur.enregistrer(FIN_MAIN)
+        self.pot = 0
+        meilleure = max(forces.values(), default=None)
+        self.gagnant = next((joueur for joueur in forces if forces[joueur] == meilleure), None)
+        return gains
+
+    def evaluer_combinaisons(self):
+        # Fonction d'évaluation des mains des joueurs
+        mains = {}
+        for joueur in self.joueurs:
+            if joueur.actif:
+                evaluation = self.evaluations.get(joueur)
+                if evaluation is not None:
+                    mains[joueur] = evaluation.force()
+                else:
+                    mains[joueur] = self.evaluer_main(joueur.cartes + self.cartes_communes)
+        return mains
+
+    def equite(self, joueur, **options):
+        """Estime la probabilité de gain de joueur contre les autres joueurs actifs.
+
+        Les cartes des adversaires et les cartes brûlées sont inconnues du joueur :
+        les donnes sont donc tirées parmi toutes les cartes qu'il ne voit pas.
+        """
+        nb_adversaires = sum(1 for j in self.joueurs if j.actif and j is not joueur)
+        return equite(joueur.cartes, self.cartes_communes, max(nb_adversaires, 1), **options)
+
+    def equites_exactes(self):
+        """Calcule l'équité exacte de chaque joueur actif, toutes les cartes étant dévoilées."""
+        actifs = [joueur for joueur in self.joueurs if joueur.actif]
+        return {
+            joueur: equite_exacte(joueur.cartes, self.cartes_communes,
+                                  [autre.cartes for autre in actifs if autre is not joueur])
+            for joueur in actifs
+        }
+
+    def evaluer_main(self, cartes):
+        """Retourne la force (entier comparable) de la meilleure combinaison de 5 à 7 cartes."""
+        return evaluer([carte.id for carte in cartes])
+
+    def decision_ia(self, ia):
+        """Décision de strategie_ia pour ia, sans modifier la partie : retourne (action, mise totale).
+
+        L'IA doit suivre mise_actuelle ; une relance s'y ajoute dans la limite de son tapis.
+        """
+        a_suivre = min(self.mise_actuelle, ia.tapis)
+        action, montant = self.strategie_ia(self, ia, a_suivre)
+        if action == SE_COUCHER and a_suivre > 0:
+            return SE_COUCHER, 0
+        if action == RELANCER:
+            return RELANCER, min(a_suivre + montant, ia.tapis)
+        return SUIVRE, a_suivre
+
+    def ia_appliquer(self, ia, decision):
+        """Joue pour ia la décision (action, mise) retournée par decision_ia ; retourne le message à afficher."""
+        action, mise = decision
+        self.noter_action(action)
+        if action == SE_COUCHER:
+            self.coucher(ia)
+            return "L'IA se couche."
+
+        self.mise_actuelle = mise
+        self.miser(ia, mise)
+        return f"L'IA mise {mise} jetons."
+
+    def ia_jouer(self, ia):
+        # IA fondée sur l'équité de sa main et la cote du pot (voir moteur_poker.strategies)
+        if not ia.actif:
+            return "L'IA s'est déjà couchée."
+        return self.ia_appliquer(ia, self.decision_ia(ia))
+
+
+# Classe TourDeMise
+class TourDeMise:
+    """Tour d'enchères d'une rue de Partie.
+
+    Les joueurs actifs parlent à tour de rôle à partir de la position premier,
+    jusqu'à ce que chacun ait égalisé la plus forte mise, soit à tapis ou se soit
+    couché. Une stratégie est appelée comme strategie(partie, joueur, a_suivre) et
+    retourne (action, montant) ; montant est la relance au-delà de a_suivre.
+
+    jouer() enchaîne tout le tour ; joueur_suivant() et agir() permettent de le
+    jouer pas à pas quand la décision vient d'ailleurs (réseau, interface...).
+    """
+
+    def __init__(self, partie, premier=0, relances_max=3):
+        self.partie = partie
+        self.premier = premier
+        self.relances_max = relances_max
+        self.mises = {joueur: 0 for joueur in partie.joueurs}
+        self.plus_haute = 0
+        partie.mise_actuelle = 0
+        self.relances = 0
+        self.position = premier
+        self.en_jeu = None  # Compteurs établis au premier joueur_suivant(), après les blindes
+        self.peuvent_parler = 0
+        self.restants = 0
+        partie.tour_en_cours = self
+
+    def miser(self, joueur, montant):
+        """Fait miser montant à joueur pour ce tour (blindes, suivi ou relance) ; retourne la mise réelle."""
+        mise = self.partie.miser(joueur, montant)
+        self.mises[joueur] += mise
+        if self.mises[joueur] > self.plus_haute:
+            self.plus_haute = self.partie.mise_actuelle = self.mises[joueur]
+        return mise
+
+    def a_suivre(self, joueur):
+        return self.plus_haute - self.mises[joueur]
+
+    def joueur_suivant(self):
+        """Retourne le joueur qui doit parler, ou None si le tour est terminé."""
+        joueurs = self.partie.joueurs
+        if self.en_jeu is None:
+            self.peuvent_parler = sum(1 for joueur in joueurs if joueur.actif and joueur.tapis > 0)
+            self.en_jeu = sum(1 for joueur in joueurs if joueur.actif)
+            self.restants = self.peuvent_parler
+        while self.restants > 0 and self.en_jeu > 1:
+            joueur = joueurs[self.position % len(joueurs)]
+            if joueur.actif and joueur.tapis > 0:
+                return joueur
+            self.position += 1
+        return None
+
+    def agir(self, joueur, action, montant=0):
+        """Applique l'action du joueur retourné par joueur_suivant().
+
+        Une relance impossible devient un suivi, se coucher sans rien à suivre
+        devient une parole. Retourne (action, mise) réellement jouées.
+        """
+        if joueur is not self.joueur_suivant():
+            raise ValueError(f"Ce n'est pas à {joueur.nom} de parler.")
+        a_suivre = self.a_suivre(joueur)
+        self.position += 1
+        mise = 0
+        if (action == RELANCER and self.relances < self.relances_max and joueur.tapis > a_suivre
+                and self.peuvent_parler > 1):
+            mise = self.miser(joueur, a_suivre + max(montant, 1))
+            self.relances += 1
+            self.restants = self.peuvent_parler - 1  # Tous les autres doivent reparler
+        elif action == SE_COUCHER and a_suivre > 0:
+            self.partie.coucher(joueur)
+            self.en_jeu -= 1
+            self.restants -= 1
+            self.peuvent_parler -= 1
+        else:
+            action = SUIVRE
+            mise = self.miser(joueur, a_suivre)
+            self.restants -= 1
+        if joueur.tapis == 0:
+            self.peuvent_parler -= 1
+        self.partie.noter_action(action)
+        return action, mise
+
+    def jouer(self, strategies):
+        """Joue le tour ; strategies associe une stratégie à chaque joueur (dictionnaire).
+
+        Retourne le nombre de joueurs encore en jeu.
+        """
+        joueur = self.joueur_suivant()
+        while joueur is not None:
+            self.agir(joueur, *strategies[joueur](self.partie, joueur, self.a_suivre(joueur)))
+            joueur = self.joueur_suivant()
+        return self.en_jeu
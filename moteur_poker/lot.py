@@ -0,0 +1,88 @@
+"""Évaluation vectorisée de lots de mains avec NumPy (dépendance facultative du moteur).
+
+Les mêmes tables que moteur_poker.evaluateur sont converties en tableaux NumPy :
+une main est évaluée par quelques consultations de tables, sans boucle Python
+par main.
+"""
+
+from itertools import combinations_with_replacement
+
+import numpy as np
+
+from moteur_poker import evaluateur
+
+TAILLE_BLOC = 1 << 18  # Mains traitées à la fois, pour borner la mémoire temporaire
+
+_CLE_RANG = np.array(evaluateur.CLE_RANG, dtype=np.int64)
+_BIT_COULEUR = np.array(evaluateur.BIT_COULEUR, dtype=np.int64)
+_FORCE_COULEUR = np.array(evaluateur._FORCE_COULEUR, dtype=np.int32)
+_CLES_TRIEES = np.array(sorted(evaluateur._FORCE_RANGS), dtype=np.int64)
+_FORCES_TRIEES = np.array([evaluateur._FORCE_RANGS[cle] for cle in _CLES_TRIEES.tolist()], dtype=np.int32)
+_TREIZE_BITS = 0x1FFF
+
+# Poids de rang dont les sommes sur 7 cartes (au plus 4 par rang) sont toutes
+# distinctes : la somme indexe directement une table d'environ 7,8 millions d'entrées.
+_POIDS_SEPT = (0, 1, 5, 22, 98, 453, 2031, 8698, 22854, 83661, 262349, 636345, 1479181)
+_POIDS_SEPT_CARTES = np.array([_POIDS_SEPT[c >> 2] for c in range(52)], dtype=np.int32)
+_table_sept = None
+
+
+def _table_sept_cartes():
+    """Construit (au premier appel) la table directe des forces sans couleur pour 7 cartes."""
+    global _table_sept
+    if _table_sept is None:
+        cles, forces = [], []
+        for main in combinations_with_replacement(range(evaluateur.NB_RANGS), 7):
+            if any(main[i] == main[i + 4] for i in range(3)):
+                continue
+            cles.append(sum(_POIDS_SEPT[r] for r in main))
+            forces.append(evaluateur._FORCE_RANGS[sum(evaluateur.CLE_RANG[4 * r] for r in main)])
+        table = np.zeros(max(cles) + 1, dtype=np.int32)
+        table[cles] = forces
+        _table_sept = table
+    return _table_sept
+
+
+def _evaluer_bloc(cartes):
+    # Les cartes d'une main étant distinctes, la somme de leurs bits équivaut à un OU.
+    masques = _BIT_COULEUR[cartes].sum(axis=1)
+    if cartes.shape[1] == 7:
+        forces = _table_sept_cartes()[_POIDS_SEPT_CARTES[cartes].sum(axis=1)]
+    else:
+        forces = _FORCES_TRIEES[np.searchsorted(_CLES_TRIEES, _CLE_RANG[cartes].sum(axis=1))]
+    couleur = _FORCE_COULEUR[masques & _TREIZE_BITS]
+    for decalage in (16, 32, 48):
+        np.maximum(couleur, _FORCE_COULEUR[(masques >> decalage) & _TREIZE_BITS], out=couleur)
+    return np.where(couleur > 0, couleur, forces)
+
+
+def evaluer_lot(cartes):
+    """Retourne les forces (tableau int32 de taille N) d'un tableau (N, k) d'identifiants, k <= 7.
+
+    Les forces sont identiques à celles de moteur_poker.evaluateur.evaluer.
+    """
+    cartes = np.asarray(cartes)
+    if cartes.ndim != 2 or cartes.shape[1] > evaluateur.NB_CARTES_MAX:
+        raise ValueError("evaluer_lot attend un tableau (N, k) de cartes avec k <= 7.")
+    if cartes.size and (cartes.min() < 0 or cartes.max() > 51):
+        raise ValueError("Les identifiants de cartes doivent être compris entre 0 et 51.")
+    cartes = cartes.astype(np.intp, copy=False)
+    resultat = np.empty(len(cartes), dtype=np.int32)
+    for debut in range(0, len(cartes), TAILLE_BLOC):
+        resultat[debut:debut + TAILLE_BLOC] = _evaluer_bloc(cartes[debut:debut + TAILLE_BLOC])
+    return resultat
+
+
+def categories_lot(forces):
+    """Retourne les catégories (1 à 10) d'un tableau de forces."""
+    return np.asarray(forces) >> evaluateur._DECALAGE_CATEGORIE
+
+
+def mains_aleatoires(nb_mains, nb_cartes=7, rng=None):
+    """Tire nb_mains mains de nb_cartes cartes distinctes, sous forme de tableau (N, nb_cartes).
+
+    rng est un numpy.random.Generator ou un moteur_poker.aleatoire.GenerateurPCG64.
+    """
+    rng = getattr(rng, 'generateur', rng) if rng is not None else np.random.default_rng()
+    # Trier des clés aléatoires donne une permutation uniforme de chaque ligne.
+    return np.argsort(rng.random((nb_mains, 52)), axis=1)[:, :nb_cartes].astype(np.int8)
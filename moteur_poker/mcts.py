@@ -0,0 +1,434 @@
+"""Recherche arborescente Monte-Carlo (MCTS) pour les donnes à plusieurs joueurs.
+
+À chaque décision, StrategieMCTS répète jusqu'à l'échéance :
+
+1. tirer les mains des adversaires encore en jeu dans leurs fourchettes
+   supposées (voir moteur_poker.strategies) et l'ordre des cartes communes à venir ;
+2. descendre l'arbre des enchères : à ses propres décisions, le joueur
+   choisit l'action qui maximise le critère UCB1 ; les adversaires jouent
+   selon politique_force() avec les mains qui leur ont été tirées ;
+3. ajouter un nœud pour la première action sortie de l'arbre, puis finir la
+   donne avec politique_force() pour tous (rues restantes, abattage) ;
+4. reporter le gain du joueur, rapporté aux jetons en jeu, sur le chemin.
+
+L'arbre ne retient que les actions (arbre « en boucle ouverte ») : les cartes
+sont retirées à chaque passage, ce qui garde l'arbre petit. Les enchères
+reprennent les règles de TourDeMise (relances_max relances par rue, relance
+d'une demi-pot au moins une grosse blinde).
+
+Les nœuds sont pris dans une ReserveNoeuds de taille fixe, une par table : la
+mémoire ne dépend pas de la durée de la recherche. Quand la réserve est pleine,
+la recherche continue sans agrandir l'arbre. Entre deux décisions d'une même
+donne, l'arbre de chaque joueur est repris au nœud des actions jouées depuis
+(lues dans partie.actions, que TourDeMise, Partie.ia_appliquer et les
+interfaces tiennent à jour par Partie.noter_action) et le reste est rendu à
+la réserve.
+
+    strategie = StrategieMCTS(budget_ms=100, noeuds_max=100_000)
+    simuler(1000, joueurs, [strategie, strategie, strategie_suiveur])
+"""
+
+import math
+import time
+from array import array
+
+from moteur_poker import preflop
+from moteur_poker.aleatoire import creer_rng
+from moteur_poker.cartes import PAQUET, ids
+from moteur_poker.evaluateur import evaluer, categorie, PAIRE, DEUX_PAIRES
+from moteur_poker.jeu import SE_COUCHER, SUIVRE, RELANCER
+from moteur_poker.strategies import classement_preflop, fourchette, largeur_fourchette
+
+ACTIONS = (SE_COUCHER, SUIVRE, RELANCER)
+NB_ACTIONS = len(ACTIONS)
+_INDICE_ACTION = {action: i for i, action in enumerate(ACTIONS)}
+_ESSAIS_TIRAGE = 20  # Essais pour tirer une main adverse compatible avant de la tirer au hasard
+PART_RELANCE = 0.1  # Part des meilleures mains de départ relancées par politique_force()
+PART_SUIVI = 0.4  # Part des meilleures mains de départ suivies
+COTE_SUIVI = 0.2  # Cote du pot en dessous de laquelle politique_force() suit une main faible
+
+_parts_preflop = None
+
+
+def _part_preflop(main):
+    """Part des combinaisons de départ meilleures que main (0 pour les as)."""
+    global _parts_preflop
+    if _parts_preflop is None:
+        parts, cumul = [0.0] * preflop.NB_MAINS, 0
+        for indice in classement_preflop():
+            parts[indice] = cumul / 1326
+            cumul += len(preflop.combinaisons_main(indice))
+        _parts_preflop = parts
+    return _parts_preflop[preflop.indice_main(*main)]
+
+
+def politique_force(etat, place, legales):
+    """Action simulée d'un joueur d'après la force de sa main : relance les fortes, suit les moyennes.
+
+    Une main faible suit quand même si la mise à suivre est petite devant le pot.
+    """
+    main = etat.mains[place]
+    if etat.communes:
+        force = categorie(evaluer(main + etat.communes))
+        niveau = 2 if force >= DEUX_PAIRES else force >= PAIRE
+    else:
+        part = _part_preflop(main)
+        niveau = 2 if part < PART_RELANCE else part < PART_SUIVI
+    if niveau == 2 and 2 in legales:
+        return 2
+    a_suivre = etat.plus_haute - etat.mises[place]
+    if niveau or a_suivre <= COTE_SUIVI * (etat.pot + a_suivre):
+        return 1
+    return 0
+
+
+class ReserveNoeuds:
+    """Nœuds d'arbres de recherche alloués dans des tableaux de taille fixe.
+
+    Un nœud est un indice : enfants[NB_ACTIONS * n + a] est l'enfant par
+    l'action a (-1 s'il n'existe pas), visites[n] et sommes[n] le nombre de
+    passages et la somme des gains, pour le joueur à qui appartient l'arbre,
+    des donnes simulées passées par n.
+    Les nœuds rendus sont réutilisés.
+    """
+
+    def __init__(self, capacite):
+        if capacite < 1:
+            raise ValueError("La réserve doit contenir au moins un nœud.")
+        self.capacite = capacite
+        self.enfants = array('i', [-1]) * (NB_ACTIONS * capacite)
+        self.visites = array('i', [0]) * capacite
+        self.sommes = array('d', [0.0]) * capacite
+        self._libres = array('i', range(capacite - 1, -1, -1))
+
+    def __len__(self):
+        """Nombre de nœuds utilisés."""
+        return self.capacite - len(self._libres)
+
+    def allouer(self):
+        """Retourne un nœud vierge, ou -1 si la réserve est pleine."""
+        if not self._libres:
+            return -1
+        noeud = self._libres.pop()
+        self.visites[noeud] = 0
+        self.sommes[noeud] = 0.0
+        for i in range(NB_ACTIONS * noeud, NB_ACTIONS * (noeud + 1)):
+            self.enfants[i] = -1
+        return noeud
+
+    def liberer(self, racine, sauf=-1):
+        """Rend à la réserve le sous-arbre de racine, à l'exception du sous-arbre de sauf."""
+        pile = [racine]
+        while pile:
+            noeud = pile.pop()
+            if noeud == sauf:
+                continue
+            for i in range(NB_ACTIONS * noeud, NB_ACTIONS * (noeud + 1)):
+                if self.enfants[i] >= 0:
+                    pile.append(self.enfants[i])
+            self._libres.append(noeud)
+
+
+class _Etat:
+    """État d'une donne simulée, aux places de partie.joueurs ; les enchères suivent TourDeMise."""
+
+    __slots__ = ('nb', 'mains', 'communes', 'tapis', 'actifs', 'mises', 'engagements', 'pot', 'plus_haute',
+                 'relances', 'relances_max', 'position', 'restants', 'peuvent_parler', 'en_jeu', 'premier',
+                 'grosse_blinde', 'taille_relance')
+
+    def copie(self):
+        etat = _Etat.__new__(_Etat)
+        for nom in _Etat.__slots__:
+            setattr(etat, nom, getattr(self, nom))
+        for nom in ('mains', 'communes', 'tapis', 'actifs', 'mises', 'engagements'):
+            setattr(etat, nom, list(getattr(self, nom)))
+        return etat
+
+    def joueur_suivant(self):
+        while self.restants > 0 and self.en_jeu > 1:
+            place = self.position % self.nb
+            if self.actifs[place] and self.tapis[place] > 0:
+                return place
+            self.position += 1
+        return None
+
+    def legales(self, place):
+        """Indices des actions permises (se coucher n'est permis que s'il y a une mise à suivre)."""
+        a_suivre = self.plus_haute - self.mises[place]
+        legales = [0, 1] if a_suivre > 0 else [1]
+        if self.relances < self.relances_max and self.tapis[place] > a_suivre and self.peuvent_parler > 1:
+            legales.append(2)
+        return legales
+
+    def _miser(self, place, montant):
+        mise = min(montant, self.tapis[place])
+        self.tapis[place] -= mise
+        self.mises[place] += mise
+        self.engagements[place] += mise
+        self.pot += mise
+        self.plus_haute = max(self.plus_haute, self.mises[place])
+
+    def agir(self, place, action):
+        a_suivre = self.plus_haute - self.mises[place]
+        self.position += 1
+        if action == 2:
+            self._miser(place, a_suivre + max(self.grosse_blinde, int(self.pot * self.taille_relance)))
+            self.relances += 1
+            self.restants = self.peuvent_parler - 1
+        elif action == 0:
+            self.actifs[place] = False
+            self.en_jeu -= 1
+            self.restants -= 1
+            self.peuvent_parler -= 1
+        else:
+            self._miser(place, a_suivre)
+            self.restants -= 1
+        if self.tapis[place] == 0:
+            self.peuvent_parler -= 1
+
+    def rue_suivante(self, cartes_a_venir):
+        """Dévoile la rue suivante et ouvre ses enchères ; retourne False si la donne est finie."""
+        if self.en_jeu <= 1 or len(self.communes) == 5:
+            return False
+        self.communes = cartes_a_venir[:len(self.communes) + (1 if self.communes else 3)]
+        self.mises = [0] * self.nb
+        self.plus_haute = 0
+        self.relances = 0
+        self.position = self.premier
+        self.peuvent_parler = sum(1 for p in range(self.nb) if self.actifs[p] and self.tapis[p] > 0)
+        self.restants = self.peuvent_parler
+        return True
+
+    def gains(self):
+        """Jetons remportés par chaque place : pots par niveau d'engagement, comme Partie.abattage."""
+        gains = [0] * self.nb
+        actifs = [p for p in range(self.nb) if self.actifs[p]]
+        if len(actifs) == 1:
+            gains[actifs[0]] = self.pot
+            return gains
+        forces = {p: evaluer(self.mains[p] + self.communes) for p in actifs}
+        precedent = 0
+        for niveau in sorted({m for m in self.engagements if m > 0}):
+            contributeurs = [p for p in range(self.nb) if self.engagements[p] >= niveau]
+            montant = (niveau - precedent) * len(contributeurs)
+            precedent = niveau
+            candidats = [p for p in contributeurs if p in forces] or actifs
+            meilleure = max(forces[p] for p in candidats)
+            gagnants = [p for p in candidats if forces[p] == meilleure]
+            for p in gagnants:
+                gains[p] += montant / len(gagnants)
+        reste = self.pot - sum(gains)
+        if reste > 0:  # Jetons ajoutés au pot sans engagement connu
+            gains[max(forces, key=forces.get)] += reste
+        return gains
+
+
+class StrategieMCTS:
+    """Décide par recherche arborescente Monte-Carlo : strategie(partie, joueur, a_suivre).
+
+    budget_ms : durée d'une décision (None pour ne compter que les itérations).
+    iterations_max : nombre maximal d'itérations par décision. noeuds_max :
+    taille de la réserve de nœuds, partagée par tous les joueurs qu'elle fait
+    jouer. exploration : constante du critère UCB1, à la mesure des gains
+    (rapportés aux jetons en jeu, ils dépassent rarement ±0.3). taille_relance :
+    relance simulée, en part du pot.
+    """
+
+    def __init__(self, budget_ms=100, iterations_max=None, noeuds_max=100_000, exploration=0.2,
+                 taille_relance=0.5, relances_max=3, grosse_blinde=2, rng=None):
+        if budget_ms is None and iterations_max is None:
+            raise ValueError("Il faut un budget de temps ou un nombre maximal d'itérations.")
+        self.budget_ms = budget_ms
+        self.iterations_max = iterations_max
+        self.exploration = exploration
+        self.taille_relance = taille_relance
+        self.relances_max = relances_max
+        self.grosse_blinde = grosse_blinde
+        self.rng = rng or creer_rng()
+        self.reserve = ReserveNoeuds(noeuds_max)
+        self._arbres = {}  # Joueur -> (racine, (cartes du joueur, actions de partie.actions déjà prises en compte))
+        self.statistiques = {}  # Dernière décision : itérations, nœuds, visites par action
+
+    def __call__(self, partie, joueur, a_suivre):
+        return self.decider(partie, joueur, a_suivre)
+
+    def oublier(self):
+        """Rend tous les arbres à la réserve."""
+        for racine, _ in self._arbres.values():
+            self.reserve.liberer(racine)
+        self._arbres.clear()
+
+    def _racine(self, partie, joueur):
+        """Nœud racine de joueur : l'arbre de sa décision précédente, repris aux actions jouées depuis."""
+        cartes, actions = ids(joueur.cartes), list(partie.actions)
+        arbre = self._arbres.pop(joueur, None)
+        if arbre is not None:
+            racine, (cartes_vues, vues) = arbre
+            if cartes == cartes_vues and actions[:len(vues)] == vues and len(actions) > len(vues):
+                noeud = racine
+                for _, action in actions[len(vues):]:
+                    noeud = self.reserve.enfants[NB_ACTIONS * noeud + _INDICE_ACTION[action]]
+                    if noeud < 0:
+                        break
+                self.reserve.liberer(racine, sauf=noeud)
+                if noeud >= 0:
+                    self._arbres[joueur] = (noeud, (cartes, actions))
+                    return noeud
+            else:
+                # Donne nouvelle (ou historique inconnu) : seul l'arbre de joueur est périmé, avec ceux
+                # des places dont les cartes ont changé depuis ; les autres sièges gardent le leur
+                self.reserve.liberer(racine)
+                for autre, (racine_autre, (cartes_autre, _)) in list(self._arbres.items()):
+                    if ids(autre.cartes) != cartes_autre:
+                        del self._arbres[autre]
+                        self.reserve.liberer(racine_autre)
+        racine = self.reserve.allouer()
+        if racine < 0:
+            self.oublier()
+            racine = self.reserve.allouer()
+        self._arbres[joueur] = (racine, (cartes, actions))
+        return racine
+
+    def etat(self, partie, joueur, a_suivre):
+        """État de la donne vu par joueur, les mains adverses restant à tirer."""
+        joueurs = partie.joueurs
+        etat = _Etat()
+        etat.nb = len(joueurs)
+        etat.mains = [[] for _ in joueurs]
+        etat.mains[joueurs.index(joueur)] = ids(joueur.cartes)
+        etat.communes = ids(partie.cartes_communes)
+        etat.tapis = [j.tapis for j in joueurs]
+        etat.actifs = [j.actif for j in joueurs]
+        etat.engagements = [partie.engagements.get(j, 0) for j in joueurs]
+        etat.pot = partie.pot
+        etat.premier = (partie.bouton + 1) % etat.nb
+        etat.grosse_blinde = self.grosse_blinde
+        etat.taille_relance = self.taille_relance
+        etat.peuvent_parler = sum(1 for j in joueurs if j.actif and j.tapis > 0)
+        etat.en_jeu = sum(etat.actifs)
+        tour = partie.tour_en_cours
+        if tour is not None and tour.en_jeu is not None and joueurs[tour.position % etat.nb] is joueur:
+            etat.mises = [tour.mises.get(j, 0) for j in joueurs]
+            etat.plus_haute = tour.plus_haute
+            etat.relances = tour.relances
+            etat.relances_max = tour.relances_max
+            etat.position = tour.position
+            etat.restants = tour.restants
+            etat.peuvent_parler = tour.peuvent_parler
+            etat.en_jeu = tour.en_jeu
+        else:
+            # Enchères menées hors de TourDeMise (interface) : les adversaires sont supposés à jour de la mise
+            etat.plus_haute = partie.mise_actuelle
+            etat.mises = [partie.mise_actuelle] * etat.nb
+            etat.mises[joueurs.index(joueur)] = partie.mise_actuelle - a_suivre
+            deja = [action for nb, action in partie.actions if nb == len(etat.communes)]
+            etat.relances = deja.count(RELANCER)
+            etat.relances_max = self.relances_max
+            etat.position = joueurs.index(joueur)
+            etat.restants = max(1, etat.peuvent_parler - len(deja))
+        return etat
+
+    def _tirer_mains(self, etat, place, fourchettes):
+        """Tire les mains adverses (dans leurs fourchettes) ; retourne les cinq cartes communes de la donne."""
+        prises = set(etat.mains[place]) | set(etat.communes)
+        for adversaire, mains in fourchettes:
+            for _ in range(_ESSAIS_TIRAGE):
+                main = self.rng.choice(mains)
+                if main[0] not in prises and main[1] not in prises:
+                    break
+            else:
+                main = self.rng.sample([c for c in PAQUET if c not in prises], 2)
+            etat.mains[adversaire] = list(main)
+            prises.update(main)
+        a_venir = 5 - len(etat.communes)
+        return etat.communes + self.rng.sample([c for c in PAQUET if c not in prises], a_venir)
+
+    def _choisir(self, noeud, legales, parent_visites):
+        """Action de legales (toutes déjà essayées) qui maximise UCB1."""
+        reserve = self.reserve
+        journal = math.log(max(parent_visites, 1))
+        meilleure, meilleur_score = legales[0], -math.inf
+        for action in legales:
+            enfant = reserve.enfants[NB_ACTIONS * noeud + action]
+            visites = reserve.visites[enfant]
+            score = reserve.sommes[enfant] / visites + self.exploration * math.sqrt(journal / visites)
+            if score > meilleur_score:
+                meilleure, meilleur_score = action, score
+        return meilleure
+
+    def _iterer(self, racine, etat_racine, place, fourchettes, echelle, tapis_depart):
+        reserve = self.reserve
+        etat = etat_racine.copie()
+        cartes = self._tirer_mains(etat, place, fourchettes)
+        chemin = [racine]
+        noeud = racine
+        # Sélection et expansion
+        while True:
+            acteur = etat.joueur_suivant()
+            if acteur is None:
+                if not etat.rue_suivante(cartes):
+                    break
+                continue
+            legales = etat.legales(acteur)
+            if acteur != place:
+                action = politique_force(etat, acteur, legales)
+            else:
+                essayees = [a for a in legales if reserve.enfants[NB_ACTIONS * noeud + a] >= 0]
+                if len(essayees) < len(legales):
+                    action = self.rng.choice([a for a in legales if a not in essayees])
+                else:
+                    action = self._choisir(noeud, legales, reserve.visites[noeud])
+            etat.agir(acteur, action)
+            enfant = reserve.enfants[NB_ACTIONS * noeud + action]
+            if enfant < 0:
+                enfant = reserve.allouer()
+                if enfant >= 0:
+                    reserve.enfants[NB_ACTIONS * noeud + action] = enfant
+                    chemin.append(enfant)
+                break
+            noeud = enfant
+            chemin.append(noeud)
+        # Fin de la donne simulée
+        while True:
+            acteur = etat.joueur_suivant()
+            if acteur is not None:
+                etat.agir(acteur, politique_force(etat, acteur, etat.legales(acteur)))
+            elif not etat.rue_suivante(cartes):
+                break
+        recompense = (etat.tapis[place] + etat.gains()[place] - tapis_depart[place]) / echelle
+        for noeud in chemin:
+            reserve.visites[noeud] += 1
+            reserve.sommes[noeud] += recompense
+
+    def decider(self, partie, joueur, a_suivre):
+        """Retourne (action, montant), montant étant la relance au-delà de a_suivre."""
+        debut = time.perf_counter()
+        echeance = debut + self.budget_ms / 1000 if self.budget_ms is not None else math.inf
+        adversaires = [j for j in partie.joueurs if j.actif and j is not joueur]
+        if len(joueur.cartes) != 2 or not adversaires:
+            return SUIVRE, 0
+        place = partie.joueurs.index(joueur)
+        etat = self.etat(partie, joueur, a_suivre)
+        if etat.joueur_suivant() != place:
+            return SUIVRE, 0
+        racine = self._racine(partie, joueur)
+        fourchettes = [(partie.joueurs.index(j), fourchette(largeur_fourchette(partie.engagements.get(j, 0), j.tapis)))
+                       for j in adversaires]
+        echelle = max(etat.pot + sum(t for t, actif in zip(etat.tapis, etat.actifs) if actif), 1)
+        iterations = 0
+        while time.perf_counter() < echeance and (self.iterations_max is None or iterations < self.iterations_max):
+            self._iterer(racine, etat, place, fourchettes, echelle, etat.tapis)
+            iterations += 1
+
+        legales = etat.legales(place)
+        visites = {ACTIONS[a]: self._visites(racine, a) for a in legales}
+        action = max(legales, key=lambda a: self._visites(racine, a))
+        self.statistiques = {'iterations': iterations, 'noeuds': len(self.reserve), 'visites': visites,
+                             'duree': time.perf_counter() - debut}
+        if action == 2:
+            return RELANCER, max(self.grosse_blinde, int(etat.pot * self.taille_relance))
+        return ACTIONS[action], 0
+
+    def _visites(self, noeud, action):
+        enfant = self.reserve.enfants[NB_ACTIONS * noeud + action]
+        return self.reserve.visites[enfant] if enfant >= 0 else 0
@@ -0,0 +1,87 @@
+"""Paquet de cartes sans allocation : identifiants dans un tableau préalloué.
+
+Le mélange (Fisher-Yates) échange les identifiants sur place, la coupe ne
+déplace que le point de départ de la lecture et la distribution avance un
+curseur : une donne complète ne crée aucun objet.
+
+En mode paresseux, melanger() ne fait que mémoriser le générateur : chaque
+tirage échange alors une carte choisie au hasard parmi les restantes avec la
+carte sous le curseur. C'est le même algorithme de Fisher-Yates, arrêté après
+les cartes réellement distribuées, donc la même loi qu'un mélange complet ;
+une main tête-à-tête ne consomme que 12 nombres aléatoires au lieu de 51.
+Pour une même graine, les cartes tirées diffèrent toutefois d'un mode à l'autre.
+"""
+
+import random
+from array import array
+
+from moteur_poker.cartes import NB_CARTES
+
+_ORDRE_INITIAL = array('B', range(NB_CARTES))
+
+
+class Paquet:
+    """Les 52 identifiants de cartes, lus circulairement à partir du point de coupe."""
+
+    __slots__ = ('ids', 'debut', 'position', 'rng')
+
+    def __init__(self):
+        self.ids = array('B', _ORDRE_INITIAL)
+        self.debut = 0  # Point de coupe
+        self.position = 0  # Nombre de cartes déjà tirées
+        self.rng = None  # Générateur du mélange paresseux en cours, sinon None
+
+    def __len__(self):
+        return NB_CARTES - self.position
+
+    def rassembler(self):
+        """Remet les 52 cartes dans l'ordre initial."""
+        self.ids[:] = _ORDRE_INITIAL
+        self.debut = 0
+        self.position = 0
+        self.rng = None
+
+    def melanger(self, rng=random, paresseux=False):
+        """Mélange sur place les cartes restantes (algorithme de Fisher-Yates).
+
+        Avec paresseux=True, le mélange est reporté aux tirages : l'ordre des
+        cartes restantes n'est fixé qu'au moment où elles sont tirées.
+        """
+        if paresseux:
+            self.rng = rng
+            return
+        self.rng = None
+        ids = self.ids
+        alea = rng.random
+        if self.position == 0:
+            for i in range(NB_CARTES - 1, 0, -1):
+                j = int(alea() * (i + 1))
+                ids[i], ids[j] = ids[j], ids[i]
+            return
+        depart = self.debut + self.position
+        for i in range(NB_CARTES - self.position - 1, 0, -1):
+            a = (depart + i) % NB_CARTES
+            b = (depart + int(alea() * (i + 1))) % NB_CARTES
+            ids[a], ids[b] = ids[b], ids[a]
+
+    def couper(self, pivot):
+        """Passe les pivot premières cartes sous le paquet ; seul le point de départ de la lecture change."""
+        if self.position:
+            raise ValueError("On ne coupe pas un paquet entamé.")
+        self.debut = (self.debut + pivot) % NB_CARTES
+
+    def tirer(self):
+        """Retourne l'identifiant de la carte suivante et avance le curseur."""
+        if self.position >= NB_CARTES:
+            raise IndexError("Le paquet est vide.")
+        ids = self.ids
+        i = (self.debut + self.position) % NB_CARTES
+        if self.rng is not None:
+            j = (i + int(self.rng.random() * (NB_CARTES - self.position))) % NB_CARTES
+            ids[i], ids[j] = ids[j], ids[i]
+        self.position += 1
+        return ids[i]
+
+    def restants(self):
+        """Identifiants des cartes non tirées, dans l'ordre où elles seront tirées (sauf en mélange paresseux)."""
+        return [self.ids[(self.debut + k) % NB_CARTES] for k in range(self.position, NB_CARTES)]
@@ -0,0 +1,138 @@
+"""Répartition des calculs d'équité et des simulations sur plusieurs processus.
+
+Le travail est découpé en un nombre fixe de morceaux ; chaque morceau reçoit sa
+propre graine, dérivée de la graine principale et de son numéro. Le résultat
+ne dépend donc que de la graine et du découpage, pas du nombre de processus.
+
+Sous Linux, les processus sont créés par fork après la construction des tables
+de l'évaluateur : ils les partagent en copie sur écriture au lieu de les
+reconstruire.
+"""
+
+import gc
+import multiprocessing
+import os
+import sys
+import time
+
+from moteur_poker.aleatoire import creer_rng, graine_aleatoire, graines_filles
+from moteur_poker.cartes import ids
+from moteur_poker.equite import ResultatEquite, simuler_lot, cartes_restantes
+from moteur_poker.simulation import ResultatSimulation, simuler
+
+NB_MORCEAUX = 64
+
+
+def _equite_morceau(tache):
+    """Travail d'un processus : simule un morceau de donnes avec sa propre graine."""
+    joueur, communes, nb_adversaires, restants, nb_tirages, graine, generateur = tache
+    debut = time.perf_counter()
+    resultat = simuler_lot(joueur, communes, nb_adversaires, restants, nb_tirages, creer_rng(graine, generateur),
+                           ResultatEquite())
+    resultat.duree = time.perf_counter() - debut
+    return resultat
+
+
+def _simulation_morceau(tache):
+    """Travail d'un processus : joue un morceau de donnes consécutives de la simulation."""
+    nb_mains, premiere_main, joueurs, strategies, graine, options = tache
+    return simuler(nb_mains, joueurs, strategies, graine, premiere_main=premiere_main, **options)
+
+
+class MoteurParallele:
+    """Groupe de processus réutilisable pour les calculs répartis.
+
+    S'utilise comme gestionnaire de contexte :
+        with MoteurParallele() as moteur:
+            resultat = moteur.equite(main, tableau, tirages=2_000_000, graine=1)
+    """
+
+    def __init__(self, nb_processus=None):
+        self.nb_processus = nb_processus or os.cpu_count() or 1
+        methodes = multiprocessing.get_all_start_methods()
+        contexte = multiprocessing.get_context('fork' if 'fork' in methodes else None)
+        # Les tables sont déjà construites ; les geler évite que le ramasse-miettes
+        # touche leurs pages mémoire et ne force leur copie dans chaque processus.
+        if 'moteur_poker.lot' in sys.modules:
+            sys.modules['moteur_poker.lot']._table_sept_cartes()
+        gc.freeze()
+        try:
+            self._pool = contexte.Pool(self.nb_processus)
+        except BaseException:
+            gc.unfreeze()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def fermer(self):
+        try:
+            self._pool.close()
+            self._pool.join()
+        finally:
+            gc.unfreeze()
+
+    def executer(self, fonction, taches):
+        """Applique fonction à chaque tâche dans les processus et retourne les résultats dans l'ordre."""
+        return self._pool.map(fonction, taches, chunksize=1)
+
+    def equite(self, cartes_joueur, cartes_communes=(), nb_adversaires=1, tirages=1_000_000, graine=None,
+               paquet=None, nb_morceaux=NB_MORCEAUX, generateur='mt'):
+        """Estime l'équité comme moteur_poker.equite.equite, avec un nombre fixe de tirages répartis.
+
+        Chaque morceau tire ses donnes d'un flux dérivé de graine (voir moteur_poker.aleatoire).
+        """
+        joueur = ids(cartes_joueur)
+        communes = ids(cartes_communes)
+        restants = cartes_restantes(joueur + communes, paquet)
+        taille, reste = divmod(tirages, nb_morceaux)
+        taches = [(joueur, communes, nb_adversaires, restants, taille + (i < reste), graine_fille, generateur)
+                  for i, graine_fille in enumerate(graines_filles(graine, nb_morceaux))]
+
+        debut = time.perf_counter()
+        resultat = ResultatEquite()
+        for morceau in self.executer(_equite_morceau, taches):
+            resultat.fusionner(morceau)
+        resultat.duree = time.perf_counter() - debut
+        return resultat
+
+    def simuler(self, nb_mains, joueurs, strategies, graine=None, nb_morceaux=NB_MORCEAUX, **options):
+        """Joue nb_mains donnes comme moteur_poker.simulation.simuler, réparties en morceaux de donnes consécutives.
+
+        La donne i garde la graine graine_fille(graine, i) et son bouton : avec des
+        stratégies déterministes, le résultat est celui de la simulation en série.
+        Les stratégies doivent pouvoir être copiées dans les processus (pickle) ;
+        enregistreur et journal ne sont pas pris en charge.
+        """
+        if graine is None:
+            graine = graine_aleatoire()
+        nb_morceaux = max(1, min(nb_morceaux, nb_mains))
+        taille, reste = divmod(nb_mains, nb_morceaux)
+        taches, premiere = [], 0
+        for i in range(nb_morceaux):
+            nb = taille + (i < reste)
+            taches.append((nb, premiere, joueurs, strategies, graine, options))
+            premiere += nb
+
+        debut = time.perf_counter()
+        gains = {joueur.nom: 0 for joueur in joueurs}
+        for morceau in self.executer(_simulation_morceau, taches):
+            for nom, gain in morceau.gains.items():
+                gains[nom] += gain
+        return ResultatSimulation(gains, nb_mains, time.perf_counter() - debut)
+
+
+def equite_parallele(cartes_joueur, cartes_communes=(), nb_adversaires=1, tirages=1_000_000, graine=None,
+                     nb_processus=None, **options):
+    """Raccourci : crée un groupe de processus le temps d'un seul calcul d'équité."""
+    with MoteurParallele(nb_processus) as moteur:
+        return moteur.equite(cartes_joueur, cartes_communes, nb_adversaires, tirages, graine, **options)
+
+
+def simuler_parallele(nb_mains, joueurs, strategies, graine=None, nb_processus=None, **options):
+    """Raccourci : crée un groupe de processus le temps d'une seule simulation."""
+    with MoteurParallele(nb_processus) as moteur:
+        return moteur.simuler(nb_mains, joueurs, strategies, graine, **options)
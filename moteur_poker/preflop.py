@@ -0,0 +1,150 @@
+"""Table d'équités préflop des 169 mains de départ, stockée sur disque et lue par mmap.
+
+Format du fichier (entiers petit-boutistes) :
+    en-tête   : b'PKPF', version (uint8), nombre maximal d'adversaires aléatoires (uint8), 2 octets nuls
+    tête-à-tête : 169 x 169 uint16, équité de la main i contre la main j (x 65535)
+    multiway  : 169 x nb_adversaires_max uint16, équité de la main i contre k mains aléatoires
+"""
+
+import mmap
+import os
+import struct
+import sys
+import time
+
+from moteur_poker.aleatoire import creer_rng
+from moteur_poker.cartes import PAQUET, RANGS, identifiant, rang_de, couleur_de
+from moteur_poker.evaluateur import evaluer
+
+NB_MAINS = 169
+MAGIE = b'PKPF'
+VERSION = 1
+_EN_TETE = struct.Struct('<4sBB2x')
+_ECHELLE = 65535
+CHEMIN_TABLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'preflop.bin')
+
+
+def indice_main(carte1, carte2):
+    """Retourne l'indice canonique (0-168) d'une main de départ.
+
+    Case (haut, bas) d'une grille 13 x 13 pour une main assortie, (bas, haut)
+    pour une main dépareillée, diagonale pour une paire.
+    """
+    haut, bas = sorted((rang_de(carte1), rang_de(carte2)), reverse=True)
+    if couleur_de(carte1) == couleur_de(carte2):
+        return haut * 13 + bas
+    return bas * 13 + haut
+
+
+def nom_main(indice):
+    """Retourne le nom usuel d'une main canonique ('AA', 'AKs', '72o')."""
+    r1, r2 = divmod(indice, 13)
+    if r1 == r2:
+        return RANGS[r1] * 2
+    if r1 > r2:
+        return f"{RANGS[r1]}{RANGS[r2]}s"
+    return f"{RANGS[r2]}{RANGS[r1]}o"
+
+
+def combinaisons_main(indice):
+    """Retourne toutes les mains concrètes (paires d'identifiants) d'une main canonique."""
+    r1, r2 = divmod(indice, 13)
+    if r1 > r2:
+        return [(identifiant(r1, c), identifiant(r2, c)) for c in range(4)]
+    if r1 == r2:
+        return [(identifiant(r1, c1), identifiant(r1, c2)) for c1 in range(4) for c2 in range(c1 + 1, 4)]
+    return [(identifiant(r2, c1), identifiant(r1, c2)) for c1 in range(4) for c2 in range(4) if c1 != c2]
+
+
+def equite_tete_a_tete(indice1, indice2, tirages, rng):
+    """Estime l'équité de la main canonique indice1 contre indice2 par tirages aléatoires."""
+    couples = [(main1, main2) for main1 in combinaisons_main(indice1) for main2 in combinaisons_main(indice2)
+               if main1[0] not in main2 and main1[1] not in main2]
+    parts = 0.0
+    for _ in range(tirages):
+        main1, main2 = rng.choice(couples)
+        # Parmi 9 cartes tirées, au moins 5 sont hors des deux mains : les 5 premières
+        # forment un tableau uniforme sur les cartes restantes.
+        tableau = tuple([c for c in rng.sample(PAQUET, 9) if c not in main1 and c not in main2][:5])
+        f1 = evaluer(main1 + tableau)
+        f2 = evaluer(main2 + tableau)
+        parts += 1.0 if f1 > f2 else 0.5 if f1 == f2 else 0.0
+    return parts / tirages
+
+
+def generer_table(chemin=CHEMIN_TABLE, tirages=2000, nb_adversaires_max=2, graine=None, progression=None):
+    """Calcule toutes les équités préflop et les écrit au format binaire décrit plus haut."""
+    rng = creer_rng(graine)
+    tete_a_tete = [0] * (NB_MAINS * NB_MAINS)
+    for i in range(NB_MAINS):
+        tete_a_tete[i * NB_MAINS + i] = _ECHELLE // 2
+        for j in range(i + 1, NB_MAINS):
+            e = equite_tete_a_tete(i, j, tirages, rng)
+            tete_a_tete[i * NB_MAINS + j] = round(e * _ECHELLE)
+            tete_a_tete[j * NB_MAINS + i] = _ECHELLE - round(e * _ECHELLE)
+        if progression:
+            progression(i + 1, NB_MAINS)
+
+    from moteur_poker.equite import equite  # Import tardif : equite consulte cette table
+    multiway = []
+    for i in range(NB_MAINS):
+        for k in range(1, nb_adversaires_max + 1):
+            resultat = equite(combinaisons_main(i)[0], (), k, largeur_cible=0.0, tirages_max=tirages * 4,
+                              rng=rng, table_preflop=False)
+            multiway.append(round(resultat.equite * _ECHELLE))
+
+    temporaire = chemin + '.tmp'
+    with open(temporaire, 'wb') as fichier:
+        fichier.write(_EN_TETE.pack(MAGIE, VERSION, nb_adversaires_max))
+        fichier.write(struct.pack(f'<{len(tete_a_tete)}H', *tete_a_tete))
+        fichier.write(struct.pack(f'<{len(multiway)}H', *multiway))
+    os.replace(temporaire, chemin)
+    return chemin
+
+
+class TablePreflop:
+    """Table d'équités préflop projetée en mémoire : chaque lecture est en O(1)."""
+
+    def __init__(self, chemin=CHEMIN_TABLE):
+        with open(chemin, 'rb') as fichier:
+            self._mmap = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        magie, version, self.nb_adversaires_max = _EN_TETE.unpack_from(self._mmap)
+        if magie != MAGIE or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"{chemin} n'est pas une table préflop valide.")
+        self._valeurs = memoryview(self._mmap)[_EN_TETE.size:].cast('H')  # Machine petit-boutiste
+
+    def equite(self, main, main_adverse):
+        """Équité d'une main contre une autre (indices canoniques ou paires de cartes)."""
+        i = main if isinstance(main, int) else indice_main(*main)
+        j = main_adverse if isinstance(main_adverse, int) else indice_main(*main_adverse)
+        return self._valeurs[i * NB_MAINS + j] / _ECHELLE
+
+    def equite_contre_aleatoire(self, main, nb_adversaires=1):
+        """Équité d'une main contre nb_adversaires mains aléatoires, ou None hors de la table."""
+        if not 1 <= nb_adversaires <= self.nb_adversaires_max:
+            return None
+        i = main if isinstance(main, int) else indice_main(*main)
+        return self._valeurs[NB_MAINS * NB_MAINS + i * self.nb_adversaires_max + nb_adversaires - 1] / _ECHELLE
+
+    def fermer(self):
+        self._valeurs.release()
+        self._mmap.close()
+
+
+_table_par_defaut = None
+
+
+def table_par_defaut():
+    """Ouvre une seule fois la table du chemin par défaut ; None si elle n'a pas été générée."""
+    global _table_par_defaut
+    if _table_par_defaut is None and os.path.exists(CHEMIN_TABLE):
+        _table_par_defaut = TablePreflop(CHEMIN_TABLE)
+    return _table_par_defaut
+
+
+if __name__ == '__main__':
+    nb_tirages = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    debut = time.perf_counter()
+    generer_table(tirages=nb_tirages, progression=lambda fait, total: print(f"{fait}/{total}", end='\r'))
+    print(f"Table écrite dans {CHEMIN_TABLE} en {time.perf_counter() - debut:.0f} s")
@@ -0,0 +1,246 @@
+"""Journal de rejeu : graine et décisions de chaque donne, avec accès direct.
+
+Le journal ne garde que ce qui ne se recalcule pas : la graine de la donne,
+le bouton, les décisions des stratégies et les gains (pour vérifier le
+rejeu). Les cartes sont retrouvées en rejouant la donne avec sa graine, les
+mêmes paramètres et des stratégies qui répètent les décisions enregistrées.
+
+Deux fichiers :
+- le journal, chemin : en-tête (signature, paramètres en JSON), puis un
+  enregistrement par donne, préfixé par sa longueur ;
+- l'index, chemin + '.idx' : la position de chaque enregistrement sur 8
+  octets, complété à chaque donne écrite.
+
+LecteurRejeu projette les deux fichiers en mémoire (mmap) : la donne numéro
+N est lue sans parcourir celles qui la précèdent, quelle que soit la taille
+du journal. Un index en retard sur le journal (arrêt brutal) est complété
+en parcourant la fin du journal ; un dernier enregistrement incomplet est
+ignoré.
+
+Avec le mélange paresseux, les cartes dépendent des tirages de partie.rng
+faits entre deux rues : les stratégies journalisées doivent tirer leur
+hasard d'un autre générateur.
+
+    with JournalRejeu('nuit.rejeu') as journal:
+        simuler(1_000_000, joueurs, strategies, graine=1, journal=journal)
+    with LecteurRejeu('nuit.rejeu') as lecteur:
+        partie = lecteur.rejouer(734_512, observateur=afficher)
+"""
+
+import json
+import mmap
+import os
+import struct
+from collections import namedtuple
+
+from moteur_poker.aleatoire import creer_rng
+from moteur_poker.historique import _ecrire_varint, _lire_varint
+from moteur_poker.jeu import Joueur, Partie, SE_COUCHER, SUIVRE, RELANCER
+from moteur_poker.simulation import jouer_main
+
+ENTETE = b'PKRJ\x01'  # Signature et version du format
+ACTIONS = (SE_COUCHER, SUIVRE, RELANCER)
+_CODES = {action: code for code, action in enumerate(ACTIONS)}
+_POSITION = struct.Struct('<Q')
+
+# Une décision : (place du joueur, action, montant demandé par la stratégie)
+MainJournalisee = namedtuple('MainJournalisee', 'numero graine bouton decisions gains')
+
+
+class DivergenceRejeu(Exception):
+    """Le rejeu ne reproduit pas la donne enregistrée (paramètres ou stratégies non déterministes)."""
+
+
+def chemin_index(chemin):
+    return chemin + '.idx'
+
+
+def _encoder_main(graine, bouton, decisions, gains):
+    contenu = bytearray()
+    _ecrire_varint(contenu, 0 if graine is None else graine + 1)
+    _ecrire_varint(contenu, bouton)
+    _ecrire_varint(contenu, len(decisions))
+    for place, action, montant in decisions:
+        contenu.append(place)
+        contenu.append(_CODES[action])
+        _ecrire_varint(contenu, montant)
+    for gain in gains:
+        _ecrire_varint(contenu, gain)
+    enregistrement = bytearray()
+    _ecrire_varint(enregistrement, len(contenu))
+    return enregistrement + contenu
+
+
+class JournalRejeu:
+    """Écrit un journal de rejeu et son index ; s'utilise comme gestionnaire de contexte.
+
+    demarrer(parametres) écrit l'en-tête : simuler() l'appelle avec ses propres
+    paramètres avant la première donne.
+    """
+
+    def __init__(self, chemin):
+        self.chemin = chemin
+        self.fichier = open(chemin, 'wb')
+        self.index = open(chemin_index(chemin), 'wb')
+        self.position = 0
+        self.nb_mains = 0
+        self.parametres = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def demarrer(self, parametres):
+        if self.parametres is not None:
+            raise ValueError("Le journal a déjà été démarré.")
+        self.parametres = parametres
+        texte = json.dumps(parametres).encode()
+        entete = bytearray(ENTETE)
+        _ecrire_varint(entete, len(texte))
+        entete += texte
+        self.fichier.write(entete)
+        self.position = len(entete)
+
+    def ajouter(self, graine, bouton, decisions, gains):
+        """Enregistre une donne : gains donne le gain brut de chaque place à l'abattage."""
+        if self.parametres is None:
+            raise ValueError("demarrer() doit être appelé avant la première donne.")
+        enregistrement = _encoder_main(graine, bouton, decisions, gains)
+        self.fichier.write(enregistrement)
+        self.index.write(_POSITION.pack(self.position))
+        self.position += len(enregistrement)
+        self.nb_mains += 1
+
+    def vider(self):
+        # Le journal d'abord : l'index ne doit pas désigner des données absentes du disque
+        self.fichier.flush()
+        self.index.flush()
+
+    def fermer(self):
+        if not self.fichier.closed:
+            self.vider()
+            self.fichier.close()
+            self.index.close()
+
+
+def _projeter(chemin):
+    """Projette un fichier en lecture seule ; None s'il est absent ou vide (mmap refuse les fichiers vides)."""
+    try:
+        with open(chemin, 'rb') as fichier:
+            if os.fstat(fichier.fileno()).st_size == 0:
+                return None
+            return mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        return None
+
+
+class LecteurRejeu:
+    """Accès direct aux donnes d'un journal de rejeu : lecteur[n], len(lecteur), lecteur.rejouer(n)."""
+
+    def __init__(self, chemin):
+        self.donnees = _projeter(chemin)
+        if self.donnees is None or self.donnees[:len(ENTETE)] != ENTETE:
+            self.fermer()
+            raise ValueError("Ce fichier n'est pas un journal de rejeu.")
+        taille, position = _lire_varint(self.donnees, len(ENTETE))
+        self.parametres = json.loads(self.donnees[position:position + taille])
+        self.debut = position + taille
+        self.index = _projeter(chemin_index(chemin))
+        self.nb_indexees = len(self.index) // _POSITION.size if self.index is not None else 0
+        while self.nb_indexees and self._fin(self._position_indexee(self.nb_indexees - 1)) is None:
+            self.nb_indexees -= 1
+        self.suite = []  # Positions des donnes absentes de l'index
+        position = self._fin(self._position_indexee(self.nb_indexees - 1)) if self.nb_indexees else self.debut
+        while position is not None and position < len(self.donnees):
+            fin = self._fin(position)
+            if fin is not None:
+                self.suite.append(position)
+            position = fin
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def fermer(self):
+        for projection in (getattr(self, 'donnees', None), getattr(self, 'index', None)):
+            if projection is not None:
+                projection.close()
+
+    def _position_indexee(self, numero):
+        return _POSITION.unpack_from(self.index, numero * _POSITION.size)[0]
+
+    def _fin(self, position):
+        """Position suivant l'enregistrement commençant à position, None s'il est incomplet."""
+        try:
+            taille, contenu = _lire_varint(self.donnees, position)
+        except IndexError:
+            return None
+        return contenu + taille if contenu + taille <= len(self.donnees) else None
+
+    def __len__(self):
+        return self.nb_indexees + len(self.suite)
+
+    def __getitem__(self, numero):
+        if numero < 0:
+            numero += len(self)
+        if not 0 <= numero < len(self):
+            raise IndexError("Numéro de donne hors du journal.")
+        if numero < self.nb_indexees:
+            position = self._position_indexee(numero)
+        else:
+            position = self.suite[numero - self.nb_indexees]
+        donnees = self.donnees
+        _, position = _lire_varint(donnees, position)
+        graine, position = _lire_varint(donnees, position)
+        bouton, position = _lire_varint(donnees, position)
+        nb_decisions, position = _lire_varint(donnees, position)
+        decisions = []
+        for _ in range(nb_decisions):
+            place, code = donnees[position], donnees[position + 1]
+            montant, position = _lire_varint(donnees, position + 2)
+            decisions.append((place, ACTIONS[code], montant))
+        gains = []
+        for _ in self.parametres['noms']:
+            gain, position = _lire_varint(donnees, position)
+            gains.append(gain)
+        return MainJournalisee(numero, graine - 1 if graine else None, bouton, decisions, gains)
+
+    def __iter__(self):
+        for numero in range(len(self)):
+            yield self[numero]
+
+    def rejouer(self, numero, enregistreur=None, observateur=None):
+        """Rejoue la donne numero et retourne la Partie dans son état final.
+
+        observateur(partie, joueur, a_suivre, decision) est appelé avant chaque
+        décision rejouée ; enregistreur reçoit les événements de la donne (voir
+        moteur_poker.historique). Lève DivergenceRejeu si la donne diffère de
+        l'enregistrement.
+        """
+        main = self[numero]
+        parametres = self.parametres
+        joueurs = [Joueur(nom) for nom in parametres['noms']]
+        for joueur in joueurs:
+            joueur.tapis = parametres['tapis_initial']
+        partie = Partie(joueurs, rng=creer_rng(main.graine, parametres['generateur']),
+                        melange_paresseux=parametres['melange_paresseux'])
+        partie.enregistreur = enregistreur
+        decisions = iter(main.decisions)
+
+        def strategie(partie, joueur, a_suivre):
+            decision = next(decisions, None)
+            if decision is None or joueurs[decision[0]] is not joueur:
+                raise DivergenceRejeu(f"Donne {numero} : {joueur.nom} n'a pas de décision enregistrée ici.")
+            if observateur is not None:
+                observateur(partie, joueur, a_suivre, decision)
+            return decision[1], decision[2]
+
+        gains = jouer_main(partie, dict.fromkeys(joueurs, strategie), main.bouton, parametres['petite_blinde'],
+                           parametres['grosse_blinde'], parametres['relances_max'], main.graine)
+        if next(decisions, None) is not None or [gains.get(joueur, 0) for joueur in joueurs] != main.gains:
+            raise DivergenceRejeu(f"Donne {numero} : le rejeu ne retrouve pas les gains enregistrés.")
+        return partie
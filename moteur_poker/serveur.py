@@ -0,0 +1,335 @@
+"""Serveur asyncio hébergeant de nombreuses tables de poker en parallèle.
+
+Les joueurs (humains ou programmes) se connectent par une socket TCP ou Unix
+et échangent un message JSON par ligne. Les tables se remplissent dans l'ordre
+d'arrivée ; chaque table joue ses donnes dans sa propre tâche, de sorte qu'un
+joueur lent ne bloque que sa table, et au plus delai_action secondes.
+
+Client -> serveur
+    {"type": "rejoindre", "nom": "Alice"}
+    {"type": "action", "action": "suivre" | "relancer" | "se coucher", "montant": 10}
+
+Serveur -> client (les joueurs sont désignés par leur place à la table)
+    {"type": "bienvenue", "table": 3, "place": 1, "tapis": 100}
+    {"type": "main", "numero": 0, "bouton": 0, "joueurs": [{"nom": "Alice", "tapis": 100}, ...],
+     "cartes": ["As", "Kd"]}
+    {"type": "action_jouee", "place": 0, "action": "blinde" | "suivre" | ..., "mise": 1}
+    {"type": "communes", "cartes": ["2c", "7h", "9c"]}
+    {"type": "a_vous", "a_suivre": 1, "pot": 3, "tapis": 99, "delai": 10.0}
+    {"type": "resultat", "gains": [4, 0], "tapis": [102, 98], "mains": {"0": ["As", "Kd"], ...}}
+    {"type": "elimine"}, {"type": "fin"}, {"type": "erreur", "message": "..."}
+
+Sans réponse dans le délai, un joueur se couche (ou parle si rien n'est à
+suivre). Un joueur déconnecté ou sans jetons quitte la table à la fin de la donne.
+
+    python -m moteur_poker.serveur --port 7777 --places 6
+"""
+
+import argparse
+import asyncio
+import json
+
+from moteur_poker.aleatoire import creer_rng, graine_aleatoire, graine_fille
+from moteur_poker.cartes import vers_texte
+from moteur_poker.jeu import Joueur, Partie, TourDeMise, SE_COUCHER, SUIVRE, RELANCER
+from moteur_poker.simulation import positions_blindes
+
+ACTIONS = (SE_COUCHER, SUIVRE, RELANCER)
+TAILLE_LIGNE_MAX = 64 * 1024
+
+
+def _textes(cartes):
+    return [vers_texte(carte.id) for carte in cartes]
+
+
+def _lire_action(message):
+    """Retourne (action, montant) d'un message du client ; se coucher s'il est absent ou invalide."""
+    if not message or message.get('action') not in ACTIONS:
+        return SE_COUCHER, 0
+    try:
+        montant = max(int(message.get('montant', 0)), 0)
+    except (TypeError, ValueError):
+        montant = 0
+    return message['action'], montant
+
+
+# Classe Client
+class Client:
+    """Connexion d'un joueur : envoi des messages et file des actions reçues."""
+
+    def __init__(self, lecteur, ecrivain, delai_envoi):
+        self.lecteur = lecteur
+        self.ecrivain = ecrivain
+        self.delai_envoi = delai_envoi
+        self.actions = asyncio.Queue()
+        self.connecte = True
+        self.joueur = None
+
+    async def envoyer(self, message):
+        if not self.connecte:
+            return
+        try:
+            self.ecrivain.write(json.dumps(message, ensure_ascii=False).encode() + b'\n')
+            await asyncio.wait_for(self.ecrivain.drain(), self.delai_envoi)
+        except (OSError, asyncio.TimeoutError):
+            self.fermer()  # Client trop lent ou parti : il ne doit pas bloquer la table
+
+    async def lire(self):
+        """Lit un message ; None à la déconnexion, {} pour une ligne qui n'est pas un objet JSON."""
+        try:
+            ligne = await self.lecteur.readline()
+        except (OSError, ValueError):  # ValueError : ligne plus longue que TAILLE_LIGNE_MAX
+            return None
+        if not ligne:
+            return None
+        try:
+            message = json.loads(ligne)
+        except ValueError:
+            return {}
+        return message if isinstance(message, dict) else {}
+
+    def vider_actions(self):
+        """Écarte les actions envoyées hors du tour du joueur ; à appeler avant de lui donner la parole."""
+        while not self.actions.empty():
+            self.actions.get_nowait()
+
+    async def demander_action(self, delai):
+        """Attend l'action du joueur ; None si le délai expire ou si le joueur est parti."""
+        if not self.connecte:
+            return None
+        try:
+            return await asyncio.wait_for(self.actions.get(), delai)
+        except asyncio.TimeoutError:
+            return None
+
+    def fermer(self):
+        if self.connecte:
+            self.connecte = False
+            self.actions.put_nowait(None)
+            self.ecrivain.close()
+
+
+# Classe Table
+class Table:
+    """Une table du serveur : ses clients, ses joueurs et la Partie qu'ils jouent."""
+
+    def __init__(self, numero, serveur):
+        self.numero = numero
+        self.serveur = serveur
+        self.clients = []  # Dans l'ordre des places
+        self.joueurs = []  # Liste partagée avec la Partie
+        self.partie = Partie(self.joueurs, rng=creer_rng())
+        self.nb_mains = 0
+        self.tache = None
+
+    def asseoir(self, client, nom):
+        """Installe client à la première place libre et retourne son numéro de place."""
+        client.joueur = Joueur(nom)
+        client.joueur.tapis = self.serveur.tapis_initial
+        self.clients.append(client)
+        self.joueurs.append(client.joueur)
+        return len(self.clients) - 1
+
+    async def diffuser(self, message):
+        await asyncio.gather(*(client.envoyer(message) for client in self.clients))
+
+    async def jouer(self):
+        """Joue des donnes tant qu'au moins deux joueurs restent à la table."""
+        serveur = self.serveur
+        bouton = 0
+        try:
+            while len(self.clients) >= 2 and (serveur.mains_max is None or self.nb_mains < serveur.mains_max):
+                await self._jouer_main(bouton % len(self.clients))
+                self.nb_mains += 1
+                for client in list(self.clients):
+                    if not client.connecte or client.joueur.tapis == 0:
+                        await client.envoyer({"type": "elimine"})
+                        client.fermer()
+                        self.joueurs.remove(client.joueur)
+                        self.clients.remove(client)
+                bouton += 1
+            await self.diffuser({"type": "fin"})
+        finally:
+            for client in self.clients:
+                client.fermer()
+            serveur.tables.pop(self.numero, None)
+
+    async def _jouer_main(self, bouton):
+        partie = self.partie
+        serveur = self.serveur
+        nb = len(self.joueurs)
+        for joueur in self.joueurs:
+            joueur.actif = True
+        partie.nouvelle_partie(graine_fille(serveur.graine, 'table', self.numero, 'main', self.nb_mains))
+        partie.distribuer_cartes()
+        places = [{"nom": joueur.nom, "tapis": joueur.tapis} for joueur in self.joueurs]
+        await asyncio.gather(*(client.envoyer({"type": "main", "numero": self.nb_mains, "bouton": bouton,
+                                               "joueurs": places, "cartes": _textes(client.joueur.cartes)})
+                               for client in self.clients))
+
+        petite, grosse, premier = positions_blindes(bouton, nb)
+        tour = TourDeMise(partie, premier, serveur.relances_max)
+        for place, blinde in ((petite, serveur.petite_blinde), (grosse, serveur.grosse_blinde)):
+            mise = tour.miser(self.joueurs[place], blinde)
+            await self.diffuser({"type": "action_jouee", "place": place, "action": "blinde", "mise": mise})
+        await self._tour(tour)
+        for rue in (partie.flop, partie.turn_or_river, partie.turn_or_river):
+            if tour.en_jeu <= 1:
+                break
+            rue()
+            await self.diffuser({"type": "communes", "cartes": _textes(partie.cartes_communes)})
+            tour = TourDeMise(partie, (bouton + 1) % nb, serveur.relances_max)
+            await self._tour(tour)
+
+        abattage = len(partie.joueurs_actifs()) > 1
+        gains = partie.abattage()
+        await self.diffuser({
+            "type": "resultat",
+            "gains": [gains.get(joueur, 0) for joueur in self.joueurs],
+            "tapis": [joueur.tapis for joueur in self.joueurs],
+            "mains": {str(place): _textes(joueur.cartes) for place, joueur in enumerate(self.joueurs)
+                      if abattage and joueur in gains},
+        })
+
+    async def _tour(self, tour):
+        delai = self.serveur.delai_action
+        joueur = tour.joueur_suivant()
+        while joueur is not None:
+            place = self.joueurs.index(joueur)
+            client = self.clients[place]
+            # Vidée avant l'envoi : une réponse arrivée pendant envoyer() est bien celle de ce tour
+            client.vider_actions()
+            await client.envoyer({"type": "a_vous", "a_suivre": tour.a_suivre(joueur), "pot": self.partie.pot,
+                                  "tapis": joueur.tapis, "delai": delai})
+            action, mise = tour.agir(joueur, *_lire_action(await client.demander_action(delai)))
+            await self.diffuser({"type": "action_jouee", "place": place, "action": action, "mise": mise})
+            joueur = tour.joueur_suivant()
+
+
+# Classe ServeurPoker
+class ServeurPoker:
+    """Accepte les connexions et répartit les joueurs entre les tables.
+
+    Une table démarre dès qu'elle compte nb_places joueurs ; mains_max limite
+    le nombre de donnes par table (sans limite si None).
+    """
+
+    def __init__(self, nb_places=2, delai_action=10.0, tapis_initial=100, petite_blinde=1, grosse_blinde=2,
+                 relances_max=3, mains_max=None, graine=None):
+        if nb_places < 2:
+            raise ValueError("Une table compte au moins deux places.")
+        self.nb_places = nb_places
+        self.delai_action = delai_action
+        self.tapis_initial = tapis_initial
+        self.petite_blinde = petite_blinde
+        self.grosse_blinde = grosse_blinde
+        self.relances_max = relances_max
+        self.mains_max = mains_max
+        self.graine = graine if graine is not None else graine_aleatoire()
+        self.tables = {}
+        self._table_ouverte = None  # Table qui attend encore des joueurs
+        self._nb_tables = 0
+        self._serveurs = []
+
+    async def demarrer(self, hote='127.0.0.1', port=0, chemin_unix=None):
+        """Ouvre la socket d'écoute (Unix si chemin_unix est donné) et retourne l'objet asyncio.Server."""
+        if chemin_unix is not None:
+            serveur = await asyncio.start_unix_server(self._connexion, chemin_unix, limit=TAILLE_LIGNE_MAX)
+        else:
+            serveur = await asyncio.start_server(self._connexion, hote, port, limit=TAILLE_LIGNE_MAX)
+        self._serveurs.append(serveur)
+        return serveur
+
+    async def fermer(self):
+        for serveur in self._serveurs:
+            serveur.close()
+            await serveur.wait_closed()
+        taches = [table.tache for table in self.tables.values() if table.tache is not None]
+        for tache in taches:
+            tache.cancel()
+        await asyncio.gather(*taches, return_exceptions=True)
+
+    def _placer(self, client, nom):
+        table = self._table_ouverte
+        if table is None:
+            table = self._table_ouverte = Table(self._nb_tables, self)
+            self.tables[table.numero] = table
+            self._nb_tables += 1
+        place = table.asseoir(client, nom)
+        if len(table.clients) == self.nb_places:
+            self._table_ouverte = None
+            table.tache = asyncio.create_task(table.jouer())
+        return table, place
+
+    async def _connexion(self, lecteur, ecrivain):
+        client = Client(lecteur, ecrivain, self.delai_action)
+        try:
+            message = await asyncio.wait_for(client.lire(), self.delai_action)
+        except asyncio.TimeoutError:
+            message = None
+        if not message or message.get('type') != 'rejoindre':
+            await client.envoyer({"type": "erreur", "message": "Premier message attendu : rejoindre."})
+            client.fermer()
+            return
+        table, place = self._placer(client, str(message.get('nom', 'Joueur'))[:32])
+        await client.envoyer({"type": "bienvenue", "table": table.numero, "place": place,
+                              "tapis": self.tapis_initial})
+        # Les messages suivants sont des actions, transmises à la table par la file du client
+        while client.connecte:
+            message = await client.lire()
+            if message is None:
+                break
+            if message.get('type') == 'action':
+                client.actions.put_nowait(message)
+            else:
+                await client.envoyer({"type": "erreur", "message": "Message inattendu."})
+        client.fermer()
+
+
+async def bot(nom, decider, hote='127.0.0.1', port=None, chemin_unix=None):
+    """Client minimal : rejoint une table et répond à chaque "a_vous" par decider(message).
+
+    decider retourne (action, montant), ou None pour ne pas répondre. Retourne
+    la liste des messages reçus jusqu'à la fin de la partie.
+    """
+    if chemin_unix is not None:
+        lecteur, ecrivain = await asyncio.open_unix_connection(chemin_unix, limit=TAILLE_LIGNE_MAX)
+    else:
+        lecteur, ecrivain = await asyncio.open_connection(hote, port, limit=TAILLE_LIGNE_MAX)
+    ecrivain.write(json.dumps({"type": "rejoindre", "nom": nom}).encode() + b'\n')
+    recus = []
+    try:
+        async for ligne in lecteur:
+            message = json.loads(ligne)
+            recus.append(message)
+            if message['type'] in ('fin', 'elimine', 'erreur'):
+                break
+            if message['type'] == 'a_vous':
+                reponse = decider(message)
+                if reponse is not None:
+                    action, montant = reponse
+                    ecrivain.write(json.dumps({"type": "action", "action": action, "montant": montant}).encode()
+                                   + b'\n')
+            await ecrivain.drain()
+    finally:
+        ecrivain.close()
+    return recus
+
+
+async def _principal(arguments):
+    serveur = ServeurPoker(arguments.places, arguments.delai, graine=arguments.graine)
+    ecoute = await serveur.demarrer(arguments.hote, arguments.port, arguments.unix)
+    print(f"Serveur de poker à l'écoute sur {arguments.unix or f'{arguments.hote}:{arguments.port}'}")
+    async with ecoute:
+        await ecoute.serve_forever()
+
+
+if __name__ == '__main__':
+    parseur = argparse.ArgumentParser(description="Serveur de poker multi-tables.")
+    parseur.add_argument('--hote', default='127.0.0.1')
+    parseur.add_argument('--port', type=int, default=7777)
+    parseur.add_argument('--unix', default=None, help="Chemin d'une socket Unix (au lieu de TCP)")
+    parseur.add_argument('--places', type=int, default=2)
+    parseur.add_argument('--delai', type=float, default=10.0, help="Délai de réponse par action, en secondes")
+    parseur.add_argument('--graine', type=int, default=None)
+    asyncio.run(_principal(parseur.parse_args()))
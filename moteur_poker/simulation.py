@@ -0,0 +1,141 @@
+"""Parties entre stratégies, sans interface, pour évaluer les IA.
+
+simuler() joue des donnes complètes (distribution, tours de mise, abattage) sur
+un même objet Partie, en réutilisant le paquet et les joueurs d'une donne à
+l'autre. Chaque donne commence avec des tapis de tapis_initial jetons ; le
+résultat cumule le gain ou la perte de chaque joueur.
+
+    from moteur_poker.jeu import Joueur
+    resultat = simuler(100_000, [Joueur("A"), Joueur("B")], [strategie_force, strategie_suiveur], graine=1)
+"""
+
+import time
+
+from moteur_poker.aleatoire import creer_rng, graine_aleatoire, graine_fille
+from moteur_poker.evaluateur import categorie, PAIRE, DEUX_PAIRES
+from moteur_poker.cartes import rang_de
+from moteur_poker.jeu import Partie, TourDeMise, SE_COUCHER, SUIVRE, RELANCER
+
+RANG_DIX = 8
+
+
+class ResultatSimulation:
+    """Gains cumulés de chaque joueur (par nom) sur nb_mains donnes."""
+
+    def __init__(self, gains, nb_mains, duree):
+        self.gains = gains
+        self.nb_mains = nb_mains
+        self.duree = duree
+
+    @property
+    def mains_par_seconde(self):
+        return self.nb_mains / self.duree if self.duree else 0.0
+
+    def gains_par_main(self, nom):
+        return self.gains[nom] / self.nb_mains if self.nb_mains else 0.0
+
+    def __repr__(self):
+        gains = ', '.join(f"{nom} {gain:+d}" for nom, gain in self.gains.items())
+        return f"ResultatSimulation({self.nb_mains} mains, {gains}, {self.mains_par_seconde:.0f} mains/s)"
+
+
+def strategie_suiveur(partie, joueur, a_suivre):
+    """Suit toujours, ne relance jamais."""
+    return SUIVRE, 0
+
+
+def strategie_force(partie, joueur, a_suivre):
+    """Relance les bonnes mains, suit les moyennes et se couche avec les autres."""
+    evaluation = partie.evaluations[joueur]
+    if evaluation.nb_cartes == 2:
+        rangs = [rang_de(carte.id) for carte in joueur.cartes]
+        if rangs[0] == rangs[1] or min(rangs) >= RANG_DIX:
+            return RELANCER, 2 * max(a_suivre, 1)
+        return (SUIVRE, 0) if max(rangs) >= RANG_DIX else (SE_COUCHER, 0)
+    force = categorie(evaluation.force())
+    if force >= DEUX_PAIRES:
+        return RELANCER, partie.pot // 2 + 1
+    return (SUIVRE, 0) if force >= PAIRE else (SE_COUCHER, 0)
+
+
+def positions_blindes(bouton, nb):
+    """Positions de la petite blinde, de la grosse blinde et du premier à parler avant le flop."""
+    if nb == 2:  # Tête-à-tête : le bouton paie la petite blinde et parle en premier
+        return bouton, (bouton + 1) % nb, bouton
+    return (bouton + 1) % nb, (bouton + 2) % nb, (bouton + 3) % nb
+
+
+def jouer_main(partie, strategies, bouton, petite_blinde=1, grosse_blinde=2, relances_max=3, graine=None):
+    """Joue une donne complète sur partie et retourne les gains bruts de l'abattage."""
+    nb = len(partie.joueurs)
+    partie.nouvelle_partie(graine)
+    partie.bouton = bouton
+    partie.distribuer_cartes()
+    petite, grosse, premier = positions_blindes(bouton, nb)
+    tour = TourDeMise(partie, premier, relances_max)
+    tour.miser(partie.joueurs[petite], petite_blinde)
+    tour.miser(partie.joueurs[grosse], grosse_blinde)
+    en_jeu = tour.jouer(strategies)
+    for rue in (partie.flop, partie.turn_or_river, partie.turn_or_river):
+        if en_jeu <= 1:
+            break
+        rue()
+        # Si tout le monde est à tapis, le tour se termine aussitôt et les rues suivantes sont dévoilées
+        en_jeu = TourDeMise(partie, (bouton + 1) % nb, relances_max).jouer(strategies)
+    return partie.abattage()
+
+
+def _journalisee(strategie, place, decisions):
+    """Enveloppe strategie pour ajouter chacune de ses décisions à decisions."""
+    def decider(partie, joueur, a_suivre):
+        action, montant = strategie(partie, joueur, a_suivre)
+        decisions.append((place, action, montant))
+        return action, montant
+    return decider
+
+
+def simuler(nb_mains, joueurs, strategies, graine=None, tapis_initial=100, petite_blinde=1, grosse_blinde=2,
+            relances_max=3, melange_paresseux=True, generateur='mt', enregistreur=None, journal=None,
+            premiere_main=0):
+    """Joue nb_mains donnes entre joueurs et retourne un ResultatSimulation.
+
+    strategies est une liste (dans l'ordre de joueurs) ou un dictionnaire
+    joueur -> stratégie ; le bouton tourne d'une donne à l'autre. Par défaut
+    seules les cartes distribuées sont mélangées (voir moteur_poker.paquet).
+
+    La donne numéro i est jouée avec la graine graine_fille(graine, i) : elle
+    peut être rejouée seule, à l'identique, avec jouer_main. La numérotation
+    part de premiere_main, ce qui permet de répartir une simulation en
+    morceaux (voir moteur_poker.parallele). Un enregistreur
+    (voir moteur_poker.historique) reçoit les événements de chaque donne ; un
+    journal (voir moteur_poker.rejeu) garde de quoi rejouer chacune d'elles.
+    """
+    if not isinstance(strategies, dict):
+        strategies = dict(zip(joueurs, strategies))
+    if graine is None:
+        graine = graine_aleatoire()
+    partie = Partie(joueurs, rng=creer_rng(graine, generateur), melange_paresseux=melange_paresseux)
+    partie.enregistreur = enregistreur
+    decisions = []
+    if journal is not None:
+        journal.demarrer({'noms': [joueur.nom for joueur in joueurs], 'tapis_initial': tapis_initial,
+                          'petite_blinde': petite_blinde, 'grosse_blinde': grosse_blinde,
+                          'relances_max': relances_max, 'melange_paresseux': melange_paresseux,
+                          'generateur': generateur})
+        strategies = {joueur: _journalisee(strategies[joueur], place, decisions)
+                      for place, joueur in enumerate(joueurs)}
+    gains = {joueur.nom: 0 for joueur in joueurs}
+    debut = time.perf_counter()
+    for main in range(premiere_main, premiere_main + nb_mains):
+        for joueur in joueurs:
+            joueur.tapis = tapis_initial
+            joueur.actif = True
+        graine_main = graine_fille(graine, main)
+        bouton = main % len(joueurs)
+        gains_main = jouer_main(partie, strategies, bouton, petite_blinde, grosse_blinde, relances_max, graine_main)
+        if journal is not None:
+            journal.ajouter(graine_main, bouton, decisions, [gains_main.get(joueur, 0) for joueur in joueurs])
+            decisions.clear()
+        for joueur in joueurs:
+            gains[joueur.nom] += joueur.tapis - tapis_initial
+    return ResultatSimulation(gains, nb_mains, time.perf_counter() - debut)
@@ -0,0 +1,135 @@
+"""Stratégies d'IA fondées sur l'équité, avec un budget de temps par décision.
+
+StrategieEquite estime par Monte-Carlo l'équité de sa main contre les
+fourchettes supposées des adversaires encore en jeu, la compare à la cote du
+pot (a_suivre / (pot + a_suivre)) et choisit de se coucher, suivre ou
+relancer. L'estimation s'affine jusqu'à l'échéance et s'arrête plus tôt dès
+que la décision ne peut plus changer : une décision dure au plus budget_ms,
+quelle que soit la machine ; une machine lente décide sur moins de tirages.
+
+Un adversaire est supposé jouer la part largeur_fourchette() des mains de
+départ les plus fortes, d'autant plus étroite qu'il a engagé une grande part
+de son tapis dans la donne. Les mains sont classées d'après la table préflop
+si elle a été générée, sinon d'après la formule de Chen.
+
+Les estimations sont gardées dans un CacheLRU (voir moteur_poker.cache), sous
+la situation canonique et la taille des fourchettes adverses : une situation
+déjà vue reprend ses tirages au lieu de repartir de zéro, et cache.statistiques()
+donne le taux de succès.
+
+Une StrategieEquite s'utilise comme les stratégies de moteur_poker.simulation :
+
+    strategie = StrategieEquite(budget_ms=20)
+    simuler(1000, joueurs, [strategie, strategie_suiveur])
+"""
+
+import time
+
+from moteur_poker import preflop
+from moteur_poker.aleatoire import creer_rng
+from moteur_poker.cache import CacheLRU
+from moteur_poker.equite import equite_fourchettes
+from moteur_poker.jeu import SE_COUCHER, SUIVRE, RELANCER
+
+LARGEUR_MIN = 0.15  # Fourchette la plus étroite prêtée à un adversaire
+TIRAGES_MIN = 200  # Tirages avant de se fier à l'intervalle de confiance pour s'arrêter
+TAILLE_CACHE = 10_000  # Situations gardées par le cache d'équité d'une stratégie
+_NB_COMBINAISONS = 1326
+
+_COMBINAISONS = [preflop.combinaisons_main(indice) for indice in range(preflop.NB_MAINS)]
+_classement = None
+
+
+def score_chen(indice):
+    """Score d'une main canonique selon la formule de Chen (plus il est haut, meilleure est la main)."""
+    r1, r2 = divmod(indice, 13)
+    haut, bas = max(r1, r2), min(r1, r2)
+    points = (6, 7, 8, 10)[haut - 9] if haut >= 9 else (haut + 2) / 2  # J, Q, K, A ; sinon la moitié du rang
+    if haut == bas:
+        return max(2 * points, 5)
+    if r1 > r2:  # Assortie
+        points += 2
+    ecart = haut - bas - 1
+    points -= (0, 1, 2, 4)[ecart] if ecart < 4 else 5
+    if ecart <= 1 and haut < 10:  # Connecteurs sous la dame
+        points += 1
+    return points
+
+
+def classement_preflop():
+    """Indices des 169 mains canoniques, de la meilleure à la moins bonne."""
+    global _classement
+    if _classement is None:
+        table = preflop.table_par_defaut()
+        score = table.equite_contre_aleatoire if table is not None else score_chen
+        _classement = sorted(range(preflop.NB_MAINS), key=score, reverse=True)
+    return _classement
+
+
+def fourchette(largeur):
+    """Mains concrètes (paires d'identifiants) de la part largeur des meilleures mains de départ."""
+    mains = []
+    for indice in classement_preflop():
+        if len(mains) >= largeur * _NB_COMBINAISONS:
+            break
+        mains.extend(_COMBINAISONS[indice])
+    return mains
+
+
+def largeur_fourchette(engagement, tapis):
+    """Part des mains de départ jouées par un adversaire qui a engagé engagement jetons sur engagement + tapis."""
+    total = engagement + tapis
+    part_engagee = engagement / total if total else 1.0
+    return max(LARGEUR_MIN, 1.0 - 3.0 * part_engagee)
+
+
+class StrategieEquite:
+    """Décide d'après l'équité contre les fourchettes adverses et la cote du pot.
+
+    marge : équité manquante acceptée pour suivre quand même (gains futurs
+    espérés). agressivite : avance demandée sur la part équitable du pot
+    (1 / nombre de joueurs en jeu) pour relancer. cache : CacheLRU des
+    équités, propre à la stratégie s'il n'est pas fourni.
+    """
+
+    def __init__(self, budget_ms=50, marge=0.03, agressivite=0.2, rng=None, cache=None):
+        self.budget_ms = budget_ms
+        self.marge = marge
+        self.agressivite = agressivite
+        self.rng = rng or creer_rng()
+        self.cache = cache if cache is not None else CacheLRU(TAILLE_CACHE)
+        self.dernier_resultat = None  # ResultatEquite de la dernière décision, pour l'analyse
+
+    def __call__(self, partie, joueur, a_suivre):
+        return self.decider(partie, joueur, a_suivre)
+
+    def fourchettes(self, partie, joueur):
+        """Fourchette supposée de chaque adversaire encore en jeu."""
+        return [fourchette(largeur_fourchette(partie.engagements.get(adversaire, 0), adversaire.tapis))
+                for adversaire in partie.joueurs if adversaire.actif and adversaire is not joueur]
+
+    def decider(self, partie, joueur, a_suivre):
+        """Retourne (action, montant), montant étant la relance au-delà de a_suivre."""
+        echeance = time.perf_counter() + self.budget_ms / 1000
+        fourchettes = self.fourchettes(partie, joueur)
+        if len(joueur.cartes) != 2 or not fourchettes:
+            return SUIVRE, 0
+        cote = a_suivre / (partie.pot + a_suivre) if a_suivre else 0.0
+        seuil_suivi = cote - self.marge
+        seuil_relance = max((1 + self.agressivite) / (len(fourchettes) + 1), cote + self.agressivite)
+
+        def decision_acquise(resultat):
+            if resultat.tirages < TIRAGES_MIN:
+                return False
+            return all(abs(resultat.equite - seuil) > resultat.demi_largeur for seuil in (seuil_suivi, seuil_relance))
+
+        # Les fourchettes ne diffèrent que par leur taille (mains les mieux classées) : elle suffit à les identifier
+        resultat = equite_fourchettes(joueur.cartes, partie.cartes_communes, fourchettes, echeance=echeance,
+                                      largeur_cible=0.0, rng=self.rng, arret=decision_acquise, cache=self.cache,
+                                      cle_fourchettes=tuple(sorted(len(mains) for mains in fourchettes)))
+        self.dernier_resultat = resultat
+        if resultat.equite >= seuil_relance:
+            return RELANCER, max(1, round(partie.pot * (resultat.equite - cote)))
+        if resultat.equite >= seuil_suivi:
+            return SUIVRE, 0
+        return SE_COUCHER, 0
@@ -0,0 +1,129 @@
+"""Table de stratégie sur disque, projetée en mémoire (mmap) et consultée en O(1).
+
+Chaque ensemble d'information est réduit à une empreinte de 64 bits de sa clé
+et associé aux probabilités de ses actions, quantifiées sur un octet chacune
+(0 à 255). Les entrées sont rangées dans une table de hachage à adressage
+ouvert (sondage linéaire, au plus à moitié pleine) : une consultation lit une
+ou deux cases, sans rien charger d'avance. L'ouverture ne dépend donc pas de
+la taille de la table, et les processus qui ouvrent le même fichier partagent
+ses pages dans le cache du système.
+
+Format du fichier (entiers petit-boutistes) :
+    en-tête    : b'PKST', version (uint8), nombre d'actions (uint8), 2 octets nuls,
+                 nombre de cases (uint64, puissance de 2), nombre d'entrées (uint64),
+                 taille des paramètres (uint32)
+    paramètres : JSON (réglages du jeu et de l'abstraction), complété par des octets nuls
+                 jusqu'à un multiple de 8
+    cases      : empreinte (uint64, 0 pour une case vide) puis un octet par action
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+MAGIE = b'PKST'
+VERSION = 1
+CHARGE_MAX = 0.5  # Part maximale de cases occupées
+_EN_TETE = struct.Struct('<4sBB2xQQI')
+_EMPREINTE = struct.Struct('<Q')
+
+
+def empreinte(cle):
+    """Empreinte de 64 bits, jamais nulle, d'une clé d'ensemble d'information."""
+    return int.from_bytes(hashlib.blake2b(cle.encode(), digest_size=8).digest(), 'little') or 1
+
+
+def quantifier(probabilites):
+    """Probabilités -> un octet par action."""
+    return bytes(min(255, max(0, round(255 * p))) for p in probabilites)
+
+
+def ecrire_table(chemin, entrees, nb_actions, parametres=None):
+    """Écrit une table à partir de entrees, dictionnaire clé -> probabilités (flottants ou octets déjà quantifiés)."""
+    nb_cases = 1
+    while nb_cases * CHARGE_MAX < max(len(entrees), 1):
+        nb_cases *= 2
+    taille_case = _EMPREINTE.size + nb_actions
+    cases = bytearray(nb_cases * taille_case)
+    masque = nb_cases - 1
+    for cle, probabilites in entrees.items():
+        valeurs = probabilites if isinstance(probabilites, bytes) else quantifier(probabilites)
+        if len(valeurs) != nb_actions:
+            raise ValueError(f"{cle!r} : {len(valeurs)} probabilités au lieu de {nb_actions}.")
+        code = empreinte(cle)
+        i = code & masque
+        while True:
+            existante = _EMPREINTE.unpack_from(cases, i * taille_case)[0]
+            if not existante:
+                break
+            if existante == code:
+                raise ValueError(f"Clé en double ou collision d'empreintes : {cle!r}.")
+            i = (i + 1) & masque
+        _EMPREINTE.pack_into(cases, i * taille_case, code)
+        cases[i * taille_case + _EMPREINTE.size:(i + 1) * taille_case] = valeurs
+
+    texte = json.dumps(parametres or {}).encode()
+    texte += bytes(-(_EN_TETE.size + len(texte)) % 8)
+    temporaire = chemin + '.tmp'
+    with open(temporaire, 'wb') as fichier:
+        fichier.write(_EN_TETE.pack(MAGIE, VERSION, nb_actions, nb_cases, len(entrees), len(texte)))
+        fichier.write(texte)
+        fichier.write(cases)
+    os.replace(temporaire, chemin)
+    return chemin
+
+
+class TableStrategie:
+    """Table de stratégie ouverte en lecture : table.get(cle) retourne les octets des actions, ou None."""
+
+    def __init__(self, chemin):
+        with open(chemin, 'rb') as fichier:
+            self._mmap = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        magie, version, self.nb_actions, self.nb_cases, self.nb_entrees, taille_parametres = \
+            _EN_TETE.unpack_from(self._mmap)
+        if magie != MAGIE or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"{chemin} n'est pas une table de stratégie valide.")
+        self.parametres = json.loads(self._mmap[_EN_TETE.size:_EN_TETE.size + taille_parametres].rstrip(b'\0'))
+        self._debut = _EN_TETE.size + taille_parametres
+        self._taille_case = _EMPREINTE.size + self.nb_actions
+        self._masque = self.nb_cases - 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def __len__(self):
+        return self.nb_entrees
+
+    def __contains__(self, cle):
+        return self.get(cle) is not None
+
+    def get(self, cle, defaut=None):
+        """Octets (un par action, 0 à 255) de l'ensemble cle."""
+        code = empreinte(cle)
+        donnees = self._mmap
+        i = code & self._masque
+        while True:
+            position = self._debut + i * self._taille_case
+            trouvee = _EMPREINTE.unpack_from(donnees, position)[0]
+            if trouvee == code:
+                return donnees[position + _EMPREINTE.size:position + self._taille_case]
+            if not trouvee:
+                return defaut
+            i = (i + 1) & self._masque
+
+    def probabilites(self, cle):
+        """Probabilités des actions de l'ensemble cle (somme 1), ou None s'il est absent."""
+        valeurs = self.get(cle)
+        if valeurs is None:
+            return None
+        total = sum(valeurs)
+        return [v / total for v in valeurs] if total else [1 / len(valeurs)] * len(valeurs)
+
+    def fermer(self):
+        self._mmap.close()
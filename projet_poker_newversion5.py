@@ -1,245 +1,48 @@
 import tkinter as tk
 from tkinter import simpledialog, messagebox
 import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image, ImageTk
 
+from moteur_poker import jeu
+from moteur_poker.jeu import Joueur, Croupier, Partie, SE_COUCHER, SUIVRE, RELANCER
+from moteur_poker.mcts import StrategieMCTS
 
-# Classe Carte
-class Carte:
-    RANGS = ['2', '3', '4', '5', '6', '7', '8', '9', 'X', 'V', 'D', 'R', 'A']
-    COULEURS = ['P', 'C', 'K', 'T']  # Pique, Cœur, Carreau, Trèfle
-    SYMBOLES = {'P': '♠', 'C': '♥', 'K': '♦', 'T': '♣'}
-
-    def __init__(self, rang, couleur):
-        self.rang = rang
-        self.couleur = couleur
-
-    def __repr__(self):
-        return f"{self.rang}{self.couleur}"
-
-    def valeur(self):
-        """Retourne une valeur numérique de la carte pour le classement."""
-        return Carte.RANGS.index(self.rang)
-
-
-# Classe Joueur
-class Joueur:
-    def __init__(self, nom, ia=False):
-        self.nom = nom
-        self.cartes = []
-        self.ia = ia
-        self.tapis = 100  # Jetons initiaux
-        self.actif = True
-
-    def recevoir(self, cartes):
-        self.cartes.extend(cartes)
-
-    def reset_cartes(self):
-        self.cartes = []
-
-    def miser(self, montant):
-        montant = min(montant, self.tapis)
-        self.tapis -= montant
-        return montant
-
-    def __repr__(self):
-        return f"{self.nom} (Jetons : {self.tapis})"
-
-
-# Classe Croupier
-class Croupier:
-    def __init__(self):
-        self.paquet = []
+BUDGET_DECISION_MS = 300  # Durée de réflexion de chaque IA
+BUDGET_IA = 2.0  # Temps de réflexion maximal accordé à chaque IA, en secondes
+INTERVALLE_SONDAGE_MS = 50  # Fréquence à laquelle l'interface vérifie si l'IA a décidé
+NOEUDS_MAX = 200_000  # Nœuds de recherche de la table, partagés par les deux IA
 
-    def rassembler(self):
-        self.paquet = [Carte(rang, couleur) for couleur in Carte.COULEURS for rang in Carte.RANGS]
 
-    def melanger(self):
-        random.shuffle(self.paquet)
-
-    def couper(self):
-        pivot = random.randint(0, len(self.paquet))
-        self.paquet = self.paquet[pivot:] + self.paquet[:pivot]
-
-    def distribuer(self, nombre, joueurs):
-        for _ in range(nombre):
-            for joueur in joueurs:
-                if self.paquet:
-                    joueur.recevoir([self.paquet.pop()])
-
-
-# Classe Partie
-class Partie:
-    def __init__(self, joueurs):
-        self.joueurs = joueurs
-        self.croupier = Croupier()
-        self.cartes_communes = []
-        self.pot = 0
-        self.mise_actuelle = 0
-        self.tour_mise = 0  # Compteur pour savoir quel joueur doit agir
-        self.gagnant = None
-        self.cartes_deja_brulees = []
-
-    def nouvelle_partie(self):
-        self.pot = 0
-        self.mise_actuelle = 0
-        self.cartes_communes = []
-        self.gagnant = None
-        self.croupier.rassembler()
-        self.croupier.melanger()
-        self.croupier.couper()
-
-        for joueur in self.joueurs:
-            joueur.reset_cartes()
-
-    def distribuer_cartes(self):
-        self.croupier.distribuer(2, self.joueurs)
-
-    def flop(self):
-        self.croupier.paquet.pop()  # Brûler une carte
-        self.cartes_communes.extend([self.croupier.paquet.pop() for _ in range(3)])
-
-    def turn_or_river(self):
-        self.croupier.paquet.pop()  # Brûler une carte
-        self.cartes_communes.append(self.croupier.paquet.pop())
-
-    def ajouter_au_pot(self, montant):
-        self.pot += montant
-
-    def evaluer_combinaisons(self):
-        # Fonction d'évaluation des mains des joueurs
-        mains = {}
-        for joueur in self.joueurs:
-            if joueur.actif:
-                toutes_cartes = joueur.cartes + self.cartes_communes
-                mains[joueur] = self.evaluer_main(toutes_cartes)
-        return mains
-
-    def evaluer_main(self, cartes):
-        """Retourne un score basé sur la meilleure combinaison possible de la main du joueur et des cartes communes."""
-        valeurs = [carte.valeur() for carte in cartes]
-        couleurs = [carte.couleur for carte in cartes]
-        valeurs.sort(reverse=True)
-
-        # Vérifier si la main forme une quinte flush royale
-        if self.is_quinte_flush_royale(valeurs, couleurs):
-            return (10, valeurs)
-
-        # Vérifier si la main forme une quinte flush
-        if self.is_quinte_flush(valeurs, couleurs):
-            return (9, valeurs)
-
-        # Vérifier un carré (four of a kind)
-        if self.is_carre(valeurs):
-            return (8, valeurs)
-
-        # Vérifier un full (full house)
-        if self.is_full_house(valeurs):
-            return (7, valeurs)
-
-        # Vérifier une couleur
-        if self.is_couleur(couleurs):
-            return (6, valeurs)
-
-        # Vérifier une suite (straight)
-        if self.is_suite(valeurs):
-            return (5, valeurs)
-
-        # Vérifier un brelan
-        if self.is_brelan(valeurs):
-            return (4, valeurs)
-
-        # Vérifier deux paires
-        if self.is_deux_paires(valeurs):
-            return (3, valeurs)
-
-        # Vérifier une paire
-        if self.is_paire(valeurs):
-            return (2, valeurs)
-
-        return (1, valeurs)  # Carte la plus haute (high card)
-
-    def is_quinte_flush_royale(self, valeurs, couleurs):
-        """Vérifie une quinte flush royale."""
-        return sorted(valeurs) == [8, 9, 10, 11, 12] and len(set(couleurs)) == 1
-
-    def is_quinte_flush(self, valeurs, couleurs):
-        """Vérifie une quinte flush."""
-        return self.is_suite(valeurs) and len(set(couleurs)) == 1
-
-    def is_carre(self, valeurs):
-        """Vérifie un carré."""
-        for v in set(valeurs):
-            if valeurs.count(v) == 4:
-                return True
-        return False
-
-    def is_full_house(self, valeurs):
-        """Vérifie un full house."""
-        counts = [valeurs.count(v) for v in set(valeurs)]
-        return sorted(counts) == [2, 3]
-
-    def is_couleur(self, couleurs):
-        """Vérifie une couleur."""
-        return len(set(couleurs)) == 1
-
-    def is_suite(self, valeurs):
-        """Vérifie une suite."""
-        return len(set(valeurs)) == 5 and max(valeurs) - min(valeurs) == 4
-
-    def is_brelan(self, valeurs):
-        """Vérifie un brelan."""
-        for v in set(valeurs):
-            if valeurs.count(v) == 3:
-                return True
-        return False
-
-    def is_deux_paires(self, valeurs):
-        """Vérifie deux paires."""
-        counts = [valeurs.count(v) for v in set(valeurs)]
-        return counts.count(2) == 2
-
-    def is_paire(self, valeurs):
-        """Vérifie une paire."""
-        for v in set(valeurs):
-            if valeurs.count(v) == 2:
-                return True
-        return False
-
-    def ia_jouer(self, ia):
-        # IA basée sur la force de la main
-        if not ia.actif:
-            return "L'IA s'est déjà couchée."
-
-        mains = self.evaluer_combinaisons()
-        force_main = mains[ia][0]  # Premier élément du tuple est le score de la main
-
-        if force_main >= 7:  # Très bonne main (full house, carré, etc.), l'IA mise
-            mise = random.randint(10, min(30, ia.tapis))
-        elif force_main >= 5:  # Main moyenne (suite, brelan, etc.), l'IA suit
-            mise = self.mise_actuelle
-        else:  # Main faible, l'IA se couche
-            ia.actif = False
-            return "L'IA se couche."
-
-        self.mise_actuelle = mise
-        self.ajouter_au_pot(ia.miser(mise))
-        return f"L'IA mise {mise} jetons."
+# Classe Carte : mêmes cartes que le moteur, noms des images de ce jeu
+class Carte(jeu.Carte):
+    __slots__ = ()
+    RANGS = ['2', '3', '4', '5', '6', '7', '8', '9', 'X', 'V', 'D', 'R', 'A']
+    COULEURS = ['P', 'C', 'K', 'T']  # Pique, Cœur, Carreau, Trèfle
 
 
 # Classe Application Tkinter
 class PokerApp:
-    def __init__(self, root):
+    def __init__(self, root, budget_ia=BUDGET_IA, executeur=None):
         self.root = root
         self.root.title("Poker Texas Hold'em")
 
+        # Les IA réfléchissent dans un fil d'exécution séparé, une à la fois, pour ne pas figer la fenêtre
+        self.budget_ia = budget_ia
+        self.executeur = executeur or ThreadPoolExecutor(max_workers=1)
+        self.decision_ia = None
+        self.echeance_ia = 0
+        self.ias_a_jouer = []
+
         # Initialisation des joueurs
         self.joueur_humain = Joueur("Vous")
         self.joueur_ia = Joueur("IA", ia=True)
         self.joueur_ia2 = Joueur("IA2", ia=True)
         self.joueurs = [self.joueur_humain, self.joueur_ia, self.joueur_ia2]
 
-        self.partie = Partie(self.joueurs)
+        self.partie = Partie(self.joueurs, classe_carte=Carte,
+                             strategie_ia=StrategieMCTS(BUDGET_DECISION_MS, noeuds_max=NOEUDS_MAX))
 
         # Table de jeu
         self.canvas = tk.Canvas(self.root, width=800, height=600, bg="green")
@@ -258,6 +61,9 @@ class PokerApp:
         self.bouton_coucher = tk.Button(self.root, text="Se coucher", command=self.coucher, state=tk.DISABLED)
         self.bouton_coucher.place(x=400, y=550)
 
+        self.label_reflexion = tk.Label(self.root, text="", font=("Arial", 12), bg="green", fg="white")
+        self.label_reflexion.place(x=550, y=553)
+
         # Chargement des images des cartes
         self.cartes_images = {}
         self.charger_images()
@@ -304,6 +110,12 @@ class PokerApp:
             x += 70
 
     def nouvelle_partie(self):
+        if self.decision_ia is not None:
+            # Décisions de la donne précédente : annulées, leur résultat sera ignoré
+            self.decision_ia.cancel()
+            self.decision_ia = None
+            self.label_reflexion.config(text="")
+        self.ias_a_jouer = []
         self.partie.nouvelle_partie()
         self.partie.distribuer_cartes()
         self.canvas.delete("all")
@@ -328,26 +140,99 @@ class PokerApp:
         montant = simpledialog.askinteger("Mise", "Combien voulez-vous miser ?",
                                           minvalue=1, maxvalue=self.joueur_humain.tapis)
         if montant:
-            self.partie.ajouter_au_pot(self.joueur_humain.miser(montant))
+            self.partie.miser(self.joueur_humain, montant)
+            self.partie.noter_action(RELANCER)
             self.canvas.create_text(400, 550, text=f"Vous avez misé {montant} jetons.", font=("Arial", 16),
                                     fill="white")
-            self.partie.ia_jouer(self.joueur_ia)
+            self.jouer_ias()
 
     def suivre(self):
         """Permet de suivre la mise de l'adversaire."""
         montant = self.partie.mise_actuelle - self.joueur_humain.tapis
         if montant > 0:
-            self.partie.ajouter_au_pot(self.joueur_humain.miser(montant))
+            self.partie.miser(self.joueur_humain, montant)
             self.canvas.create_text(400, 550, text=f"Vous avez suivi avec {montant} jetons.", font=("Arial", 16),
                                     fill="white")
-        self.partie.ia_jouer(self.joueur_ia)
+        self.partie.noter_action(SUIVRE)
+        self.jouer_ias()
 
     def coucher(self):
-        self.joueur_humain.actif = False
+        self.partie.coucher(self.joueur_humain)
+        self.partie.noter_action(SE_COUCHER)
         self.canvas.create_text(400, 550, text="Vous vous êtes couché.", font=("Arial", 16), fill="white")
-        self.partie.ia_jouer(self.joueur_ia)
-
+        self.jouer_ias()
+
+    def activer_boutons(self, actifs):
+        etat = tk.NORMAL if actifs else tk.DISABLED
+        self.bouton_miser.config(state=etat)
+        self.bouton_suivre.config(state=etat)
+        self.bouton_coucher.config(state=etat)
+
+    def jouer_ias(self):
+        """Fait parler les deux IA à la suite, chacune voyant la mise de la précédente, sans figer la fenêtre."""
+        self.activer_boutons(False)
+        # Les calculs lisent les cartes de la donne en cours : pas de nouvelle donne tant qu'ils tournent
+        self.bouton_nouvelle_partie.config(state=tk.DISABLED)
+        self.ias_a_jouer = [self.joueur_ia, self.joueur_ia2]
+        self.tour_ia()
+
+    def tour_ia(self, precedente=None):
+        """Lance en arrière-plan la décision de la prochaine IA encore en jeu."""
+        while self.ias_a_jouer and not self.ias_a_jouer[0].actif:
+            self.ias_a_jouer.pop(0)
+        if not self.ias_a_jouer:
+            self.label_reflexion.config(text="")
+            if self.joueur_humain.actif and self.joueur_humain.tapis > 0:
+                self.activer_boutons(True)
+            if precedente is not None:
+                self.liberer_nouvelle_partie(precedente)
+            else:
+                self.bouton_nouvelle_partie.config(state=tk.NORMAL)
+            return
+        ia = self.ias_a_jouer[0]
+        self.label_reflexion.config(text=f"{ia.nom} réfléchit...")
+        self.decision_ia = self.executeur.submit(self.partie.decision_ia, ia)
+        self.echeance_ia = time.monotonic() + self.budget_ia
+        self.root.after(INTERVALLE_SONDAGE_MS, self.attendre_ia, self.decision_ia)
+
+    def attendre_ia(self, decision):
+        """Vérifie périodiquement (via root.after) si la décision de l'IA est prête, puis la joue."""
+        if decision is not self.decision_ia:
+            return  # Décision abandonnée par nouvelle_partie ou fermer
+        ia = self.ias_a_jouer[0]
+        if decision.done() and decision.exception() is None:
+            resultat = decision.result()
+        elif decision.done() or time.monotonic() >= self.echeance_ia:
+            # Budget dépassé ou erreur : l'IA suit ; un résultat tardif sera ignoré
+            decision.cancel()
+            resultat = (SUIVRE, min(self.partie.mise_actuelle, ia.tapis))
+        else:
+            self.root.after(INTERVALLE_SONDAGE_MS, self.attendre_ia, decision)
+            return
+
+        self.decision_ia = None
+        self.ias_a_jouer.pop(0)
+        message = self.partie.ia_appliquer(ia, resultat)
+        y = 500 if ia is self.joueur_ia else 520
+        self.canvas.create_text(400, y, text=f"{ia.nom} : {message}", font=("Arial", 12), fill="white")
+        self.tour_ia(decision)
+
+    def liberer_nouvelle_partie(self, decision):
+        """Réactive « Nouvelle partie » quand le calcul de l'IA est fini, même abandonné après le budget."""
+        if decision.done():
+            self.bouton_nouvelle_partie.config(state=tk.NORMAL)
+        else:
+            self.root.after(INTERVALLE_SONDAGE_MS, self.liberer_nouvelle_partie, decision)
+
+    def fermer(self):
+        self.decision_ia = None
+        self.executeur.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+
+
+if __name__ == "__main__":
+    root = tk.Tk()
+    app = PokerApp(root)
+    root.protocol("WM_DELETE_WINDOW", app.fermer)
+    root.mainloop()
 
-root = tk.Tk()
-app = PokerApp(root)
-root.mainloop()
@@ -1,134 +1,53 @@
 import tkinter as tk
 from tkinter import simpledialog, messagebox
 import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image, ImageTk
 from pygame import mixer
 
-# Classe Carte
-class Carte:
-    RANGS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-    COULEURS = ['♠', '♥', '♦', '♣']  # Pique, Cœur, Carreau, Trèfle
-    SYMBOLES = {'P': '♠', 'C': '♥', 'K': '♦', 'T': '♣'}
+from moteur_poker import jeu
+from moteur_poker.jeu import Carte, Joueur, Croupier, SE_COUCHER, SUIVRE, RELANCER
+from moteur_poker.strategies import StrategieEquite
 
-    def __init__(self, rang, couleur):
-        self.rang = rang
-        self.couleur = couleur
-
-    def __repr__(self):
-        return f"{self.rang}{self.couleur}"
+BUDGET_IA = 2.0  # Temps de réflexion maximal de l'IA, en secondes
+BUDGET_DECISION_MS = 500  # Temps de calcul de la stratégie, bien en deçà de BUDGET_IA
+INTERVALLE_SONDAGE_MS = 50  # Fréquence à laquelle l'interface vérifie si l'IA a décidé
 
 def play_music():
     mixer.init()  # Initialiser le module de mixer
     mixer.music.load("sounds/casino.mp3")  # Charger le fichier audio
     mixer.music.play(-1)  # Jouer en boucle (-1 pour boucle infinie)
 
-# Classe Joueur
-class Joueur:
-    def __init__(self, nom, ia=False):
-        self.nom = nom
-        self.cartes = []
-        self.ia = ia
-        self.tapis = 100  # Jetons initiaux
-        self.actif = True
-
-    def recevoir(self, cartes):
-        self.cartes.extend(cartes)
-
-    def reset_cartes(self):
-        self.cartes = []
-
-    def miser(self, montant):
-        montant = min(montant, self.tapis)
-        self.tapis -= montant
-        return montant
-
-    def __repr__(self):
-        return f"{self.nom} (Jetons : {self.tapis})"
-
-# Classe Croupier
-class Croupier:
-    def __init__(self):
-        self.paquet = []
-
-    def rassembler(self):
-        self.paquet = [Carte(rang, couleur) for couleur in Carte.COULEURS for rang in Carte.RANGS]
-
-    def melanger(self):
-        random.shuffle(self.paquet)
-
-    def couper(self):
-        pivot = random.randint(0, len(self.paquet))
-        self.paquet = self.paquet[pivot:] + self.paquet[:pivot]
-
-    def distribuer(self, nombre, joueurs):
-        for _ in range(nombre):
-            for joueur in joueurs:
-                if self.paquet:
-                    joueur.recevoir([self.paquet.pop()])
-
-# Classe Partie
-class Partie:
-    def __init__(self, joueur_humain, joueur_ia):
+# Classe Partie : partie du moteur à deux joueurs, un humain contre l'IA
+class Partie(jeu.Partie):
+    def __init__(self, joueur_humain, joueur_ia, budget_ms=BUDGET_DECISION_MS):
+        super().__init__([joueur_humain, joueur_ia], strategie_ia=StrategieEquite(budget_ms))
         self.joueur_humain = joueur_humain
         self.joueur_ia = joueur_ia
-        self.croupier = Croupier()
-        self.cartes_communes = []
-        self.pot = 0
-        self.mise_actuelle = 0
-
-    def nouvelle_partie(self):
-        self.joueur_humain.reset_cartes()
-        self.joueur_ia.reset_cartes()
-        self.cartes_communes = []
-        self.pot = 0
-        self.mise_actuelle = 0
-        self.croupier.rassembler()
-        self.croupier.melanger()
-        self.croupier.couper()
-
-    def distribuer_cartes(self):
-        self.croupier.distribuer(2, [self.joueur_humain, self.joueur_ia])
-
-    def flop(self):
-        self.croupier.paquet.pop()  # Brûler une carte
-        self.cartes_communes.extend([self.croupier.paquet.pop() for _ in range(3)])
-
-    def turn_or_river(self):
-        self.croupier.paquet.pop()  # Brûler une carte
-        self.cartes_communes.append(self.croupier.paquet.pop())
-
-    def ajouter_au_pot(self, montant):
-        self.pot += montant
-
-    def evaluer_combinaisons(self):
-        # Simulation pour évaluer les mains
-        return {
-            self.joueur_humain: random.randint(1, 100),
-            self.joueur_ia: random.randint(1, 100),
-        }
 
     def ia_jouer(self):
-        # Logique de l'IA pour répondre à la mise
-        force_main = random.randint(1, 100)
+        return super().ia_jouer(self.joueur_ia)
 
-        if force_main > 60:  # Bonne main, mise agressive
-            mise = random.randint(10, min(20, self.joueur_ia.tapis))
-        elif 30 <= force_main <= 60:  # Moyenne main, suit la mise
-            mise = max(10, self.mise_actuelle)
-        else:  # Mauvaise main, l'IA se couche
-            self.joueur_ia.actif = False
-            return "L'IA se couche."
+    def ia_decider(self):
+        """Choisit l'action de l'IA sans modifier la partie : peut tourner dans un autre fil d'exécution.
 
-        self.mise_actuelle = mise
-        self.ajouter_au_pot(self.joueur_ia.miser(mise))
-        return f"L'IA mise {mise} jetons."
+        Retourne (action, mise), à jouer ensuite par ia_appliquer(joueur_ia, decision).
+        """
+        return self.decision_ia(self.joueur_ia)
 
 # Classe Application Tkinter
 class PokerApp:
-    def __init__(self, root):
+    def __init__(self, root, budget_ia=BUDGET_IA, executeur=None):
         self.root = root
         self.root.title("Poker Texas Hold'em")
 
+        # L'IA réfléchit dans un fil d'exécution séparé pour ne pas figer la fenêtre
+        self.budget_ia = budget_ia
+        self.executeur = executeur or ThreadPoolExecutor(max_workers=1)
+        self.decision_ia = None
+        self.echeance_ia = 0
+
         # Initialisation des joueurs
         self.joueur_humain = Joueur("Vous")
         self.joueur_ia = Joueur("IA", ia=True)
@@ -161,6 +80,9 @@ class PokerApp:
         self.bouton_coucher = tk.Button(self.root, text="Se coucher", command=self.coucher, state=tk.DISABLED)
         self.bouton_coucher.place(x=400, y=550)
 
+        self.label_reflexion = tk.Label(self.root, text="", font=("Arial", 12), bg="green", fg="white")
+        self.label_reflexion.place(x=550, y=553)
+
         # Chargement des images des cartes et jetons
         self.cartes_images = {}
         self.jetons_image = None
@@ -235,6 +157,11 @@ class PokerApp:
             self.bouton_coucher.config(state=tk.DISABLED)
 
     def nouvelle_partie(self):
+        if self.decision_ia is not None:
+            # Décision de la donne précédente : annulée, son résultat sera ignoré
+            self.decision_ia.cancel()
+            self.decision_ia = None
+            self.label_reflexion.config(text="")
         self.partie.nouvelle_partie()
         self.partie.distribuer_cartes()
         self.canvas.delete("all")
@@ -270,11 +197,7 @@ class PokerApp:
             messagebox.showinfo("Mise", f"Vous avez misé {mise} jetons.")
 
             # L'IA joue après le joueur
-            ia_action = self.partie.ia_jouer()
-            self.mettre_a_jour_jetons()
-            messagebox.showinfo("Tour de l'IA", ia_action)
-            if not self.joueur_ia.actif:
-                self.afficher_cartes(self.joueur_ia, 200, 150)
+            self.tour_ia()
 
     def suivre(self):
         mise = max(10, self.partie.mise_actuelle)
@@ -283,11 +206,60 @@ class PokerApp:
         messagebox.showinfo("Suivi", f"Vous avez suivi la mise de {mise} jetons.")
 
         # IA joue après que le joueur suive
-        ia_action = self.partie.ia_jouer()
+        self.tour_ia()
+
+    def activer_boutons(self, actifs):
+        etat = tk.NORMAL if actifs else tk.DISABLED
+        self.bouton_miser.config(state=etat)
+        self.bouton_suivre.config(state=etat)
+        self.bouton_coucher.config(state=etat)
+
+    def tour_ia(self):
+        """Lance la décision de l'IA en arrière-plan ; la fenêtre reste réactive pendant sa réflexion."""
+        self.activer_boutons(False)
+        # Le calcul lit les cartes de la donne en cours : pas de nouvelle donne tant qu'il tourne
+        self.bouton_nouvelle_partie.config(state=tk.DISABLED)
+        self.label_reflexion.config(text="L'IA réfléchit...")
+        self.decision_ia = self.executeur.submit(self.partie.ia_decider)
+        self.echeance_ia = time.monotonic() + self.budget_ia
+        self.root.after(INTERVALLE_SONDAGE_MS, self.attendre_ia, self.decision_ia)
+
+    def attendre_ia(self, decision):
+        """Vérifie périodiquement (via root.after) si la décision de l'IA est prête."""
+        if decision is not self.decision_ia:
+            return  # Décision abandonnée par nouvelle_partie ou fermer
+        if decision.done() and decision.exception() is None:
+            resultat = decision.result()
+        elif decision.done() or time.monotonic() >= self.echeance_ia:
+            # Budget dépassé ou erreur : l'IA suit ; un résultat tardif sera ignoré
+            decision.cancel()
+            resultat = (SUIVRE, max(10, self.partie.mise_actuelle))
+        else:
+            self.root.after(INTERVALLE_SONDAGE_MS, self.attendre_ia, decision)
+            return
+
+        self.decision_ia = None
+        self.label_reflexion.config(text="")
+        ia_action = self.partie.ia_appliquer(self.joueur_ia, resultat)
         self.mettre_a_jour_jetons()
         messagebox.showinfo("Tour de l'IA", ia_action)
         if not self.joueur_ia.actif:
             self.afficher_cartes(self.joueur_ia, 200, 150)
+        if self.joueur_humain.tapis > 0 and self.joueur_ia.tapis > 0:
+            self.activer_boutons(True)
+        self.liberer_nouvelle_partie(decision)
+
+    def liberer_nouvelle_partie(self, decision):
+        """Réactive « Nouvelle partie » quand le calcul de l'IA est fini, même abandonné après le budget."""
+        if decision.done():
+            self.bouton_nouvelle_partie.config(state=tk.NORMAL)
+        else:
+            self.root.after(INTERVALLE_SONDAGE_MS, self.liberer_nouvelle_partie, decision)
+
+    def fermer(self):
+        self.decision_ia = None
+        self.executeur.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
 
     def coucher(self):
         if not self.joueur_ia.actif:  # Si l'IA est déjà inactive, le joueur gagne
@@ -326,11 +298,13 @@ class PokerApp:
         messagebox.showinfo("Résultat", f"{gagnant.nom} gagne cette manche.")
 
 # Exécution de l'application
-root = tk.Tk()
-app = PokerApp(root)
-play_button = tk.Button(root, text="Jouer la musique", command=play_music)
-play_button.pack(pady=20)
-
-stop_button = tk.Button(root, text="Arrêter la musique", command=lambda: mixer.music.stop())
-stop_button.pack(pady=20)
-root.mainloop()
+if __name__ == "__main__":
+    root = tk.Tk()
+    app = PokerApp(root)
+    root.protocol("WM_DELETE_WINDOW", app.fermer)
+    play_button = tk.Button(root, text="Jouer la musique", command=play_music)
+    play_button.pack(pady=20)
+
+    stop_button = tk.Button(root, text="Arrêter la musique", command=lambda: mixer.music.stop())
+    stop_button.pack(pady=20)
+    root.mainloop()
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from moteur_poker.abstraction import (AbstractionHistogrammes, TableGroupes, caracteristiques, chemin_rue,
+                                      construire_rue, ecrire_groupes, indexeur, k_moyennes)
+from moteur_poker.cartes import depuis_texte
+from moteur_poker.cfr import EntraineurCFR, abstraction_depuis_parametres
+
+
+def cartes(texte):
+    return [depuis_texte(t) for t in texte.split()]
+
+
+class TestCaracteristiques(unittest.TestCase):
+
+    def test_river(self):
+        vecteurs = caracteristiques([cartes('As Ks'), cartes('7h 2d')], [cartes('Qs Js Ts 4d 3c')] * 2,
+                                    generateur=np.random.default_rng(1))
+        self.assertEqual(vecteurs.shape, (2, 1))
+        self.assertEqual(vecteurs[0, 0], 1.0)  # Quinte flush royale
+        self.assertLess(vecteurs[1, 0], 0.1)
+
+    def test_histogrammes_cumules(self):
+        vecteurs = caracteristiques([cartes('As Ad'), cartes('7h 2d')], [[], []], nb_classes=10, tirages=500,
+                                    generateur=np.random.default_rng(2))
+        self.assertEqual(vecteurs.shape, (2, 9))
+        self.assertTrue(np.all(np.diff(vecteurs, axis=1) <= 0))
+        self.assertGreater(vecteurs[0].sum(), vecteurs[1].sum())
+        self.assertAlmostEqual(vecteurs[0].sum() / 10 + 0.05, 0.85, delta=0.05)
+
+    def test_k_moyennes(self):
+        generateur = np.random.default_rng(3)
+        points = np.concatenate([generateur.normal(centre, 0.01, (100, 2)) for centre in (0.8, 0.1, 0.5)])
+        centres = k_moyennes(points, 3, generateur=generateur)
+        np.testing.assert_allclose(centres[:, 0], [0.1, 0.5, 0.8], atol=0.01)
+        with self.assertRaises(ValueError):
+            k_moyennes(points[:2], 3)
+
+
+class TestConstruction(unittest.TestCase):
+
+    def setUp(self):
+        dossier = tempfile.TemporaryDirectory()
+        self.addCleanup(dossier.cleanup)
+        self.dossier = dossier.name
+
+    def test_preflop(self):
+        chemin = chemin_rue(self.dossier, 0)
+        statistiques = construire_rue(chemin, 0, 8, tirages=200, nb_processus=2, graine=4)
+        self.assertEqual(statistiques['situations'], 169)
+        self.assertEqual(sum(statistiques['tailles_groupes']), 169)
+        self.assertFalse(os.path.exists(chemin + '.vecteurs'))
+        with TableGroupes(chemin) as table:
+            self.assertEqual((len(table), table.rue, table.nb_groupes), (169, 0, 8))
+            groupes = [table[i] for i in range(169)]
+            self.assertEqual(table[indexeur(0).indexer(cartes('As Ad'))], 7)
+            self.assertEqual(table[indexeur(0).indexer(cartes('7h 2d'))], 0)
+        # Même graine, un seul processus : même résultat
+        autre = os.path.join(self.dossier, 'seul.groupes')
+        construire_rue(autre, 0, 8, tirages=200, nb_processus=1, graine=4)
+        with TableGroupes(autre) as table:
+            self.assertEqual([table[i] for i in range(169)], groupes)
+
+    def test_abstraction_et_cfr(self):
+        construire_rue(chemin_rue(self.dossier, 0), 0, 4, tirages=100, nb_processus=1, graine=5)
+        # Groupes arbitraires après le flop : sur deux octets au flop, un seul ensuite
+        ecrire_groupes(chemin_rue(self.dossier, 1), 1, np.arange(indexeur(1).taille) % 300, 300)
+        for rue in (2, 3):
+            ecrire_groupes(chemin_rue(self.dossier, rue), rue, np.full(indexeur(rue).taille, rue, np.uint8), 4)
+        abstraction = AbstractionHistogrammes(self.dossier)
+        self.addCleanup(abstraction.fermer)
+        self.assertEqual(abstraction.nb_groupes, (4, 300, 4, 4))
+        main, tableau = cartes('As Kd'), cartes('Qs Js 2c 9h 3d')
+        self.assertEqual(abstraction.groupe(1, main, tableau[:3]), indexeur(1).indexer(main, tableau[:3]) % 300)
+        self.assertEqual(abstraction.groupe(3, main, tableau), 3)
+        # Couleurs permutées : même situation canonique
+        self.assertEqual(abstraction.groupe(1, main, tableau[:3]),
+                         abstraction.groupe(1, cartes('Ah Kc'), cartes('Qh Jh 2s')))
+        self.assertEqual(abstraction.groupes_donne([main], tableau)[0][3], abstraction.groupe(3, main, tableau))
+
+        entraineur = EntraineurCFR(abstraction)
+        entraineur.entrainer(50, graine=7)
+        self.assertGreater(len(entraineur.noeuds), 0)
+        recree = abstraction_depuis_parametres(entraineur.parametres()['abstraction'])
+        self.addCleanup(recree.fermer)
+        self.assertEqual(recree.nb_groupes, abstraction.nb_groupes)
+
+
+if __name__ == '__main__':
+    unittest.main()
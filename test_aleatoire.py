@@ -0,0 +1,77 @@
+import unittest
+import random
+
+from moteur_poker.aleatoire import creer_rng, flux, graine_fille, graines_filles
+from moteur_poker.jeu import Joueur, Partie
+from moteur_poker.simulation import simuler, strategie_force, strategie_suiveur
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def donne(partie, graine):
+    partie.nouvelle_partie(graine)
+    partie.distribuer_cartes()
+    partie.flop()
+    partie.turn_or_river()
+    partie.turn_or_river()
+    return [carte.id for joueur in partie.joueurs for carte in joueur.cartes] + \
+        [carte.id for carte in partie.cartes_communes]
+
+
+class TestFlux(unittest.TestCase):
+
+    def test_graines_derivees(self):
+        self.assertEqual(graine_fille(1, 'table', 3), graine_fille(1, 'table', 3))
+        self.assertNotEqual(graine_fille(1, 'table', 3), graine_fille(1, 'table', 4))
+        self.assertEqual(graines_filles(5, 3), [graine_fille(5, i) for i in range(3)])
+
+    def test_flux_independants(self):
+        a, b = flux(1, 'table', 0), flux(1, 'table', 1)
+        self.assertNotEqual([a.random() for _ in range(5)], [b.random() for _ in range(5)])
+        self.assertEqual(flux(1, 'table', 0).random(), flux(1, 'table', 0).random())
+
+    def test_generateur_inconnu(self):
+        with self.assertRaises(ValueError):
+            creer_rng(1, 'xorshift')
+
+
+class TestDonneReproductible(unittest.TestCase):
+
+    def test_rejouer_une_donne(self):
+        partie = Partie([Joueur("A"), Joueur("B"), Joueur("C")], rng=random.Random())
+        premiere = donne(partie, 42)
+        donne(partie, 7)
+        self.assertEqual(donne(partie, 42), premiere)
+
+    def test_simulation_reproductible(self):
+        strategies = [strategie_force, strategie_suiveur]
+        a = simuler(200, [Joueur("A"), Joueur("B")], strategies, graine=11)
+        b = simuler(200, [Joueur("A"), Joueur("B")], strategies, graine=11)
+        self.assertEqual(a.gains, b.gains)
+
+
+@unittest.skipIf(numpy is None, "NumPy n'est pas installé.")
+class TestGenerateurPCG64(unittest.TestCase):
+
+    def test_interface(self):
+        rng = creer_rng(3, 'pcg64')
+        valeurs = [rng.random() for _ in range(10_000)]  # Plusieurs blocs
+        self.assertTrue(all(0 <= v < 1 for v in valeurs))
+        self.assertEqual(valeurs[0], creer_rng(3, 'pcg64').random())
+        self.assertTrue(all(1 <= rng.randint(1, 6) <= 6 for _ in range(100)))
+        echantillon = rng.sample(range(52), 9)
+        self.assertEqual(len(set(echantillon)), 9)
+        liste = list(range(20))
+        rng.shuffle(liste)
+        self.assertEqual(sorted(liste), list(range(20)))
+
+    def test_donne_reproductible(self):
+        partie = Partie([Joueur("A"), Joueur("B")], rng=creer_rng(None, 'pcg64'))
+        self.assertEqual(donne(partie, 9), donne(partie, 9))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import os
+import random
+import tempfile
+
+from moteur_poker.cache import CacheLRU
+from moteur_poker.cartes import depuis_texte, masque
+from moteur_poker.equite import equite, equite_fourchettes
+from moteur_poker.evaluateur import evaluer
+from moteur_poker.strategies import fourchette
+
+
+def cartes(texte):
+    return [depuis_texte(t) for t in texte.split()]
+
+
+class TestCacheLRU(unittest.TestCase):
+
+    def test_eviction_lru(self):
+        cache = CacheLRU(2)
+        cache.ajouter('a', 1)
+        cache.ajouter('b', 2)
+        self.assertEqual(cache.obtenir('a'), 1)  # 'a' devient la plus récente
+        cache.ajouter('c', 3)
+        self.assertNotIn('b', cache)
+        self.assertIn('a', cache)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_compteurs(self):
+        cache = CacheLRU(10)
+        cache.obtenir('x')
+        cache.calculer('x', lambda: 42)
+        self.assertEqual(cache.calculer('x', lambda: 0), 42)
+        stats = cache.statistiques()
+        self.assertEqual((stats['succes'], stats['echecs'], stats['taille']), (1, 2, 1))
+        self.assertAlmostEqual(cache.taux_succes, 1 / 3)
+
+    def test_memoiser_evaluation(self):
+        cache = CacheLRU(100)
+        evaluer_memo = cache.memoiser(evaluer, cle=masque)
+        main = cartes('As Ks Qs Js Ts 2c 3d')
+        self.assertEqual(evaluer_memo(main), evaluer(main))
+        self.assertEqual(evaluer_memo(main[::-1]), evaluer(main))
+        self.assertEqual(cache.succes, 1)
+
+    def test_persistance(self):
+        cache = CacheLRU(10)
+        for i in range(5):
+            cache.ajouter(i, i * i)
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, 'cache.pkl')
+            cache.sauvegarder(chemin)
+            recharge = CacheLRU.charger(chemin, taille_max=3)
+            self.assertEqual(len(recharge), 3)
+            self.assertEqual(recharge.obtenir(4), 16)
+            self.assertEqual(len(CacheLRU.charger(os.path.join(dossier, 'absent.pkl'))), 0)
+
+    def test_equite_partagee_entre_isomorphes(self):
+        cache = CacheLRU(10)
+        premiere = equite(cartes('As Ks'), cartes('Qh Jh 2d'), largeur_cible=0.05, cache=cache,
+                          rng=random.Random(1))
+        seconde = equite(cartes('Ah Kh'), cartes('Qs Js 2c'), largeur_cible=0.05, cache=cache)
+        self.assertEqual((premiere.tirages, premiere.equite), (seconde.tirages, seconde.equite))
+        self.assertEqual(cache.succes, 1)
+        # L'appelant reçoit une copie : la modifier n'altère pas le cache
+        seconde.victoires += 1000
+        self.assertEqual(equite(cartes('As Ks'), cartes('Qh Jh 2d'), largeur_cible=0.05, cache=cache).tirages,
+                         premiere.tirages)
+
+    def test_equite_recalculee_si_moins_precise(self):
+        cache = CacheLRU(10)
+        grossiere = equite(cartes('As Ks'), cartes('Qh Jh 2d'), largeur_cible=0.1, cache=cache, rng=random.Random(2))
+        precise = equite(cartes('As Ks'), cartes('Qh Jh 2d'), largeur_cible=0.02, cache=cache, rng=random.Random(3))
+        self.assertLess(2 * precise.demi_largeur, 0.02)
+        self.assertGreater(precise.tirages, grossiere.tirages)
+        # L'entrée précise sert ensuite les demandes moins exigeantes
+        self.assertEqual(equite(cartes('As Ks'), cartes('Qh Jh 2d'), largeur_cible=0.1, cache=cache).tirages,
+                         precise.tirages)
+        # Ainsi que celles dont le plafond de tirages est déjà atteint
+        self.assertEqual(equite(cartes('As Ks'), cartes('Qh Jh 2d'), largeur_cible=0.001, tirages_max=100,
+                                cache=cache).tirages, precise.tirages)
+
+    def test_equite_fourchettes_reprend_les_tirages(self):
+        cache = CacheLRU(10)
+        mains = fourchette(0.2)
+        options = {'cache': cache, 'cle_fourchettes': (len(mains),)}
+        premiere = equite_fourchettes(cartes('As Ks'), cartes('Qh Jh 2d'), [mains], largeur_cible=0.1,
+                                      rng=random.Random(1), **options)
+        # Situation isomorphe, précision plus fine : le calcul repart des tirages mémorisés
+        seconde = equite_fourchettes(cartes('Ah Kh'), cartes('Qs Js 2c'), [mains], largeur_cible=0.05,
+                                     rng=random.Random(2), **options)
+        self.assertGreater(seconde.tirages, premiere.tirages)
+        self.assertLess(2 * seconde.demi_largeur, 0.05)
+        # Précision déjà atteinte : aucune donne de plus
+        self.assertEqual(equite_fourchettes(cartes('As Ks'), cartes('Qh Jh 2d'), [mains], largeur_cible=0.1,
+                                            **options).tirages, seconde.tirages)
+        self.assertEqual(cache.statistiques()['succes'], 2)
+        with self.assertRaises(ValueError):
+            equite_fourchettes(cartes('As Ks'), [], [mains], cache=cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
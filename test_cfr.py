@@ -0,0 +1,83 @@
+import os
+import random
+import tempfile
+import unittest
+
+from moteur_poker.cfr import EntraineurCFR, AbstractionEquite, StrategieCFR
+from moteur_poker.jeu import Joueur
+from moteur_poker.simulation import simuler, strategie_suiveur
+
+
+class TestCFR(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.entraineur = EntraineurCFR(AbstractionEquite((4, 4, 4, 4), tirages=64))
+        cls.statistiques = cls.entraineur.entrainer(300, graine=1)
+
+    def setUp(self):
+        dossier = tempfile.TemporaryDirectory()
+        self.addCleanup(dossier.cleanup)
+        self.dossier = dossier.name
+
+    def test_statistiques(self):
+        self.assertEqual(self.statistiques['iterations'], 300)
+        self.assertGreater(self.statistiques['iterations_par_seconde'], 0)
+        self.assertGreater(self.statistiques['ensembles'], 100)
+        self.assertGreater(self.statistiques['octets_par_ensemble'], 0)
+
+    def test_ensembles_d_information(self):
+        cles = self.entraineur.noeuds
+        # Premier à parler avant le flop : le bouton, face à la grosse blinde
+        self.assertTrue(any(cle.endswith(':') for cle in cles))
+        self.assertTrue(all(0 <= int(cle.split(':')[0]) < 4 for cle in cles))
+        self.assertTrue(all(set(cle.split(':')[1]) <= set('fcr/') for cle in cles))
+        for cle in list(cles)[:50]:
+            strategie = self.entraineur.strategie_moyenne(cle)
+            if strategie is not None:
+                self.assertAlmostEqual(sum(strategie), 1.0)
+
+    def test_groupes_preflop(self):
+        abstraction = AbstractionEquite((8, 8, 8, 8))
+        groupes = abstraction.groupes_preflop()
+        self.assertEqual(groupes, AbstractionEquite((8, 8, 8, 8)).groupes_preflop())  # Graine fixe
+        self.assertEqual(groupes[12 * 13 + 12], 7)  # AA
+        self.assertEqual(groupes[0 * 13 + 5], 0)  # 72o
+
+    def test_reprise(self):
+        chemin = os.path.join(self.dossier, 'cfr.reprise')
+        self.entraineur.sauvegarder(chemin)
+        repris = EntraineurCFR.charger(chemin)
+        self.assertEqual(repris.iterations, 300)
+        self.assertEqual(repris.parametres(), self.entraineur.parametres())
+        self.assertEqual(repris.noeuds, self.entraineur.noeuds)
+        repris.entrainer(20, graine=2)
+        self.assertEqual(repris.iterations, 320)
+
+    def test_multiprocessus(self):
+        entraineur = EntraineurCFR(AbstractionEquite((4, 4, 4, 4), tirages=32))
+        chemin = os.path.join(self.dossier, 'cfr.reprise')
+        statistiques = entraineur.entrainer(120, nb_processus=2, taille_lot=30, graine=3, chemin_sauvegarde=chemin)
+        self.assertEqual(statistiques['iterations'], 120)
+        self.assertGreater(statistiques['ensembles'], 0)
+        self.assertEqual(EntraineurCFR.charger(chemin).iterations, 120)
+
+    def test_export_et_strategie(self):
+        chemin = os.path.join(self.dossier, 'strategie.table')
+        self.entraineur.exporter(chemin)
+        strategie = StrategieCFR(chemin, rng=random.Random(4))
+        self.addCleanup(strategie.fermer)
+        self.assertEqual(strategie.parametres['relances_max'], 3)
+        for cle in list(self.entraineur.noeuds)[:200]:
+            attendues = self.entraineur.strategie_moyenne(cle)
+            lues = strategie.table.probabilites(cle)
+            self.assertEqual(lues is None, attendues is None)
+            if attendues is not None:
+                for lue, attendue in zip(lues, attendues):
+                    self.assertAlmostEqual(lue, attendue, delta=0.01)
+        resultat = simuler(30, [Joueur("CFR"), Joueur("S")], [strategie, strategie_suiveur], graine=5)
+        self.assertEqual(sum(resultat.gains.values()), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+import os
+import random
+import tempfile
+from unittest.mock import patch
+
+from moteur_poker import preflop
+from moteur_poker.cartes import depuis_texte
+from moteur_poker.equite import equite, equite_exacte, cartes_restantes
+
+
+def main(texte):
+    return [depuis_texte(t) for t in texte.split()]
+
+
+class TestEquite(unittest.TestCase):
+
+    def test_paire_d_as(self):
+        resultat = equite(main('As Ad'), largeur_cible=0.02, rng=random.Random(1))
+        self.assertAlmostEqual(resultat.equite, 0.852, delta=0.02)
+        self.assertLess(2 * resultat.demi_largeur, 0.02)
+        self.assertGreater(resultat.tirages_par_seconde, 0)
+
+    def test_arret_sur_tirages_max(self):
+        resultat = equite(main('7s 2d'), nb_adversaires=3, largeur_cible=0.0, tirages_max=500,
+                          rng=random.Random(2))
+        self.assertEqual(resultat.tirages, 500)
+
+    def test_egalite_sur_le_tableau(self):
+        resultat = equite(main('2c 3d'), main('As Ks Qs Js Ts'), nb_adversaires=2, tirages_max=200,
+                          rng=random.Random(3))
+        self.assertEqual(resultat.egalites, resultat.tirages)
+        self.assertAlmostEqual(resultat.equite, 1 / 3)
+
+    def test_main_gagnante_certaine(self):
+        resultat = equite(main('Ah Kh'), main('Qh Jh Th 2c 3d'), rng=random.Random(4))
+        self.assertEqual(resultat.victoires, resultat.tirages)
+
+    def test_cartes_restantes(self):
+        self.assertEqual(len(cartes_restantes(main('As Ad Kc'))), 49)
+        self.assertEqual(cartes_restantes(main('As'), paquet=main('As Ks Qs')), main('Ks Qs'))
+
+
+class TestEquiteExacte(unittest.TestCase):
+
+    def test_river_connue(self):
+        resultat = equite_exacte(main('As Ad'), main('2c 7d 9h Jc Qs'), [main('Kc Kh')])
+        self.assertEqual((resultat.victoires, resultat.egalites, resultat.defaites), (1, 0, 0))
+
+    def test_turn_contre_main_connue(self):
+        # Tirage couleur contre paire de rois : 9 cœurs et 3 As gagnent sur 44 rivières
+        resultat = equite_exacte(main('Ah 2h'), main('Kh 7h 9c 3d'), [main('Kc Qs')])
+        self.assertEqual(resultat.tirages, 44)
+        self.assertEqual(resultat.victoires, 12)
+
+    def test_turn_contre_adversaire_inconnu(self):
+        resultat = equite_exacte(main('As Kd'), main('Qs Js 2c 7h'), nb_inconnus=1)
+        self.assertEqual(resultat.tirages, 46 * 45 * 44 // 2)
+        self.assertLess(resultat.duree, 1.0)
+        approche = equite(main('As Kd'), main('Qs Js 2c 7h'), largeur_cible=0.02, rng=random.Random(5))
+        self.assertAlmostEqual(resultat.equite, approche.equite, delta=0.02)
+
+    def test_egalite_partagee(self):
+        resultat = equite_exacte(main('2c 3d'), main('As Ks Qs Js Ts'), [main('4c 5d'), main('6c 7d')])
+        self.assertEqual(resultat.egalites, 1)
+        self.assertAlmostEqual(resultat.equite, 1 / 3)
+
+    def test_trop_d_inconnus(self):
+        with self.assertRaises(ValueError):
+            equite_exacte(main('As Kd'), nb_inconnus=2)
+
+
+class TestTablePreflop(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dossier = tempfile.TemporaryDirectory()
+        chemin = preflop.generer_table(os.path.join(cls.dossier.name, 'preflop.bin'), tirages=1, graine=1)
+        cls.table = preflop.TablePreflop(chemin)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.table.fermer()
+        cls.dossier.cleanup()
+
+    def test_indices_canoniques(self):
+        indices = {preflop.indice_main(a, b) for a in range(52) for b in range(52) if a != b}
+        self.assertEqual(indices, set(range(preflop.NB_MAINS)))
+        self.assertEqual(preflop.nom_main(preflop.indice_main(*main('As Ad'))), 'AA')
+        self.assertEqual(preflop.nom_main(preflop.indice_main(*main('Ks As'))), 'AKs')
+        self.assertEqual(preflop.nom_main(preflop.indice_main(*main('7d 2c'))), '72o')
+        for indice in range(preflop.NB_MAINS):
+            for a, b in preflop.combinaisons_main(indice):
+                self.assertEqual(preflop.indice_main(a, b), indice)
+
+    def test_symetrie(self):
+        aa, kk = preflop.indice_main(*main('As Ad')), preflop.indice_main(*main('Ks Kd'))
+        self.assertAlmostEqual(self.table.equite(aa, kk) + self.table.equite(kk, aa), 1.0, places=4)
+        self.assertAlmostEqual(self.table.equite(main('As Ad'), main('Ac Ah')), 0.5, places=4)
+        self.assertIsNone(self.table.equite_contre_aleatoire(aa, 5))
+
+    def test_equite_consulte_la_table(self):
+        with patch.object(preflop, '_table_par_defaut', self.table):
+            resultat = equite(main('As Ad'), nb_adversaires=2)
+            self.assertEqual(resultat.tirages, 0)
+            self.assertEqual(resultat.equite, self.table.equite_contre_aleatoire(main('As Ad'), 2))
+            self.assertGreater(equite(main('As Ad'), nb_adversaires=2, table_preflop=False).tirages, 0)
+
+    def test_tete_a_tete(self):
+        e = preflop.equite_tete_a_tete(preflop.indice_main(*main('As Ad')), preflop.indice_main(*main('Ks Kd')),
+                                       4000, random.Random(6))
+        self.assertAlmostEqual(e, 0.82, delta=0.03)
+
+
+if __name__ == '__main__':
+    unittest.main()
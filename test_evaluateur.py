@@ -0,0 +1,124 @@
+import unittest
+import random
+from itertools import combinations
+
+from moteur_poker.cartes import depuis_texte, vers_texte, ids, masque, cartes_du_masque, rang_de, couleur_de
+from moteur_poker.evaluateur import (evaluer, EvaluationIncrementale, categorie, nom_categorie, CARTE_HAUTE,
+                                     PAIRE, DEUX_PAIRES, BRELAN, QUINTE, COULEUR, FULL, CARRE, QUINTE_FLUSH,
+                                     QUINTE_FLUSH_ROYALE)
+
+
+def main(texte):
+    return [depuis_texte(t) for t in texte.split()]
+
+
+def reference_5(cartes):
+    """Évaluation naïve d'exactement cinq cartes, indépendante des tables."""
+    rangs = sorted((c >> 2 for c in cartes), reverse=True)
+    couleur = len({c & 3 for c in cartes}) == 1
+    groupes = sorted(((rangs.count(r), r) for r in set(rangs)), reverse=True)
+    ordre = [r for _, r in groupes]
+    quinte = len(set(rangs)) == 5 and (rangs[0] - rangs[4] == 4 or rangs == [12, 3, 2, 1, 0])
+    haut = 3 if rangs == [12, 3, 2, 1, 0] else rangs[0]
+    if quinte and couleur:
+        return (9, [haut])
+    if groupes[0][0] == 4:
+        return (8, ordre)
+    if groupes[0][0] == 3 and groupes[1][0] == 2:
+        return (7, ordre)
+    if couleur:
+        return (6, rangs)
+    if quinte:
+        return (5, [haut])
+    if groupes[0][0] == 3:
+        return (4, ordre)
+    if groupes[0][0] == 2 and groupes[1][0] == 2:
+        return (3, ordre)
+    if groupes[0][0] == 2:
+        return (2, ordre)
+    return (1, rangs)
+
+
+def reference(cartes):
+    return max(reference_5(c) for c in combinations(cartes, 5))
+
+
+class TestCartes(unittest.TestCase):
+
+    def test_conversions(self):
+        self.assertEqual(depuis_texte('2s'), 0)
+        self.assertEqual(depuis_texte('Ac'), 51)
+        self.assertEqual(rang_de(depuis_texte('Qh')), 10)
+        self.assertEqual(couleur_de(depuis_texte('Qh')), 1)
+        for c in range(52):
+            self.assertEqual(depuis_texte(vers_texte(c)), c)
+
+    def test_masque(self):
+        cartes = main('As Kd 2c')
+        self.assertEqual(cartes_du_masque(masque(cartes)), sorted(cartes))
+
+    def test_ids(self):
+        class Objet:
+            id = 12
+        self.assertEqual(ids([Objet(), 3]), [12, 3])
+
+
+class TestEvaluateur(unittest.TestCase):
+
+    def test_categories(self):
+        self.assertEqual(categorie(evaluer(main('As Ks Qs Js Ts 2c 3d'))), QUINTE_FLUSH_ROYALE)
+        self.assertEqual(categorie(evaluer(main('5h 4h 3h 2h Ah Kc Kd'))), QUINTE_FLUSH)
+        self.assertEqual(categorie(evaluer(main('9c 9d 9h 9s 2c 3d 4h'))), CARRE)
+        self.assertEqual(categorie(evaluer(main('9c 9d 9h 2s 2c 3d 3h'))), FULL)
+        self.assertEqual(categorie(evaluer(main('2d 7d 9d Jd Kd Kc Kh'))), COULEUR)
+        self.assertEqual(categorie(evaluer(main('As 2c 3d 4h 5s 9c Jd'))), QUINTE)
+        self.assertEqual(categorie(evaluer(main('As Ac 3d 3h 5s 5c Jd'))), DEUX_PAIRES)
+        self.assertEqual(categorie(evaluer(main('As Ac 3d 4h 8s 9c Jd'))), PAIRE)
+        self.assertEqual(categorie(evaluer(main('As Kc 3d 4h 8s 9c Jd'))), CARTE_HAUTE)
+        self.assertEqual(nom_categorie(evaluer(main('9c 9d 9h 2s 2c 3d 3h'))), "Full")
+
+    def test_departage(self):
+        self.assertGreater(evaluer(main('As Ac Kd 4h 8s 9c Jd')), evaluer(main('As Ac Qd 4h 8s 9c Jd')))
+        self.assertGreater(evaluer(main('6s 2c 3d 4h 5s 9c Jd')), evaluer(main('As 2c 3d 4h 5s 9c Jd')))
+        self.assertEqual(evaluer(main('As Ac Kd Qh Js 3c 2d')), evaluer(main('Ah Ad Kc Qs Jd 4c 2h')))
+
+    def test_moins_de_cinq_cartes(self):
+        self.assertEqual(categorie(evaluer(main('As Ac'))), PAIRE)
+        self.assertEqual(categorie(evaluer([])), CARTE_HAUTE)
+
+    def test_conforme_a_la_reference(self):
+        rng = random.Random(7)
+        forces = []
+        for _ in range(3000):
+            cartes = rng.sample(range(52), rng.choice((5, 6, 7)))
+            forces.append((evaluer(cartes), reference(cartes), len(cartes)))
+        for n in (5, 6, 7):
+            mains = [(f, r) for f, r, taille in forces if taille == n]
+            for (f1, r1), (f2, r2) in zip(mains, mains[1:]):
+                self.assertEqual(f1 > f2, r1 > r2)
+                self.assertEqual(f1 == f2, r1 == r2)
+                self.assertEqual(min(categorie(f1), 9), r1[0])
+
+
+class TestEvaluationIncrementale(unittest.TestCase):
+
+    def test_rue_par_rue(self):
+        rng = random.Random(11)
+        for _ in range(500):
+            cartes = rng.sample(range(52), 7)
+            evaluation = EvaluationIncrementale(cartes[:2])
+            for n in range(2, 7):
+                evaluation.ajouter(cartes[n])
+                self.assertEqual(evaluation.force(), evaluer(cartes[:n + 1]))
+            self.assertEqual(evaluation.nb_cartes, 7)
+
+    def test_copie_independante(self):
+        evaluation = EvaluationIncrementale(main('As Ad'))
+        copie = evaluation.copie()
+        copie.ajouter(depuis_texte('Ac'))
+        self.assertEqual(categorie(evaluation.force()), PAIRE)
+        self.assertEqual(categorie(copie.force()), BRELAN)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+
+from moteur_poker import historique
+from moteur_poker.historique import (EnregistreurBinaire, EnregistreurJSONL, Evenement, lire, mains,
+                                     NOUVELLE_MAIN, CARTE_JOUEUR, BRULEE, COMMUNE, MISE, COUCHE, GAIN, FIN_MAIN)
+from moteur_poker.jeu import Joueur
+from moteur_poker.simulation import simuler, strategie_force, strategie_suiveur
+
+
+class ListeEvenements(list):
+    """Enregistreur minimal : garde les événements en mémoire."""
+
+    def enregistrer(self, type_evenement, *valeurs):
+        self.append(Evenement(type_evenement, valeurs))
+
+
+class TestHistorique(unittest.TestCase):
+
+    def setUp(self):
+        self.dossier = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dossier.cleanup)
+
+    def chemin(self, nom):
+        return os.path.join(self.dossier.name, nom)
+
+    def simuler(self, enregistreur, nb_mains=50):
+        joueurs = [Joueur("A"), Joueur("B")]
+        return simuler(nb_mains, joueurs, [strategie_force, strategie_suiveur], graine=7, enregistreur=enregistreur)
+
+    def test_evenements_d_une_donne(self):
+        evenements = ListeEvenements()
+        self.simuler(evenements, 1)
+        types = [evenement.type for evenement in evenements]
+        self.assertEqual(types[0], NOUVELLE_MAIN)
+        self.assertEqual(types[1:5], [CARTE_JOUEUR] * 4)
+        self.assertEqual(types[-1], FIN_MAIN)
+        brulees = types.count(BRULEE)
+        self.assertEqual(types.count(COMMUNE), brulees + 2 if brulees else 0)
+        self.assertIn(GAIN, types)
+
+    def test_jetons_conserves(self):
+        evenements = ListeEvenements()
+        self.simuler(evenements)
+        donnes = list(mains(evenements))
+        self.assertEqual(len(donnes), 50)
+        for donne in donnes:
+            mises = sum(e.valeurs[1] for e in donne if e.type == MISE)
+            gains = sum(e.valeurs[1] for e in donne if e.type == GAIN)
+            self.assertEqual(mises, gains)
+            cartes = [e.valeurs[-1] for e in donne if e.type in (CARTE_JOUEUR, BRULEE, COMMUNE)]
+            self.assertEqual(len(cartes), len(set(cartes)))
+        self.assertTrue(any(e.type == COUCHE for e in evenements))
+
+    def test_aller_retour_binaire_et_jsonl(self):
+        attendus = ListeEvenements()
+        self.simuler(attendus)
+        with EnregistreurBinaire(self.chemin('h.bin'), taille_tampon=256) as binaire:
+            self.simuler(binaire)
+        with EnregistreurJSONL(self.chemin('h.jsonl')) as jsonl:
+            self.simuler(jsonl)
+        self.assertEqual(list(lire(self.chemin('h.bin'))), attendus)
+        self.assertEqual(list(lire(self.chemin('h.jsonl'))), attendus)
+        # Lecture par petits blocs : les événements à cheval sur deux blocs sont recollés
+        with open(self.chemin('h.bin'), 'rb') as fichier:
+            self.assertEqual(list(historique.lire_binaire(fichier, taille_bloc=7)), attendus)
+
+    def test_ajout_et_graines(self):
+        chemin = self.chemin('h.bin')
+        for graine in (None, 0, 2 ** 64 - 1):
+            with EnregistreurBinaire(chemin) as enregistreur:
+                enregistreur.enregistrer(NOUVELLE_MAIN, graine)
+                enregistreur.enregistrer(MISE, 1, 100_000)
+                enregistreur.enregistrer(FIN_MAIN)
+        evenements = list(lire(chemin))
+        self.assertEqual([e.valeurs for e in evenements if e.type == NOUVELLE_MAIN], [(None,), (0,), (2 ** 64 - 1,)])
+        self.assertEqual(evenements[1], Evenement(MISE, (1, 100_000)))
+
+    def test_fin_tronquee_ignoree(self):
+        chemin = self.chemin('h.bin')
+        with EnregistreurBinaire(chemin) as enregistreur:
+            enregistreur.enregistrer(NOUVELLE_MAIN, 3)
+            enregistreur.enregistrer(MISE, 0, 300)
+        with open(chemin, 'r+b') as fichier:
+            fichier.truncate(os.path.getsize(chemin) - 1)
+        self.assertEqual(list(lire(chemin)), [Evenement(NOUVELLE_MAIN, (3,))])
+
+    def test_mauvais_fichier(self):
+        with open(self.chemin('autre.bin'), 'wb') as fichier:
+            fichier.write(b'\x00\x01')
+        with open(self.chemin('autre.bin'), 'rb') as fichier:
+            with self.assertRaises(ValueError):
+                list(historique.lire_binaire(fichier))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import random
+
+from moteur_poker.cartes import depuis_texte
+from moteur_poker.isomorphisme import canonicaliser, cle_canonique, IndexeurMains
+
+
+def cartes(texte):
+    return [depuis_texte(t) for t in texte.split()]
+
+
+def permuter(groupes, permutation):
+    return [[(c >> 2) * 4 + permutation[c & 3] for c in groupe] for groupe in groupes]
+
+
+class TestCanonicalisation(unittest.TestCase):
+
+    def test_situations_isomorphes(self):
+        a = (cartes('As Ks'), cartes('Qh Jh 2d'))
+        b = (cartes('Ah Kh'), cartes('Qs Js 2c'))
+        self.assertEqual(canonicaliser(*a), canonicaliser(*b))
+        self.assertEqual(cle_canonique(*a), cle_canonique(*b))
+
+    def test_situations_distinctes(self):
+        assortie = (cartes('As Ks'), cartes('Qs Jh 2d'))
+        depareillee = (cartes('As Kh'), cartes('Qs Jh 2d'))
+        self.assertNotEqual(cle_canonique(*assortie), cle_canonique(*depareillee))
+
+    def test_les_rues_comptent(self):
+        self.assertNotEqual(cle_canonique(cartes('As Kd'), cartes('Qs Jh 2c'), cartes('3d')),
+                            cle_canonique(cartes('As Kd'), cartes('Qs Jh 3d'), cartes('2c')))
+
+
+class TestIndexeurMains(unittest.TestCase):
+
+    def test_tailles(self):
+        self.assertEqual(IndexeurMains((2,)).taille, 169)
+        self.assertEqual(IndexeurMains((2, 3)).taille, 1286792)
+        self.assertEqual(IndexeurMains((2, 3, 1)).taille, 55190538)
+        self.assertEqual(IndexeurMains((2, 3, 1, 1)).taille, 2428287420)
+
+    def test_mains_de_depart(self):
+        indexeur = IndexeurMains((2,))
+        indices = {indexeur.indexer(a) for a in ([x, y] for x in range(52) for y in range(x + 1, 52))}
+        self.assertEqual(indices, set(range(169)))
+        for i in range(169):
+            self.assertEqual(indexeur.indexer(*indexeur.representant(i)), i)
+
+    def test_invariance_et_aller_retour(self):
+        indexeur = IndexeurMains((2, 3, 1))
+        rng = random.Random(3)
+        for _ in range(300):
+            tirage = rng.sample(range(52), 6)
+            groupes = (tirage[:2], tirage[2:5], tirage[5:])
+            indice = indexeur.indexer(*groupes)
+            self.assertEqual(indexeur.indexer(*permuter(groupes, rng.sample(range(4), 4))), indice)
+            representant = indexeur.representant(indice)
+            self.assertEqual(canonicaliser(*representant), canonicaliser(*groupes))
+            aleatoire = rng.randrange(indexeur.taille)
+            self.assertEqual(indexeur.indexer(*indexeur.representant(aleatoire)), aleatoire)
+
+
+if __name__ == '__main__':
+    unittest.main()
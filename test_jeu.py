@@ -0,0 +1,89 @@
+import unittest
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+
+from moteur_poker import evaluateur
+from moteur_poker.jeu import Carte, Joueur, Croupier, Partie
+
+
+class TestCarte(unittest.TestCase):
+
+    def test_identifiants(self):
+        self.assertEqual(Carte('2', '♠').id, 0)
+        self.assertEqual(Carte('A', '♣').id, 51)
+        self.assertEqual(repr(Carte.depuis_id(Carte('10', '♥').id)), '10♥')
+
+    def test_instances_partagees(self):
+        carte = Carte('A', '♠')
+        self.assertIs(carte, Carte('A', '♠'))
+        self.assertIs(carte, Carte.depuis_id(carte.id))
+        self.assertIs(pickle.loads(pickle.dumps(carte)), carte)
+        self.assertFalse(hasattr(carte, '__dict__'))
+
+    def test_hachage_et_ordre(self):
+        cartes = [Carte('K', '♥'), Carte('2', '♣'), Carte('A', '♠')]
+        self.assertEqual([c.id for c in sorted(cartes)], sorted(c.id for c in cartes))
+        self.assertEqual(len({Carte('K', '♥'), Carte('K', '♥')}), 1)
+        self.assertEqual(hash(Carte('K', '♥')), Carte('K', '♥').id)
+
+    def test_sous_classe(self):
+        class CarteImages(Carte):
+            RANGS = ['2', '3', '4', '5', '6', '7', '8', '9', 'X', 'V', 'D', 'R', 'A']
+            COULEURS = ['P', 'C', 'K', 'T']
+
+        self.assertEqual(CarteImages('R', 'C').id, Carte('K', '♥').id)
+        self.assertEqual(CarteImages.depuis_id(51).valeur(), 12)
+        self.assertIn(('A', '♠'), Carte.IDS)  # La classe de base n'est pas modifiée
+        self.assertIsNot(CarteImages.depuis_id(0), Carte.depuis_id(0))
+
+
+class TestPartie(unittest.TestCase):
+
+    def setUp(self):
+        self.joueurs = [Joueur("A"), Joueur("B"), Joueur("C", ia=True)]
+        self.partie = Partie(self.joueurs)
+
+    def test_donne_complete(self):
+        self.partie.nouvelle_partie()
+        self.partie.distribuer_cartes()
+        self.partie.flop()
+        self.partie.turn_or_river()
+        self.partie.turn_or_river()
+        self.assertEqual(len(self.partie.cartes_communes), 5)
+        self.assertEqual(len(self.partie.croupier.paquet), 52 - 6 - 5 - 3)
+        mains = self.partie.evaluer_combinaisons()
+        for joueur in self.joueurs:
+            self.assertEqual(mains[joueur], self.partie.evaluer_main(joueur.cartes + self.partie.cartes_communes))
+
+    def test_croupier_classe_carte(self):
+        class CarteImages(Carte):
+            COULEURS = ['P', 'C', 'K', 'T']
+
+        croupier = Croupier(CarteImages)
+        croupier.rassembler()
+        self.assertEqual(len(croupier.paquet), 52)
+        self.assertTrue(all(isinstance(carte, CarteImages) for carte in croupier.paquet))
+
+    def test_sans_interface(self):
+        # Le moteur ne doit charger aucune bibliothèque graphique.
+        code = "import sys, moteur_poker.jeu; print(sorted({'tkinter', 'PIL', 'pygame'} & set(sys.modules)))"
+        sortie = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        self.assertEqual(sortie.stdout.strip(), '[]')
+
+
+class TestTablesEvaluateur(unittest.TestCase):
+
+    def test_relecture_tables(self):
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, 'evaluateur.bin')
+            tables = evaluateur._charger_tables(chemin)  # Construit puis écrit
+            self.assertTrue(os.path.exists(chemin))
+            self.assertEqual(evaluateur._charger_tables(chemin), tables)
+            self.assertEqual(tables, (evaluateur._FORCE_RANGS, evaluateur._FORCE_COULEUR))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    raise unittest.SkipTest("NumPy n'est pas installé.")
+
+from moteur_poker.evaluateur import evaluer
+from moteur_poker.lot import evaluer_lot, categories_lot, mains_aleatoires
+
+
+class TestEvaluationParLot(unittest.TestCase):
+
+    def test_conforme_a_l_evaluateur(self):
+        rng = np.random.default_rng(1)
+        for nb_cartes in (5, 6, 7):
+            mains = mains_aleatoires(2000, nb_cartes, rng)
+            forces = evaluer_lot(mains)
+            self.assertEqual(forces.shape, (2000,))
+            self.assertEqual(forces.tolist(), [evaluer(main) for main in mains.tolist()])
+
+    def test_mains_aleatoires_distinctes(self):
+        mains = mains_aleatoires(500, 7, np.random.default_rng(2))
+        self.assertTrue(all(len(set(main)) == 7 for main in mains.tolist()))
+
+    def test_categories(self):
+        # Quinte flush royale à pique puis carré d'As
+        mains = np.array([[48, 44, 40, 36, 32, 0, 1], [48, 49, 50, 51, 0, 5, 10]])
+        self.assertEqual(categories_lot(evaluer_lot(mains)).tolist(), [10, 8])
+
+    def test_entree_invalide(self):
+        with self.assertRaises(ValueError):
+            evaluer_lot(np.zeros((3, 8), dtype=int))
+        with self.assertRaises(ValueError):
+            evaluer_lot(np.array([[0, 1, 2, 3, 52]]))
+
+    def test_grand_lot(self):
+        mains = mains_aleatoires(300_000, 7, np.random.default_rng(3))
+        forces = evaluer_lot(mains)
+        for i in random.Random(4).sample(range(len(mains)), 200):
+            self.assertEqual(forces[i], evaluer(mains[i].tolist()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import random
+import unittest
+
+from moteur_poker.cartes import depuis_texte
+from moteur_poker.jeu import Carte, Joueur, Partie, TourDeMise, SE_COUCHER, SUIVRE, RELANCER
+from moteur_poker.mcts import ACTIONS, ReserveNoeuds, StrategieMCTS
+from moteur_poker.simulation import simuler, strategie_suiveur
+
+
+def cartes(texte):
+    return [Carte.depuis_id(depuis_texte(t)) for t in texte.split()]
+
+
+class TestReserveNoeuds(unittest.TestCase):
+
+    def test_allouer_et_liberer(self):
+        reserve = ReserveNoeuds(4)
+        racine = reserve.allouer()
+        enfants = [reserve.allouer() for _ in range(3)]
+        for action, enfant in enumerate(enfants):
+            reserve.enfants[3 * racine + action] = enfant
+        self.assertEqual(len(reserve), 4)
+        self.assertEqual(reserve.allouer(), -1)  # Réserve pleine
+        reserve.liberer(racine, sauf=enfants[1])
+        self.assertEqual(len(reserve), 1)
+        noeud = reserve.allouer()
+        self.assertNotEqual(noeud, enfants[1])
+        self.assertEqual(list(reserve.enfants[3 * noeud:3 * noeud + 3]), [-1, -1, -1])
+
+
+class TestStrategieMCTS(unittest.TestCase):
+
+    def setUp(self):
+        self.joueurs = [Joueur("A"), Joueur("IA", ia=True), Joueur("IA2", ia=True)]
+        self.strategie = StrategieMCTS(budget_ms=None, iterations_max=400, noeuds_max=5000, rng=random.Random(1))
+        self.partie = Partie(self.joueurs, strategie_ia=self.strategie)
+        self.partie.nouvelle_partie()
+
+    def donner(self, communes, *mains):
+        for joueur, main in zip(self.joueurs, mains):
+            joueur.cartes[:] = cartes(main)
+        self.partie.cartes_communes[:] = cartes(communes)
+
+    def test_decisions(self):
+        ia = self.joueurs[1]
+        self.donner('Ah Kh 7c 7d', '2c 3c', 'As Ad', '4c 5c')
+        self.partie.pot = 20
+        self.assertEqual(self.partie.decision_ia(ia)[0], RELANCER)
+        self.donner('Ah Kh Qh 9c', '2c 3c', '7s 2d', '4c 5c')
+        self.partie.mise_actuelle = 40
+        self.assertEqual(self.partie.decision_ia(ia)[0], SE_COUCHER)
+        self.assertEqual(self.strategie.statistiques['iterations'], 400)
+
+    def test_arbre_repris_dans_la_donne(self):
+        partie, strategie = self.partie, self.strategie
+        reserve = strategie.reserve
+        partie.distribuer_cartes()
+        tour = TourDeMise(partie, premier=1)
+        tour.miser(self.joueurs[0], 2)
+        ia = self.joueurs[1]
+        action, montant = strategie(partie, ia, tour.a_suivre(ia))
+        tour.agir(ia, action, montant)
+        racine, _ = strategie._arbres[ia]
+        noeud = reserve.enfants[3 * racine + ACTIONS.index(action)]
+        # Les deux joueurs suivants jouent l'action la plus explorée par la recherche
+        for joueur in (self.joueurs[2], self.joueurs[0]):
+            self.assertIs(tour.joueur_suivant(), joueur)
+            enfants = [reserve.enfants[3 * noeud + a] for a in range(3)]
+            choisie = max(range(3), key=lambda a: reserve.visites[enfants[a]] if enfants[a] >= 0 else -1)
+            tour.agir(joueur, ACTIONS[choisie], 2)
+            noeud = enfants[choisie]
+        visites = reserve.visites[noeud]
+        self.assertGreater(visites, 0)
+        self.assertEqual(strategie._racine(partie, ia), noeud)  # Reprise du sous-arbre
+        self.assertEqual(reserve.visites[noeud], visites)
+        self.assertLess(len(reserve), 5000)
+        # Nouvelle donne : l'arbre de la donne précédente est rendu à la réserve
+        partie.nouvelle_partie()
+        partie.distribuer_cartes()
+        for joueur in self.joueurs:
+            joueur.actif = True
+        strategie(partie, ia, 0)
+        self.assertEqual(list(strategie._arbres), [ia])
+        self.assertEqual(reserve.visites[strategie._arbres[ia][0]], 400)  # Racine neuve
+
+    def test_arbre_repris_hors_tour_de_mise(self):
+        # Enchères menées par une interface : ia_appliquer et noter_action tiennent partie.actions à jour
+        partie, strategie, reserve = self.partie, self.strategie, self.strategie.reserve
+        humain, ia, ia2 = self.joueurs
+        partie.nouvelle_partie(graine=5)
+        partie.distribuer_cartes()
+        partie.noter_action(SUIVRE)
+        partie.ia_appliquer(ia, partie.decision_ia(ia))
+        racine, _ = strategie._arbres[ia]
+        partie.ia_appliquer(ia2, partie.decision_ia(ia2))
+        self.assertEqual(strategie._arbres[ia][0], racine)  # La décision de IA2 ne touche pas l'arbre de IA
+        partie.miser(humain, partie.mise_actuelle)
+        partie.noter_action(SUIVRE)
+        noeud = racine
+        for _, action in partie.actions[1:]:
+            noeud = reserve.enfants[3 * noeud + ACTIONS.index(action)]
+        visites = reserve.visites[noeud]
+        self.assertGreater(visites, 0)
+        partie.decision_ia(ia)
+        self.assertEqual(strategie._arbres[ia][0], noeud)
+        self.assertEqual(reserve.visites[noeud], visites + 400)
+        self.assertEqual(set(strategie._arbres), {ia, ia2})
+
+    def test_reserve_bornee(self):
+        strategie = StrategieMCTS(budget_ms=None, iterations_max=50, noeuds_max=30, rng=random.Random(2))
+        resultat = simuler(20, self.joueurs, [strategie, strategie, strategie_suiveur], graine=3)
+        self.assertEqual(sum(resultat.gains.values()), 0)
+        self.assertLessEqual(len(strategie.reserve), 30)
+
+    def test_sans_adversaire(self):
+        for joueur in self.joueurs[::2]:
+            joueur.actif = False
+        self.donner('', '2c 3c', 'As Ad', '4c 5c')
+        self.assertEqual(self.strategie(self.partie, self.joueurs[1], 0), (SUIVRE, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import random
+
+from moteur_poker.jeu import Croupier, Joueur
+from moteur_poker.paquet import Paquet
+
+
+class TestPaquet(unittest.TestCase):
+
+    def test_melange_permutation(self):
+        paquet = Paquet()
+        paquet.melanger(random.Random(1))
+        self.assertEqual(sorted(paquet.restants()), list(range(52)))
+        self.assertNotEqual(paquet.restants(), list(range(52)))
+
+    def test_reproductible(self):
+        a, b = Paquet(), Paquet()
+        a.melanger(random.Random(7))
+        b.melanger(random.Random(7))
+        self.assertEqual(a.restants(), b.restants())
+
+    def test_couper(self):
+        paquet = Paquet()
+        paquet.couper(10)
+        self.assertEqual(paquet.restants(), list(range(10, 52)) + list(range(10)))
+        self.assertEqual(paquet.tirer(), 10)
+        with self.assertRaises(ValueError):
+            paquet.couper(3)
+
+    def test_tirer_jusqu_au_bout(self):
+        paquet = Paquet()
+        paquet.melanger(random.Random(2))
+        paquet.couper(31)
+        tirees = [paquet.tirer() for _ in range(52)]
+        self.assertEqual(sorted(tirees), list(range(52)))
+        self.assertEqual(len(paquet), 0)
+        with self.assertRaises(IndexError):
+            paquet.tirer()
+
+    def test_melange_paquet_entame(self):
+        paquet = Paquet()
+        paquet.couper(5)
+        tirees = [paquet.tirer() for _ in range(4)]
+        paquet.melanger(random.Random(3))
+        self.assertEqual(sorted(paquet.restants() + tirees), list(range(52)))
+
+
+def khi_deux(comptes, attendu):
+    return sum((c - attendu) ** 2 / attendu for c in comptes)
+
+
+class TestMelangeParesseux(unittest.TestCase):
+    # Seuils du khi-deux au risque 0,1 % : 51 et 168 degrés de liberté
+    SEUIL_51 = 87.97
+    SEUIL_168 = 231.0
+
+    def test_uniformite(self):
+        rng = random.Random(12)
+        paquet = Paquet()
+        nb_essais = 26_000
+        positions = [[0] * 52 for _ in range(3)]
+        paires = [0] * 169  # Rangs de la première et de la dernière carte tirée
+        for _ in range(nb_essais):
+            paquet.rassembler()
+            paquet.melanger(rng, paresseux=True)
+            paquet.couper(rng.randint(0, 52))
+            tirees = [paquet.tirer() for _ in range(12)]
+            for k, position in enumerate((0, 5, 11)):
+                positions[k][tirees[position]] += 1
+            paires[(tirees[0] >> 2) * 13 + (tirees[11] >> 2)] += 1
+        for comptes in positions:
+            self.assertLess(khi_deux(comptes, nb_essais / 52), self.SEUIL_51)
+        attendus = [nb_essais * (3 if i // 13 == i % 13 else 4) / 51 / 13 for i in range(169)]
+        khi = sum((c - a) ** 2 / a for c, a in zip(paires, attendus))
+        self.assertLess(khi, self.SEUIL_168)
+
+    def test_distinctes(self):
+        paquet = Paquet()
+        paquet.melanger(random.Random(5), paresseux=True)
+        tirees = [paquet.tirer() for _ in range(52)]
+        self.assertEqual(sorted(tirees), list(range(52)))
+
+    def test_reproductible(self):
+        a, b = Paquet(), Paquet()
+        a.melanger(random.Random(9), paresseux=True)
+        b.melanger(random.Random(9), paresseux=True)
+        self.assertEqual([a.tirer() for _ in range(12)], [b.tirer() for _ in range(12)])
+
+
+class TestCroupier(unittest.TestCase):
+
+    def test_cartes_reutilisees(self):
+        croupier = Croupier(rng=random.Random(4))
+        joueurs = [Joueur("A"), Joueur("B")]
+        croupier.rassembler()
+        croupier.melanger()
+        croupier.couper()
+        prochaines = croupier.paquet[:4]
+        croupier.distribuer(2, joueurs)
+        self.assertEqual(joueurs[0].cartes + joueurs[1].cartes,
+                         [prochaines[0], prochaines[2], prochaines[1], prochaines[3]])
+        self.assertEqual(len(croupier.paquet), 48)
+        # Une nouvelle donne reprend les mêmes objets Carte
+        croupier.rassembler()
+        self.assertIs(croupier.paquet[0], croupier.cartes[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
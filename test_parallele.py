@@ -0,0 +1,49 @@
+import gc
+import unittest
+
+from moteur_poker.cartes import depuis_texte
+from moteur_poker.jeu import Joueur
+from moteur_poker.parallele import MoteurParallele, equite_parallele, graines_filles, simuler_parallele
+from moteur_poker.simulation import simuler, strategie_force, strategie_suiveur
+
+
+def cartes(texte):
+    return [depuis_texte(t) for t in texte.split()]
+
+
+class TestParallele(unittest.TestCase):
+
+    def test_graines_filles(self):
+        self.assertEqual(graines_filles(1, 4), graines_filles(1, 4))
+        self.assertEqual(len(set(graines_filles(1, 100))), 100)
+        self.assertNotEqual(graines_filles(1, 4), graines_filles(2, 4))
+
+    def test_reproductible_quel_que_soit_le_nombre_de_processus(self):
+        with MoteurParallele(1) as moteur:
+            seul = moteur.equite(cartes('As Kd'), cartes('Qs Js 2c'), tirages=20_000, graine=7)
+        with MoteurParallele(2) as moteur:
+            deux = moteur.equite(cartes('As Kd'), cartes('Qs Js 2c'), tirages=20_000, graine=7)
+        self.assertEqual(seul.tirages, 20_000)
+        self.assertEqual((seul.victoires, seul.egalites, seul.defaites),
+                         (deux.victoires, deux.egalites, deux.defaites))
+
+    def test_equite(self):
+        resultat = equite_parallele(cartes('As Ad'), tirages=40_000, graine=3, nb_processus=2)
+        self.assertAlmostEqual(resultat.equite, 0.852, delta=0.01)
+
+    def test_simulation_repartie_identique_a_la_serie(self):
+        joueurs = [Joueur("A"), Joueur("B"), Joueur("C")]
+        strategies = [strategie_force, strategie_suiveur, strategie_force]
+        serie = simuler(300, joueurs, strategies, graine=5)
+        repartie = simuler_parallele(300, joueurs, strategies, graine=5, nb_processus=2, nb_morceaux=7)
+        self.assertEqual(repartie.nb_mains, 300)
+        self.assertEqual(repartie.gains, serie.gains)
+
+    def test_ramasse_miettes_degele(self):
+        with MoteurParallele(1):
+            self.assertGreater(gc.get_freeze_count(), 0)
+        self.assertEqual(gc.get_freeze_count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,6 +5,7 @@ from io import StringIO
 import sys
 import random
 from projetpokerfinal import Carte, Joueur, Croupier, Partie, PokerApp  # Assuming your classes are in main.py
+from moteur_poker.jeu import SE_COUCHER
 
 # Test de la classe Carte
 class TestCarte(unittest.TestCase):
@@ -100,6 +101,18 @@ class TestPartie(unittest.TestCase):
         self.assertIsInstance(scores[self.joueur_humain], int)
         self.assertIsInstance(scores[self.joueur_ia], int)
 
+    def test_ia_decider_sans_effet(self):
+        self.partie.nouvelle_partie()
+        self.partie.distribuer_cartes()
+        action, mise = self.partie.ia_decider()
+        self.assertEqual((self.partie.pot, self.joueur_ia.tapis, self.joueur_ia.actif), (0, 100, True))
+        message = self.partie.ia_appliquer(self.joueur_ia, (action, mise))
+        if action == SE_COUCHER:
+            self.assertFalse(self.joueur_ia.actif)
+        else:
+            self.assertEqual(self.partie.pot, mise)
+            self.assertIn(str(mise), message)
+
 # Test de la classe PokerApp (en mode non graphique)
 class TestPokerApp(unittest.TestCase):
 
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+
+from moteur_poker.historique import Evenement, MISE, mains
+from moteur_poker.jeu import Joueur
+from moteur_poker.rejeu import JournalRejeu, LecteurRejeu, DivergenceRejeu, chemin_index
+from moteur_poker.simulation import simuler, strategie_force, strategie_suiveur
+
+
+class ListeEvenements(list):
+
+    def enregistrer(self, type_evenement, *valeurs):
+        self.append(Evenement(type_evenement, valeurs))
+
+
+class TestRejeu(unittest.TestCase):
+
+    def setUp(self):
+        dossier = tempfile.TemporaryDirectory()
+        self.addCleanup(dossier.cleanup)
+        self.chemin = os.path.join(dossier.name, 'parties.rejeu')
+
+    def journaliser(self, nb_mains=200, **options):
+        joueurs = [Joueur("A"), Joueur("B"), Joueur("C")]
+        evenements = ListeEvenements()
+        with JournalRejeu(self.chemin) as journal:
+            resultat = simuler(nb_mains, joueurs, [strategie_force, strategie_suiveur, strategie_force], graine=3,
+                               enregistreur=evenements, journal=journal, **options)
+        return resultat, evenements
+
+    def lecteur(self):
+        lecteur = LecteurRejeu(self.chemin)
+        self.addCleanup(lecteur.fermer)
+        return lecteur
+
+    def test_acces_direct_et_gains(self):
+        _, evenements = self.journaliser()
+        lecteur = self.lecteur()
+        self.assertEqual(len(lecteur), 200)
+        self.assertEqual(lecteur.parametres['noms'], ["A", "B", "C"])
+        self.assertEqual(lecteur[137].numero, 137)
+        self.assertEqual(lecteur[137].bouton, 137 % 3)
+        self.assertEqual(lecteur[-1].numero, 199)
+        with self.assertRaises(IndexError):
+            lecteur[200]
+        # Chaque donne redistribue exactement les mises de l'historique
+        for main, donne in zip(lecteur, mains(evenements)):
+            self.assertEqual(sum(main.gains), sum(e.valeurs[1] for e in donne if e.type == MISE))
+
+    def test_rejeu_identique(self):
+        _, evenements = self.journaliser()
+        lecteur = self.lecteur()
+        originaux = list(mains(evenements))
+        for numero in (0, 57, 199):
+            rejoues = ListeEvenements()
+            lecteur.rejouer(numero, enregistreur=rejoues)
+            self.assertEqual(rejoues, originaux[numero])
+
+    def test_observateur(self):
+        self.journaliser(20)
+        lecteur = self.lecteur()
+        vues = []
+        lecteur.rejouer(5, observateur=lambda partie, joueur, a_suivre, decision: vues.append(decision))
+        self.assertEqual(vues, lecteur[5].decisions)
+
+    def test_divergence(self):
+        self.journaliser(20, melange_paresseux=True)
+        lecteur = self.lecteur()
+        lecteur.parametres['grosse_blinde'] = 3
+        with self.assertRaises(DivergenceRejeu):
+            for numero in range(20):
+                lecteur.rejouer(numero)
+
+    def test_index_en_retard_et_fin_tronquee(self):
+        self.journaliser(50)
+        taille_index = os.path.getsize(chemin_index(self.chemin))
+        with open(chemin_index(self.chemin), 'r+b') as index:
+            index.truncate(taille_index - 8 * 10)  # 10 donnes absentes de l'index
+        with open(self.chemin, 'r+b') as journal:
+            journal.truncate(os.path.getsize(self.chemin) - 1)  # Dernière donne incomplète
+        lecteur = self.lecteur()
+        self.assertEqual(len(lecteur), 49)
+        self.assertEqual(lecteur[45].bouton, 0)
+        lecteur.rejouer(45)
+
+    def test_sans_index(self):
+        self.journaliser(30)
+        os.remove(chemin_index(self.chemin))
+        lecteur = self.lecteur()
+        self.assertEqual(len(lecteur), 30)
+        lecteur.rejouer(29)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from moteur_poker.jeu import TourDeMise, SUIVRE, RELANCER
+from moteur_poker.serveur import Client, ServeurPoker, Table, bot
+
+
+def suiveur(message):
+    return SUIVRE, 0
+
+
+def relanceur(message):
+    return RELANCER, 5
+
+
+def muet(message):
+    return None
+
+
+class EcrivainReponseImmediate:
+    """Écrivain factice : le joueur répond « suivre » pendant que le serveur attend encore drain()."""
+
+    def __init__(self):
+        self.client = None
+        self.messages = []
+
+    def write(self, donnees):
+        self.messages.append(json.loads(donnees))
+
+    async def drain(self):
+        if self.messages[-1]['type'] == 'a_vous':
+            self.client.actions.put_nowait({"type": "action", "action": SUIVRE, "montant": 0})
+        for _ in range(3):
+            await asyncio.sleep(0)  # Boucle occupée par les autres tables
+
+    def close(self):
+        pass
+
+
+class TestServeur(unittest.IsolatedAsyncioTestCase):
+
+    async def jouer(self, serveur, deciders, **connexion):
+        return await asyncio.wait_for(
+            asyncio.gather(*(bot(f"J{i}", decider, **connexion) for i, decider in enumerate(deciders))), 10)
+
+    async def test_table_complete(self):
+        serveur = ServeurPoker(nb_places=3, mains_max=4, graine=1)
+        ecoute = await serveur.demarrer()
+        port = ecoute.sockets[0].getsockname()[1]
+        try:
+            recus = await self.jouer(serveur, [suiveur, relanceur, suiveur], port=port)
+        finally:
+            await serveur.fermer()
+        resultats = [m for m in recus[0] if m['type'] == 'resultat']
+        self.assertEqual(len(resultats), 4)
+        self.assertEqual(sum(resultats[-1]['tapis']), 300)
+        self.assertEqual(recus[0][-1]['type'], 'fin')
+        cartes = [m['cartes'] for messages in recus for m in messages if m['type'] == 'main']
+        self.assertTrue(all(len(main) == 2 for main in cartes))
+
+    async def test_plusieurs_tables_et_delai(self):
+        serveur = ServeurPoker(nb_places=2, delai_action=0.05, mains_max=2, graine=2)
+        ecoute = await serveur.demarrer()
+        port = ecoute.sockets[0].getsockname()[1]
+        try:
+            recus = await self.jouer(serveur, [suiveur, muet, relanceur, suiveur], port=port)
+        finally:
+            await serveur.fermer()
+        tables = {m['table'] for messages in recus for m in messages if m['type'] == 'bienvenue'}
+        self.assertEqual(tables, {0, 1})
+        # Le joueur muet est couché (ou parle) d'office à chaque tour
+        self.assertTrue(all(messages[-1]['type'] in ('fin', 'elimine') for messages in recus))
+
+    @unittest.skipUnless(hasattr(asyncio, 'start_unix_server'), "Sockets Unix indisponibles.")
+    async def test_socket_unix(self):
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, 'poker.sock')
+            serveur = ServeurPoker(nb_places=2, mains_max=1)
+            await serveur.demarrer(chemin_unix=chemin)
+            try:
+                recus = await self.jouer(serveur, [suiveur, suiveur], chemin_unix=chemin)
+            finally:
+                await serveur.fermer()
+        self.assertEqual(sum(1 for m in recus[1] if m['type'] == 'resultat'), 1)
+
+    async def test_reponse_immediate_conservee(self):
+        serveur = ServeurPoker(nb_places=2, delai_action=1.0)
+        table = Table(0, serveur)
+        for nom in ("A", "B"):
+            ecrivain = EcrivainReponseImmediate()
+            ecrivain.client = Client(None, ecrivain, serveur.delai_action)
+            table.asseoir(ecrivain.client, nom)
+        table.partie.nouvelle_partie(1)
+        table.partie.distribuer_cartes()
+        tour = TourDeMise(table.partie, 0)
+        tour.miser(table.joueurs[0], 1)
+        tour.miser(table.joueurs[1], 2)
+        debut = time.perf_counter()
+        await table._tour(tour)
+        self.assertLess(time.perf_counter() - debut, serveur.delai_action)
+        jouees = [m['action'] for m in table.clients[0].ecrivain.messages if m['type'] == 'action_jouee']
+        self.assertEqual(jouees, [SUIVRE, SUIVRE])
+        self.assertEqual(tour.en_jeu, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+from moteur_poker.cartes import depuis_texte
+from moteur_poker.jeu import Carte, Joueur, Partie, TourDeMise, SE_COUCHER, RELANCER
+from moteur_poker.simulation import simuler, strategie_force, strategie_suiveur
+
+
+def cartes(texte):
+    return [Carte.depuis_id(depuis_texte(t)) for t in texte.split()]
+
+
+def relanceur(partie, joueur, a_suivre):
+    return RELANCER, 10
+
+
+def coucheur(partie, joueur, a_suivre):
+    return SE_COUCHER, 0
+
+
+class TestTourDeMise(unittest.TestCase):
+
+    def setUp(self):
+        self.joueurs = [Joueur("A"), Joueur("B"), Joueur("C")]
+        self.partie = Partie(self.joueurs)
+        self.partie.nouvelle_partie()
+
+    def test_tous_suivent(self):
+        tour = TourDeMise(self.partie)
+        tour.miser(self.joueurs[0], 2)
+        strategies = dict.fromkeys(self.joueurs, strategie_suiveur)
+        self.assertEqual(tour.jouer(strategies), 3)
+        self.assertEqual(self.partie.pot, 6)
+        self.assertEqual([j.tapis for j in self.joueurs], [98, 98, 98])
+
+    def test_relances_bornees(self):
+        tour = TourDeMise(self.partie, relances_max=2)
+        strategies = {self.joueurs[0]: relanceur, self.joueurs[1]: relanceur, self.joueurs[2]: strategie_suiveur}
+        self.assertEqual(tour.jouer(strategies), 3)
+        self.assertEqual(set(tour.mises.values()), {20})
+
+    def test_couches(self):
+        tour = TourDeMise(self.partie)
+        strategies = {self.joueurs[0]: relanceur, self.joueurs[1]: coucheur, self.joueurs[2]: coucheur}
+        self.assertEqual(tour.jouer(strategies), 1)
+        self.assertEqual(self.partie.joueurs_actifs(), [self.joueurs[0]])
+
+
+class TestAbattage(unittest.TestCase):
+
+    def test_pot_secondaire(self):
+        a, b, c = Joueur("A"), Joueur("B"), Joueur("C")
+        partie = Partie([a, b, c])
+        partie.nouvelle_partie()
+        a.recevoir(cartes('As Ad'))
+        b.recevoir(cartes('Ks Kd'))
+        c.recevoir(cartes('Qs Qd'))
+        for carte in cartes('2c 7h 9c Td 3s'):
+            partie.reveler(carte)
+        a.tapis = 10
+        for joueur in (a, b, c):
+            partie.miser(joueur, 50)
+        gains = partie.abattage()
+        # A, à tapis pour 10, ne gagne que le pot principal ; B gagne le reste
+        self.assertEqual(gains, {a: 30, b: 80, c: 0})
+        self.assertEqual(partie.pot, 0)
+
+
+class TestSimulation(unittest.TestCase):
+
+    def test_somme_nulle_et_reproductible(self):
+        strategies = [strategie_force, strategie_suiveur, strategie_force]
+        resultat = simuler(300, [Joueur("A"), Joueur("B"), Joueur("C")], strategies, graine=3)
+        self.assertEqual(sum(resultat.gains.values()), 0)
+        self.assertEqual(resultat.nb_mains, 300)
+        autre = simuler(300, [Joueur("A"), Joueur("B"), Joueur("C")], strategies, graine=3)
+        self.assertEqual(resultat.gains, autre.gains)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import random
+import time
+import unittest
+
+from moteur_poker import preflop
+from moteur_poker.cartes import depuis_texte
+from moteur_poker.equite import equite_fourchettes
+from moteur_poker.jeu import Carte, Joueur, Partie, SE_COUCHER, SUIVRE, RELANCER
+from moteur_poker.simulation import simuler, strategie_suiveur
+from moteur_poker.strategies import StrategieEquite, score_chen, classement_preflop, fourchette, largeur_fourchette
+
+
+def cartes(texte):
+    return [Carte.depuis_id(depuis_texte(t)) for t in texte.split()]
+
+
+def indice(texte):
+    return preflop.indice_main(*[depuis_texte(t) for t in texte.split()])
+
+
+class TestFourchettes(unittest.TestCase):
+
+    def test_score_chen(self):
+        self.assertEqual(score_chen(indice('As Ad')), 20)
+        self.assertEqual(score_chen(indice('As Ks')), 12)
+        self.assertEqual(score_chen(indice('2s 2d')), 5)
+        self.assertLess(score_chen(indice('7s 2d')), score_chen(indice('8s 7s')))
+
+    def test_classement_et_fourchette(self):
+        self.assertEqual(len(classement_preflop()), 169)
+        self.assertEqual(len(fourchette(1.0)), 1326)
+        etroite = fourchette(0.15)
+        self.assertIn(tuple(sorted(depuis_texte(t) for t in ('Ad', 'As'))), [tuple(sorted(main)) for main in etroite])
+        self.assertNotIn(indice('7s 2d'), {preflop.indice_main(*main) for main in etroite})
+
+    def test_largeur(self):
+        self.assertEqual(largeur_fourchette(0, 100), 1.0)
+        self.assertGreater(largeur_fourchette(2, 98), largeur_fourchette(20, 80))
+        self.assertEqual(largeur_fourchette(100, 0), 0.15)
+
+    def test_equite_contre_une_main(self):
+        kk = [tuple(cartes('Kc Kh'))]
+        resultat = equite_fourchettes(cartes('As Ad'), [], [kk], largeur_cible=0.02, rng=random.Random(1))
+        self.assertAlmostEqual(resultat.equite, 0.82, delta=0.03)
+
+    def test_fourchette_vide(self):
+        with self.assertRaises(ValueError):
+            equite_fourchettes(cartes('As Ad'), [], [[tuple(cartes('As Kd'))]])
+        # Deux adversaires qui ne peuvent tenir que la même main : aucune donne possible
+        kq = [tuple(cartes('Kc Qc'))]
+        with self.assertRaises(ValueError):
+            equite_fourchettes(cartes('As Ad'), [], [kq, kq])
+
+    def test_echeance(self):
+        debut = time.perf_counter()
+        resultat = equite_fourchettes(cartes('7s 2d'), [], [fourchette(1.0)] * 3, echeance=debut + 0.02,
+                                      largeur_cible=0.0, rng=random.Random(2))
+        self.assertLess(time.perf_counter() - debut, 0.1)
+        self.assertGreater(resultat.tirages, 0)
+
+
+class TestStrategieEquite(unittest.TestCase):
+
+    def setUp(self):
+        self.ia = Joueur("IA", ia=True)
+        self.adversaire = Joueur("Adversaire")
+        self.partie = Partie([self.adversaire, self.ia], strategie_ia=StrategieEquite(budget_ms=20,
+                                                                                       rng=random.Random(3)))
+        self.partie.nouvelle_partie()
+
+    def donner(self, main, communes=''):
+        self.ia.cartes[:] = cartes(main)
+        self.adversaire.cartes[:] = cartes('2c 3c')  # Inconnues de l'IA
+        self.partie.cartes_communes[:] = cartes(communes)
+
+    def test_decisions(self):
+        strategie = self.partie.strategie_ia
+        self.partie.pot = 10
+        self.donner('As Ad')
+        self.assertEqual(strategie(self.partie, self.ia, 0)[0], RELANCER)
+        self.donner('7s 2d', 'Kh Qh 9c')
+        self.assertEqual(strategie(self.partie, self.ia, 10)[0], SE_COUCHER)
+        self.assertEqual(strategie(self.partie, self.ia, 0)[0], SUIVRE)
+
+    def test_ia_jouer(self):
+        self.donner('7s 2d', 'Kh Qh 9c')
+        self.partie.pot = 10
+        self.partie.mise_actuelle = 20
+        self.assertEqual(self.partie.ia_jouer(self.ia), "L'IA se couche.")
+        self.assertFalse(self.ia.actif)
+        self.ia.actif = True
+        self.donner('Ks Kd', 'Kh Qh 9c')
+        self.assertEqual(self.partie.decision_ia(self.ia)[0], RELANCER)
+        pot = self.partie.pot
+        self.partie.ia_jouer(self.ia)
+        # Mise de l'IA comptée dans ses engagements, pour le partage des pots à l'abattage
+        self.assertEqual(self.partie.engagements[self.ia], self.partie.pot - pot)
+        self.assertGreater(self.partie.engagements[self.ia], 0)
+
+    def test_decision_puis_application(self):
+        self.donner('Ks Kd', 'Kh Qh 9c')
+        decision = self.partie.decision_ia(self.ia)
+        self.assertEqual((self.partie.pot, self.ia.tapis), (0, 100))  # Décider ne modifie rien
+        self.assertEqual(self.partie.ia_appliquer(self.ia, decision), f"L'IA mise {decision[1]} jetons.")
+        self.assertEqual(self.partie.pot, decision[1])
+        self.assertEqual(self.partie.ia_appliquer(self.ia, (SE_COUCHER, 0)), "L'IA se couche.")
+        self.assertFalse(self.ia.actif)
+
+    def test_cache_des_equites(self):
+        strategie = self.partie.strategie_ia
+        self.donner('Ks Kd', 'Kh Qh 9c')
+        premiere = strategie(self.partie, self.ia, 0)
+        tirages = strategie.dernier_resultat.tirages
+        self.assertEqual(strategie(self.partie, self.ia, 0), premiere)
+        statistiques = strategie.cache.statistiques()
+        self.assertEqual((statistiques['succes'], statistiques['taille']), (1, 1))
+        self.assertGreaterEqual(strategie.dernier_resultat.tirages, tirages)  # Tirages repris, pas recommencés
+
+    def test_budget_respecte(self):
+        joueurs = [Joueur(nom) for nom in "ABCD"]
+        strategie = StrategieEquite(budget_ms=10, marge=0.0, agressivite=0.0)
+        durees = []
+
+        def chronometree(partie, joueur, a_suivre):
+            debut = time.perf_counter()
+            decision = strategie(partie, joueur, a_suivre)
+            durees.append(time.perf_counter() - debut)
+            return decision
+
+        simuler(5, joueurs, [chronometree, strategie_suiveur, strategie_suiveur, strategie_suiveur], graine=4)
+        self.assertTrue(durees)
+        self.assertLess(max(durees), 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+from moteur_poker.table_strategie import TableStrategie, ecrire_table, quantifier
+
+
+class TestTableStrategie(unittest.TestCase):
+
+    def setUp(self):
+        dossier = tempfile.TemporaryDirectory()
+        self.addCleanup(dossier.cleanup)
+        self.chemin = os.path.join(dossier.name, 'strategie.table')
+
+    def ouvrir(self):
+        table = TableStrategie(self.chemin)
+        self.addCleanup(table.fermer)
+        return table
+
+    def test_aller_retour(self):
+        entrees = {f"{groupe}:{histoire}": [0.0, 0.25, 0.75] for groupe in range(50) for histoire in ('', 'c', 'rc/')}
+        entrees['7:rr'] = bytes([10, 20, 30])
+        ecrire_table(self.chemin, entrees, 3, {'relances_max': 3})
+        table = self.ouvrir()
+        self.assertEqual(len(table), 151)
+        self.assertGreaterEqual(table.nb_cases, 2 * len(table))
+        self.assertEqual(table.parametres, {'relances_max': 3})
+        self.assertEqual(table.get('12:rc/'), quantifier([0.0, 0.25, 0.75]))
+        self.assertEqual(table.get('7:rr'), bytes([10, 20, 30]))
+        self.assertIsNone(table.get('12:rrr'))
+        self.assertNotIn('99:', table)
+        for lue, attendue in zip(table.probabilites('3:c'), [0.0, 0.25, 0.75]):
+            self.assertAlmostEqual(lue, attendue, delta=0.005)
+
+    def test_table_vide(self):
+        ecrire_table(self.chemin, {}, 2)
+        table = self.ouvrir()
+        self.assertEqual(len(table), 0)
+        self.assertIsNone(table.get('0:'))
+
+    def test_erreurs(self):
+        with self.assertRaises(ValueError):
+            ecrire_table(self.chemin, {'0:': [0.5, 0.5]}, 3)
+        with open(self.chemin, 'wb') as fichier:
+            fichier.write(bytes(64))
+        with self.assertRaises(ValueError):
+            TableStrategie(self.chemin)
+
+
+if __name__ == '__main__':
+    unittest.main()